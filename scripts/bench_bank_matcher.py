@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+"""
+bench_bank_matcher.py
+
+Benchmark do reconhecimento de banco em texto livre
+(scripts/migration/bank_matcher.py) com uma coluna "Banco" sintética: apelidos
+com e sem acento, caixa alta, código COMPE na frente ("077 - Banco Inter"),
+agência e conta digitadas junto ("Itaú ag 1234 cc 5678-9"), nomes de banco
+fora da tabela e células vazias. Os mesmos freelancers aparecem em vários
+jobs, então a coluna repete valores.
+
+Compara:
+  antigo   normalize_bank anterior de migrate_sheets_data.py (busca de
+           substring na tabela BANK_NORMALIZE, por célula)
+  trie     match_bank (trie de palavras + memo)
+
+Antes de medir, confere os casos fixos de CASOS — inclusive os negativos:
+número no meio do texto ("Banco 1", "Ag 33 Cc 1234") não é código COMPE.
+
+Uso:
+  python scripts/bench_bank_matcher.py
+  python scripts/bench_bank_matcher.py --rows 1000000 --distinct 20000
+"""
+
+import argparse
+import random
+import time
+from collections import Counter
+from typing import Callable, Dict, List, Optional, Tuple
+
+from migration.bank_matcher import BANK_MATCHER, BANKS, BankMatcher
+
+# Tabela anterior de migrate_sheets_data.py
+BANK_NORMALIZE_ANTIGO: Dict[str, Tuple[Optional[str], str]] = {
+    "nubank": ("260", "Nu Pagamentos"), "nu bank": ("260", "Nu Pagamentos"),
+    "nu": ("260", "Nu Pagamentos"), "260": ("260", "Nu Pagamentos"),
+    "itau": ("341", "Itau Unibanco"), "itaú": ("341", "Itau Unibanco"),
+    "bradesco": ("237", "Bradesco"), "banco do brasil": ("001", "Banco do Brasil"),
+    "bb": ("001", "Banco do Brasil"), "caixa": ("104", "Caixa Economica Federal"),
+    "cef": ("104", "Caixa Economica Federal"), "santander": ("033", "Santander"),
+    "inter": ("077", "Banco Inter"), "banco inter": ("077", "Banco Inter"),
+    "c6": ("336", "C6 Bank"), "c6 bank": ("336", "C6 Bank"), "picpay": ("380", "PicPay"),
+    "mercado pago": ("323", "Mercado Pago"), "safra": ("422", "Safra"),
+    "sicoob": ("756", "Sicoob"), "sicredi": ("748", "Sicredi"),
+    "original": ("212", "Banco Original"), "neon": ("655", "Neon"),
+    "next": ("237", "Bradesco"), "pagbank": ("290", "PagBank"),
+    "pagseguro": ("290", "PagBank"), "cora": ("403", "Cora"), "stone": ("197", "Stone"),
+    "xp": ("102", "XP Investimentos"), "will": ("280", "Will Bank"),
+    "iti": ("341", "Itau Unibanco"),
+}
+
+# valor -> código esperado (None: não reconhecido)
+CASOS: List[Tuple[str, Optional[str]]] = [
+    ("Nubank", "260"),
+    ("Nu", "260"),
+    ("ITAÚ", "341"),
+    ("077 - Banco Inter", "077"),
+    ("77", "077"),
+    ("341", "341"),
+    ("001 conta corrente", "001"),
+    ("Banco do Brasil ag 33", "001"),
+    ("c.e.f.", "104"),
+    ("Banco Internacional", None),
+    ("numero 12", None),
+    ("Banco 1", None),
+    ("Ag 33 Cc 1234", None),
+    ("conta 237", None),
+    ("999", None),
+    ("Cooperativa X", None),
+]
+
+
+def normalize_bank_antigo(raw: str) -> Tuple[Optional[str], Optional[str]]:
+    """normalize_bank anterior de migrate_sheets_data.py, para comparação."""
+    if not raw or not raw.strip():
+        return None, None
+    key = raw.strip().lower()
+    if key in BANK_NORMALIZE_ANTIGO:
+        return BANK_NORMALIZE_ANTIGO[key]
+    for k, v in BANK_NORMALIZE_ANTIGO.items():
+        if k in key:
+            return v
+    return None, raw.strip()
+
+
+def conferir_casos() -> None:
+    erros = []
+    for valor, esperado in CASOS:
+        obtido = BANK_MATCHER.match(valor)
+        if (obtido[0] if obtido else None) != esperado:
+            erros.append(f"  {valor!r}: esperado {esperado}, obtido {obtido}")
+    if erros:
+        print("casos divergentes:\n" + "\n".join(erros))
+        raise SystemExit(1)
+    print(f"{len(CASOS)} casos fixos ok")
+
+
+def _valor(rnd: random.Random) -> str:
+    sorteio = rnd.random()
+    code, (name, aliases) = rnd.choice(list(BANKS.items()))
+    alias = rnd.choice(aliases)
+    if sorteio < 0.45:
+        return rnd.choice([alias, alias.upper(), alias.title(), f" {alias} "])
+    if sorteio < 0.60:
+        return f"{code} - {name}"
+    if sorteio < 0.75:
+        return f"{alias.title()} ag {rnd.randint(1, 9999)} cc {rnd.randint(1, 99999)}-{rnd.randint(0, 9)}"
+    if sorteio < 0.85:
+        return rnd.choice(["Cooperativa Central", "Banco Regional", "Credicoop", "Agibank"])
+    if sorteio < 0.92:
+        return f"Ag {rnd.randint(1, 999)} Cc {rnd.randint(1000, 99999)}"
+    return rnd.choice(["", " ", "-", "#N/A"])
+
+
+def build_column(n: int, distinct: int, seed: int = 42) -> List[str]:
+    rnd = random.Random(seed)
+    valores = [_valor(rnd) for _ in range(distinct)]
+    return [rnd.choice(valores) for _ in range(n)]
+
+
+def _tempo(fn: Callable[[], object]) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark do reconhecimento de banco.")
+    parser.add_argument("--rows", type=int, default=500_000, help="Linhas da coluna (padrão: 500000).")
+    parser.add_argument("--distinct", type=int, default=10_000, help="Valores distintos (padrão: 10000).")
+    args = parser.parse_args()
+
+    conferir_casos()
+    coluna = build_column(args.rows, args.distinct)
+    print(f"coluna Banco de {len(coluna)} linhas, {len(set(coluna))} valores distintos")
+
+    matcher = BankMatcher(BANKS)
+    base = _tempo(lambda: [normalize_bank_antigo(v) for v in coluna])
+    trie = _tempo(lambda: [matcher.match(v) if v else None for v in coluna])
+    print(f"{'implementação':<12} {'tempo':>8} {'ganho':>7}")
+    print(f"{'antigo':<12} {base:7.2f}s {1.0:6.1f}x")
+    print(f"{'trie':<12} {trie:7.2f}s {base / trie:6.1f}x")
+
+    mudancas: Counter = Counter()
+    for valor in set(coluna):
+        antes = normalize_bank_antigo(valor)[0]
+        depois = matcher.match(valor) if valor else None
+        depois = depois[0] if depois else None
+        if antes != depois:
+            mudancas[f"{antes} -> {depois}"] += 1
+    print("mudanças em relação ao antigo (valores distintos):",
+          ", ".join(f"{k}: {v}" for k, v in mudancas.most_common(8)) or "nenhuma")
+
+
+if __name__ == "__main__":
+    main()
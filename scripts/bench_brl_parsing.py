@@ -0,0 +1,168 @@
+# -*- coding: utf-8 -*-
+"""
+bench_brl_parsing.py
+
+Teste diferencial e benchmark do parse de valores em reais
+(scripts/migration/money.py) contra as implementações escalares anteriores:
+
+  parse_brl antigo     migrate_sheets_data.py / parse_custos_csv.py (dots="auto")
+  parse_money antigo   import_job_finances.py (dots="thousands")
+
+Primeiro compara, bit a bit, money.parse_brl e money.parse_brl_column com as
+versões antigas em casos de borda ("R$ 1.000,00", "-", "50.000", NBSP, "1e3",
+"nan"...) e em strings aleatórias geradas a partir do alfabeto das planilhas.
+Qualquer divergência é listada e o script sai com código 1. Depois mede uma
+coluna realista de custos (muitos "R$ -" e valores repetidos).
+
+Uso:
+  python scripts/bench_brl_parsing.py
+  python scripts/bench_brl_parsing.py --fuzz 500000 --rows 1000000
+"""
+
+import argparse
+import math
+import random
+import re
+import struct
+import sys
+import time
+from typing import Callable, List, Optional
+
+from migration.money import DOTS_AUTO, DOTS_THOUSANDS, parse_brl, parse_brl_column
+
+
+def parse_brl_antigo(value: str) -> Optional[float]:
+    """parse_brl anterior de migrate_sheets_data.py, para comparação."""
+    if not value:
+        return None
+    v = value.strip()
+    v = re.sub(r"[R\$\s]", "", v)
+    if not v or v in ("-", "–", "—"):
+        return None
+    v_clean = re.sub(r"[\s\-]", "", v)
+    if not v_clean:
+        return None
+    if "," in v:
+        v = v.replace(".", "").replace(",", ".")
+    else:
+        dot_idx = v.rfind(".")
+        if dot_idx != -1:
+            after = v[dot_idx + 1:]
+            if len(after) == 3:
+                v = v.replace(".", "")
+    try:
+        f = float(v)
+        return f if f != 0.0 else None
+    except ValueError:
+        return None
+
+
+def parse_money_antigo(raw: str) -> Optional[float]:
+    """parse_money anterior de import_job_finances.py, para comparação."""
+    if not raw or not raw.strip():
+        return None
+    cleaned = re.sub(r"[R\$\s]", "", raw.strip())
+    if cleaned in ("-", "", "-   ", "–"):
+        return None
+    cleaned = cleaned.replace(".", "").replace(",", ".")
+    try:
+        value = float(cleaned)
+        return value if value != 0.0 else None
+    except ValueError:
+        return None
+
+
+BORDAS = [
+    "", " ", "R$", "R$ -", " R$  -   ", "-", "–", "—", "--", "- -", "R$ —",
+    "R$ 1.000,00", "1.000,00", "1000", "50.000", "50.000,00", "$50.000,00",
+    "400,00", "12.5", "12.50", "1.2345", "1.234.567,89", "1.234.567", "0",
+    "0,00", "R$ 0,00", "-5", "-1.000,00", "R$ -1.500", "1\xa0000,00",
+    "R$ 2.500,00", "1e3", "1E3", "nan", "inf", "-inf", "1_000", "1,2,3",
+    "1..000", ".5", "5.", ",5", "5,", "RR$$10", "10 R$", "abc", "R$ 1,5 mil",
+    "٣,٥", "1.000,00 ", "\t2.000,50\n", "3.333.333", "1.00.000",
+]
+
+ALFABETO = "0123456789" * 4 + ".,.,-– R$\xa0 e_na"
+
+
+def fuzz(n: int, seed: int = 7) -> List[str]:
+    rnd = random.Random(seed)
+    return ["".join(rnd.choice(ALFABETO) for _ in range(rnd.randint(0, 12))) for _ in range(n)]
+
+
+def coluna_custos(n: int, seed: int = 42) -> List[str]:
+    """Coluna de valor unitário típica: diárias repetidas, "R$ -" e vazios."""
+    rnd = random.Random(seed)
+    diarias = [f"R$ {v:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")
+               for v in (rnd.randint(100, 50_000) for _ in range(400))]
+    return [
+        rnd.choice(diarias) if rnd.random() < 0.7 else rnd.choice(["R$ -", " R$  -   ", ""])
+        for _ in range(n)
+    ]
+
+
+def _bits(value: Optional[float]):
+    if value is None:
+        return None
+    if math.isnan(value):
+        return "nan"
+    return struct.pack("<d", value)
+
+
+def diferencas(valores: List[str], antigo: Callable[[str], Optional[float]], dots: str) -> List[str]:
+    erros = []
+    coluna, mascara = parse_brl_column(valores, dots=dots)
+    for i, v in enumerate(valores):
+        esperado = _bits(antigo(v))
+        escalar = _bits(parse_brl(v, dots=dots))
+        lote = _bits(coluna[i]) if mascara[i] else None
+        if not (esperado == escalar == lote):
+            erros.append(f"{v!r}: antigo={antigo(v)!r} escalar={parse_brl(v, dots=dots)!r} "
+                         f"coluna={coluna[i] if mascara[i] else None!r}")
+    return erros
+
+
+def _tempo(fn: Callable[[], object], repeat: int = 3) -> float:
+    melhor = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        melhor = min(melhor, time.perf_counter() - start)
+    return melhor
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Teste diferencial e benchmark de money.py.")
+    parser.add_argument("--fuzz", type=int, default=200_000, help="Strings aleatórias comparadas (padrão: 200000).")
+    parser.add_argument("--rows", type=int, default=500_000, help="Linhas da coluna medida (padrão: 500000).")
+    args = parser.parse_args()
+
+    valores = BORDAS + fuzz(args.fuzz)
+    falhas = 0
+    for nome, antigo, dots in (
+        ("parse_brl", parse_brl_antigo, DOTS_AUTO),
+        ("parse_money", parse_money_antigo, DOTS_THOUSANDS),
+    ):
+        erros = diferencas(valores, antigo, dots)
+        falhas += len(erros)
+        print(f"{nome:<12} {len(valores)} valores comparados, {len(erros)} divergências")
+        for erro in erros[:20]:
+            print(f"  {erro}")
+    if falhas:
+        sys.exit(1)
+
+    coluna = coluna_custos(args.rows)
+    base = _tempo(lambda: [parse_brl_antigo(v) for v in coluna])
+    print(f"\ncoluna de {len(coluna)} linhas, {len(set(coluna))} valores distintos")
+    print(f"{'implementação':<16} {'tempo':>8} {'ganho':>7}")
+    for label, fn in (
+        ("antigo", None),
+        ("escalar", lambda: [parse_brl(v) for v in coluna]),
+        ("coluna", lambda: parse_brl_column(coluna)),
+    ):
+        elapsed = base if fn is None else _tempo(fn)
+        print(f"{label:<16} {elapsed:7.3f}s {base / elapsed:6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+"""
+bench_column_mapper.py
+
+Benchmark da extração de campos das linhas de jobs e custos: as cadeias
+row.get("titulo") or row.get("title") or ... por linha (antigo) contra o
+cabeçalho compilado uma vez por arquivo (scripts/migration/columns.py).
+
+Gera linhas no formato do csv.DictReader com cabeçalhos variados — nomes em
+português, em inglês, um alias ambíguo ("titulo" e "nome") e colunas extras —
+e valores com espaços nas pontas, vazios e None (linhas curtas do CSV). Antes
+de medir, confere que os dois caminhos devolvem os mesmos valores. O tempo
+inclui guardar todas as linhas extraídas, como a etapa faz (e o GC ligado).
+
+Uso:
+  python scripts/bench_column_mapper.py
+  python scripts/bench_column_mapper.py --rows 500000
+"""
+
+import argparse
+import random
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+from migrate_sheets_data import COST_COLUMNS, JOB_COLUMNS
+
+
+def job_fields_antigo(row: Dict[str, Any]) -> Tuple[str, ...]:
+    """Extração anterior de _process_job_row, para comparação."""
+    return (
+        (row.get("titulo") or row.get("title") or row.get("nome") or row.get("name") or "").strip(),
+        (row.get("codigo") or row.get("code") or row.get("job_code") or row.get("id") or "").strip(),
+        (row.get("cliente") or row.get("client") or row.get("anunciante") or "").strip(),
+        (row.get("agencia") or row.get("agency") or "").strip(),
+        (row.get("status") or row.get("situacao") or "").strip(),
+        (row.get("tipo") or row.get("type") or row.get("project_type") or "").strip(),
+        (row.get("marca") or row.get("brand") or "").strip(),
+        (row.get("data_briefing") or row.get("briefing_date") or row.get("data_inicio") or "").strip(),
+        (row.get("data_entrega") or row.get("delivery_date") or row.get("expected_delivery_date") or "").strip(),
+        (row.get("valor_fechado") or row.get("closed_value") or row.get("valor") or "").strip(),
+        (row.get("custo_producao") or row.get("production_cost") or row.get("custo") or "").strip(),
+        (row.get("observacoes") or row.get("notes") or row.get("obs") or "").strip(),
+        (row.get("drive_url") or row.get("pasta_drive") or row.get("folder_url") or "").strip(),
+    )
+
+
+def cost_fields_antigo(row: Dict[str, Any]) -> Tuple[str, ...]:
+    """Extração anterior de _process_cost_row (+ _cost_field dos valores), para comparação."""
+    def money(*keys: str) -> str:
+        for key in keys:
+            if row.get(key):
+                return row[key].strip()
+        return ""
+
+    return (
+        (row.get("job_code") or row.get("codigo_job") or row.get("job") or "").strip(),
+        (row.get("job_titulo") or row.get("job_title") or "").strip(),
+        (row.get("item") or row.get("item_number") or row.get("categoria") or "").strip(),
+        (row.get("sub_item") or row.get("sub_item_number") or "").strip(),
+        (row.get("descricao") or row.get("description") or row.get("service_description") or "").strip(),
+        (row.get("quantidade") or row.get("quantity") or row.get("qtde") or "").strip(),
+        (row.get("fornecedor") or row.get("vendor") or row.get("vendor_name") or "").strip(),
+        (row.get("condicao_pagamento") or row.get("payment_condition") or row.get("c_nf") or "").strip(),
+        (row.get("data_pagamento") or row.get("payment_due_date") or row.get("vencimento") or "").strip(),
+        (row.get("observacoes") or row.get("notes") or row.get("obs") or "").strip(),
+        (row.get("pago") or row.get("paid") or row.get("status_pagamento") or "").strip(),
+        (row.get("email_fornecedor") or row.get("vendor_email") or row.get("email") or "").strip(),
+        (row.get("pix") or row.get("vendor_pix") or "").strip(),
+        money("valor_unitario", "unit_value", "valor"),
+        money("horas_extra", "overtime_hours"),
+        money("valor_he", "overtime_rate"),
+        money("valor_pago", "actual_paid_value"),
+    )
+
+
+JOB_HEADERS = [
+    ["titulo", "codigo", "cliente", "agencia", "status", "tipo", "marca", "data_entrega", "valor", "observacoes"],
+    ["title", "code", "client", "agency", "status", "type", "brand", "delivery_date", "closed_value", "notes", "drive_url"],
+    ["titulo", "nome", "codigo", "anunciante", "situacao", "valor_fechado", "custo", "obs", "coluna_extra"],
+]
+COST_HEADERS = [
+    ["job_code", "item", "sub_item", "descricao", "quantidade", "fornecedor", "valor_unitario",
+     "horas_extra", "valor_he", "valor_pago", "data_pagamento", "pago", "email_fornecedor", "pix"],
+    ["job", "job_title", "categoria", "description", "qtde", "vendor", "valor", "vencimento",
+     "paid", "email", "vendor_pix", "obs"],
+]
+
+
+def _valor(rnd: random.Random) -> Any:
+    sorteio = rnd.random()
+    if sorteio < 0.15:
+        return ""
+    if sorteio < 0.18:
+        return None
+    if sorteio < 0.22:
+        return "  "
+    texto = rnd.choice(["Job Verão", "12", "R$ 1.500,00", "15/03/2026", "sim", "Fulano da Silva", "x"])
+    return f" {texto} " if rnd.random() < 0.3 else texto
+
+
+def build_rows(headers: List[List[str]], n: int, seed: int) -> List[List[Dict[str, Any]]]:
+    rnd = random.Random(seed)
+    return [[{h: _valor(rnd) for h in header} for _ in range(n)] for header in headers]
+
+
+def _tempo(fn: Callable[[], object], repeat: int = 3) -> float:
+    melhor = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        melhor = min(melhor, time.perf_counter() - start)
+    return melhor
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark do mapeamento de colunas (columns.py).")
+    parser.add_argument("--rows", type=int, default=200_000, help="Linhas por arquivo (padrão: 200000).")
+    args = parser.parse_args()
+
+    for label, columns, antigo, headers in (
+        ("jobs", JOB_COLUMNS, job_fields_antigo, JOB_HEADERS),
+        ("custos", COST_COLUMNS, cost_fields_antigo, COST_HEADERS),
+    ):
+        arquivos = build_rows(headers, args.rows, seed=len(label))
+        mapas = [columns.for_rows(rows) for rows in arquivos]
+        divergencias = sum(
+            mapa.row(row) != antigo(row)
+            for mapa, rows in zip(mapas, arquivos)
+            for row in rows
+        )
+        print(f"\n{label}: {len(arquivos)} arquivos de {args.rows} linhas, {divergencias} divergências")
+        for mapa, header in zip(mapas, headers):
+            print(f"  {','.join(header)[:60]:<60} {'; '.join(mapa.report()) or 'ok'}")
+        if divergencias:
+            raise SystemExit(1)
+
+        base = _tempo(lambda: [antigo(row) for rows in arquivos for row in rows])
+        compilado = _tempo(lambda: [
+            mapa.row(row)
+            for mapa, rows in zip((columns.for_rows(rows) for rows in arquivos), arquivos)
+            for row in rows
+        ])
+        print(f"  {'antigo':<10} {base:7.2f}s")
+        print(f"  {'compilado':<10} {compilado:7.2f}s {base / compilado:6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+"""
+bench_date_parsing.py
+
+Benchmark do parse de datas (scripts/migration/dates.py) com uma coluna de
+datas de pagamento realista: poucas centenas de datas distintas repetidas em
+muitas linhas, células vazias e o placeholder 30/12/1899 da fórmula da planilha.
+
+Antes de medir, confere que o parser novo dá o mesmo resultado que o
+parse_date_br anterior (migrate_sheets_data.py) para todas as datas válidas de
+2000 a 2035 nos formatos DD/MM/AAAA, D/M/AAAA e DD/MM/AA.
+
+Compara:
+  antigo      parse_date_br anterior (re.match + date() por célula)
+  escalar     dates.parse_date_br por célula (caminho rápido + memo)
+  coluna      dates.parse_date_column (deduplica a coluna)
+
+Uso:
+  python scripts/bench_date_parsing.py
+  python scripts/bench_date_parsing.py --rows 1000000
+"""
+
+import argparse
+import random
+import re
+import time
+from datetime import date, timedelta
+from typing import Callable, List, Optional
+
+from migration.dates import DATE_PARSER, parse_date_br, parse_date_column
+
+
+def parse_date_br_antigo(value: str) -> Optional[str]:
+    """parse_date_br anterior de migrate_sheets_data.py, para comparação."""
+    if not value:
+        return None
+    v = value.strip()
+    m = re.match(r"^(\d{1,2})/(\d{1,2})/(\d{2,4})$", v)
+    if m:
+        day, month, year = m.groups()
+        if len(year) == 2:
+            year = "20" + year
+        try:
+            date(int(year), int(month), int(day))  # valida
+            return f"{year}-{month.zfill(2)}-{day.zfill(2)}"
+        except ValueError:
+            return None
+    m2 = re.match(r"^(\d{4})-(\d{2})-(\d{2})$", v)
+    if m2:
+        return v
+    return None
+
+
+def datas_validas() -> List[str]:
+    textos = []
+    dia = date(2000, 1, 1)
+    while dia < date(2036, 1, 1):
+        textos.append(dia.strftime("%d/%m/%Y"))
+        textos.append(f"{dia.day}/{dia.month}/{dia.year}")
+        textos.append(dia.strftime("%d/%m/%y"))
+        dia += timedelta(days=1)
+    return textos
+
+
+def coluna_datas(n: int, seed: int = 42) -> List[str]:
+    rnd = random.Random(seed)
+    base = date(2025, 1, 1)
+    distintas = [(base + timedelta(days=rnd.randint(0, 540))).strftime("%d/%m/%Y") for _ in range(300)]
+    return [
+        rnd.choice(distintas) if rnd.random() < 0.8 else rnd.choice(["", "30/12/1899", " "])
+        for _ in range(n)
+    ]
+
+
+def _tempo(fn: Callable[[], object], repeat: int = 3) -> float:
+    melhor = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        melhor = min(melhor, time.perf_counter() - start)
+    return melhor
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark do parse de datas (dates.py).")
+    parser.add_argument("--rows", type=int, default=500_000, help="Linhas da coluna medida (padrão: 500000).")
+    args = parser.parse_args()
+
+    validas = datas_validas()
+    erros = [v for v in validas if parse_date_br(v) != parse_date_br_antigo(v)]
+    print(f"{len(validas)} datas válidas comparadas, {len(erros)} divergências {erros[:10]}")
+    if erros:
+        raise SystemExit(1)
+
+    coluna = coluna_datas(args.rows)
+    base = _tempo(lambda: [parse_date_br_antigo(v) for v in coluna])
+    print(f"\ncoluna de {len(coluna)} linhas, {len(set(coluna))} valores distintos")
+    print(f"{'implementação':<12} {'tempo':>8} {'ganho':>7}")
+    for label, fn in (
+        ("antigo", None),
+        ("escalar", lambda: [parse_date_br(v) for v in coluna]),
+        ("coluna", lambda: parse_date_column(coluna)),
+    ):
+        elapsed = base if fn is None else _tempo(fn)
+        print(f"{label:<12} {elapsed:7.3f}s {base / elapsed:6.1f}x")
+    info = DATE_PARSER.cache_info()
+    print(f"memo: {info.hits} acertos, {info.misses} faltas, {info.currsize} entradas")
+
+
+if __name__ == "__main__":
+    main()
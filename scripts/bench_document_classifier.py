@@ -0,0 +1,193 @@
+# -*- coding: utf-8 -*-
+"""
+bench_document_classifier.py
+
+Benchmark do classificador de documento / chave PIX
+(scripts/migration/documents.py) com uma coluna sintética da aba EQUIPE:
+CPFs e CNPJs com e sem pontuação (com dígito verificador válido e alguns
+digitados errado), celulares, e-mails, chaves aleatórias, rótulos como
+"Pix(cpf):" e lixo de fórmula ("#ERROR!"). Os mesmos freelancers aparecem em
+vários jobs, então a coluna repete valores.
+
+Compara:
+  antigo      detect_document anterior de migrate_sheets_data.py, por célula
+  escalar     classify_document por célula (regex pré-compiladas + memo)
+  coluna      classify_many (deduplica a coluna)
+
+Antes de medir, confere os casos fixos de CASOS (celular com +55 cujos dígitos
+passam no DV de CNPJ, CNPJ de 13 dígitos com e sem pontuação, e-mail e chave
+aleatória em maiúsculas). No fim mostra os contadores por tipo e onde o
+resultado mudou em relação ao classificador antigo (DV de CPF/CNPJ, rótulos,
+tipos fora do CHECK do banco).
+
+Uso:
+  python scripts/bench_document_classifier.py
+  python scripts/bench_document_classifier.py --rows 1000000 --distinct 50000
+"""
+
+import argparse
+import random
+import re
+import time
+import uuid
+from collections import Counter
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from migration.documents import DocumentClassifier
+
+
+def detect_document_antigo(raw: str) -> Dict[str, Any]:
+    """detect_document anterior de migrate_sheets_data.py, para comparação."""
+    result: Dict[str, Any] = {
+        "entity_type": "pf", "cpf": None, "cnpj": None, "pix_key": None, "pix_key_type": None,
+    }
+    if not raw or not raw.strip():
+        return result
+    raw = raw.strip()
+    digits = re.sub(r"\D", "", raw or "")
+    if re.match(
+        r"^[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}$",
+        raw,
+    ):
+        result["pix_key"] = raw
+        result["pix_key_type"] = "aleatoria"
+        return result
+    if "@" in raw and "." in raw.split("@")[-1]:
+        result["pix_key"] = raw
+        result["pix_key_type"] = "email"
+        return result
+    if len(digits) == 14:
+        result.update(entity_type="pj", cnpj=digits, pix_key=digits, pix_key_type="cnpj")
+        return result
+    if len(digits) == 11:
+        result.update(cpf=digits, pix_key=digits, pix_key_type="cpf")
+        return result
+    if 8 <= len(digits) <= 13:
+        phone = ("+" + digits) if raw.startswith("+") else digits
+        result.update(pix_key=phone, pix_key_type="telefone")
+        return result
+    result.update(pix_key=raw, pix_key_type="aleatoria")
+    return result
+
+
+# valor -> (pix_key_type, pix_key, cnpj) esperados
+CASOS: List[Tuple[str, Tuple[Optional[str], Optional[str], Optional[str]]]] = [
+    ("+5511900000036", ("telefone", "+5511900000036", None)),
+    ("5511900000036", ("telefone", "5511900000036", None)),
+    ("+55 11 90000-0036", ("telefone", "+5511900000036", None)),
+    ("1.000.000/0000-73", ("cnpj", "01000000000073", "01000000000073")),
+    ("01000000000073", ("cnpj", "01000000000073", "01000000000073")),
+    ("1000000000073", ("telefone", "1000000000073", None)),
+    ("11.222.333/0001-81", ("cnpj", "11222333000181", "11222333000181")),
+    ("Freela@Gmail.COM", ("email", "freela@gmail.com", None)),
+    ("123E4567-E89B-12D3-A456-426614174000",
+     ("aleatoria", "123e4567-e89b-12d3-a456-426614174000", None)),
+]
+
+
+def conferir_casos() -> None:
+    classificador = DocumentClassifier()
+    erros = []
+    for valor, esperado in CASOS:
+        doc = classificador.classify(valor)
+        obtido = (doc.pix_key_type, doc.pix_key, doc.cnpj)
+        if obtido != esperado:
+            erros.append(f"  {valor!r}: esperado {esperado}, obtido {obtido}")
+    if erros:
+        print("casos divergentes:\n" + "\n".join(erros))
+        raise SystemExit(1)
+    print(f"{len(CASOS)} casos fixos ok")
+
+
+def _dv(digits: str, pesos: List[int]) -> str:
+    resto = sum(int(d) * p for d, p in zip(digits, pesos)) % 11
+    return str(0 if resto < 2 else 11 - resto)
+
+
+def _com_dv(rnd: random.Random, base: int, pesos1: List[int], pesos2: List[int]) -> str:
+    """Número aleatório com os dois dígitos verificadores calculados."""
+    digits = "".join(str(rnd.randint(0, 9)) for _ in range(base))
+    digits += _dv(digits, pesos1)
+    return digits + _dv(digits, pesos2)
+
+
+def _cpf(rnd: random.Random) -> str:
+    d = _com_dv(rnd, 9, list(range(10, 1, -1)), list(range(11, 1, -1)))
+    return rnd.choice([d, f"{d[:3]}.{d[3:6]}.{d[6:9]}-{d[9:]}", f"Pix(cpf): {d}", f"CPF {d}"])
+
+
+def _cnpj(rnd: random.Random) -> str:
+    d = _com_dv(rnd, 12, [5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2], [6, 5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2])
+    return rnd.choice([d, f"{d[:2]}.{d[2:5]}.{d[5:8]}/{d[8:12]}-{d[12:]}", f"CNPJ: {d}", d.lstrip("0")])
+
+
+def _celular(rnd: random.Random) -> str:
+    ddd = rnd.choice(["11", "21", "31", "41", "51", "61", "71", "81", "85", "92"])
+    numero = f"9{rnd.randint(1000, 9999)}{rnd.randint(0, 9999):04d}"
+    return rnd.choice([f"{ddd}{numero}", f"({ddd}) {numero[:5]}-{numero[5:]}", f"+55 {ddd} {numero}"])
+
+
+def _valor(rnd: random.Random) -> str:
+    sorteio = rnd.random()
+    if sorteio < 0.40:
+        return _cpf(rnd)
+    if sorteio < 0.50:
+        return _cnpj(rnd)
+    if sorteio < 0.70:
+        return _celular(rnd)
+    if sorteio < 0.82:
+        return f"freela{rnd.randint(1, 10**6)}@{rnd.choice(['gmail.com', 'hotmail.com', 'uol.com.br'])}"
+    if sorteio < 0.90:
+        return str(uuid.UUID(int=rnd.getrandbits(128)))
+    if sorteio < 0.94:
+        return "".join(str(rnd.randint(0, 9)) for _ in range(11))  # CPF digitado errado
+    return rnd.choice(["", " ", "#ERROR!", "-", "não tem", "mesmo do titular"])
+
+
+def build_column(n: int, distinct: int, seed: int = 42) -> List[str]:
+    rnd = random.Random(seed)
+    valores = [_valor(rnd) for _ in range(distinct)]
+    return [rnd.choice(valores) for _ in range(n)]
+
+
+def _tempo(fn: Callable[[], object]) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark do classificador de documento/PIX.")
+    parser.add_argument("--rows", type=int, default=1_000_000, help="Linhas da coluna (padrão: 1000000).")
+    parser.add_argument("--distinct", type=int, default=50_000, help="Valores distintos (padrão: 50000).")
+    args = parser.parse_args()
+
+    conferir_casos()
+    coluna = build_column(args.rows, args.distinct)
+    print(f"coluna EQUIPE de {len(coluna)} linhas, {len(set(coluna))} valores distintos")
+
+    base = _tempo(lambda: [detect_document_antigo(v) for v in coluna])
+    escalar = DocumentClassifier()
+    lote = DocumentClassifier()
+    print(f"{'implementação':<12} {'tempo':>8} {'ganho':>7}")
+    for label, elapsed in (
+        ("antigo", base),
+        ("escalar", _tempo(lambda: [escalar.classify(v) for v in coluna])),
+        ("coluna", _tempo(lambda: lote.classify_many(coluna))),
+    ):
+        print(f"{label:<12} {elapsed:7.2f}s {base / elapsed:6.1f}x")
+
+    print("\ncontadores:", ", ".join(f"{k} {v}" for k, v in lote.counts.most_common()))
+
+    mudancas: Counter = Counter()
+    for valor in set(coluna):
+        antes = detect_document_antigo(valor)["pix_key_type"]
+        depois = lote.classify(valor).pix_key_type
+        if antes != depois:
+            mudancas[f"{antes} -> {depois}"] += 1
+    print("mudanças em relação ao antigo (valores distintos):",
+          ", ".join(f"{k}: {v}" for k, v in mudancas.most_common()) or "nenhuma")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+"""
+bench_json_codecs.py
+
+Micro-benchmark dos codecs JSON do SupabaseRestClient (migration/rest_client.py)
+com payloads realistas de cost_items: descrições e observações longas com
+acentos, snapshots de fornecedor, valores Decimal, datas e UUIDs.
+
+Compara:
+  stdlib-default-str  json.dumps(row, default=str) / resp.json() — modo antigo
+  json                JsonCodec (stdlib compacto, UTF-8, tipos tratados)
+  orjson              OrjsonCodec (somente se `pip install orjson`)
+
+Uso:
+  python scripts/bench_json_codecs.py
+  python scripts/bench_json_codecs.py --rows 5000 --repeat 7
+"""
+
+import argparse
+import json
+import random
+import time
+import uuid
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Any, Callable, Dict, List, Tuple
+
+from migrate_sheets_data import IMPORT_SOURCE
+from migration.rest_client import JSON_CODECS, JsonCodec, orjson
+
+
+DESCRICOES = [
+    "Diretor de fotografia — diárias de filmagem externa com equipe reduzida",
+    "Locação de equipamento de iluminação (kit HMI 4K + gelatinas e difusores)",
+    "Edição e finalização — versões 30\", 15\" e cortes para redes sociais",
+    "Alimentação da equipe técnica e elenco durante as diárias de gravação",
+    "Transporte de equipamentos São Paulo → Paraty, ida e volta, com seguro",
+]
+OBSERVACOES = [
+    "Pagamento condicionado à entrega da NF; verificar retenção de ISS.",
+    "Valor negociado com desconto de 10% por pacote de três diárias.",
+    "Inclui horas extras aprovadas pela produção executiva em 14/03.",
+    "",
+]
+FORNECEDORES = ["Ana Lima", "Carlos Mendes Produções ME", "Fernanda Costa", "João Araújo"]
+
+
+def build_rows(n: int, seed: int = 42) -> List[Dict[str, Any]]:
+    """Gera n payloads de cost_items no formato enviado por _process_cost_row."""
+    rnd = random.Random(seed)
+    tenant_id = uuid.UUID(int=rnd.getrandbits(128))
+    jobs = [uuid.UUID(int=rnd.getrandbits(128)) for _ in range(20)]
+    vendors = [uuid.UUID(int=rnd.getrandbits(128)) for _ in range(50)]
+    base = date(2024, 1, 1)
+    rows = []
+    for i in range(n):
+        vendor = rnd.choice(FORNECEDORES)
+        rows.append({
+            "tenant_id":             tenant_id,
+            "job_id":                rnd.choice(jobs),
+            "item_number":           i % 20 + 1,
+            "sub_item_number":       i % 7,
+            "service_description":   rnd.choice(DESCRICOES),
+            "sort_order":            i + 1,
+            "quantity":              rnd.randint(1, 5),
+            "unit_value":            Decimal(rnd.randint(10_000, 5_000_000)) / 100,
+            "actual_paid_value":     Decimal(rnd.randint(10_000, 5_000_000)) / 100,
+            "item_status":           "orcado",
+            "nf_request_status":     "pendente",
+            "payment_status":        rnd.choice(["pendente", "pago"]),
+            "payment_condition":     "c_nf_30",
+            "payment_due_date":      base + timedelta(days=rnd.randint(0, 365)),
+            "notes":                 rnd.choice(OBSERVACOES),
+            "vendor_id":             rnd.choice(vendors),
+            "vendor_name_snapshot":  vendor,
+            "vendor_email_snapshot": f"{vendor.split()[0].lower()}@exemplo.com.br",
+            "vendor_pix_snapshot":   f"{rnd.randint(0, 10**11 - 1):011d}",
+            "import_source":         IMPORT_SOURCE,
+        })
+    return rows
+
+
+class _DefaultStrCodec(JsonCodec):
+    """Comportamento anterior: default=str, ensure_ascii e separadores padrão."""
+
+    name = "stdlib-default-str"
+
+    def dumps(self, value: Any) -> bytes:
+        return json.dumps(value, default=str).encode("utf-8")
+
+
+def _best_of(fn: Callable[[], Any], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def bench(codec: JsonCodec, rows: List[Dict], repeat: int) -> Tuple[float, float, int]:
+    """Retorna (segundos de encode, segundos de decode, bytes do lote)."""
+    # Encode como no _chunks: um dumps por linha, unidos num array
+    encode = lambda: b"[" + b",".join(codec.dumps(r) for r in rows) + b"]"
+    body = encode()
+    # Decode de uma resposta return=representation com as mesmas linhas
+    response = body
+    return _best_of(encode, repeat), _best_of(lambda: codec.loads(response), repeat), len(body)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark dos codecs JSON (cost_items).")
+    parser.add_argument("--rows", type=int, default=2000, help="Linhas por lote (padrão: 2000).")
+    parser.add_argument("--repeat", type=int, default=5, help="Repetições, vale a melhor (padrão: 5).")
+    args = parser.parse_args()
+
+    rows = build_rows(args.rows)
+    codecs: List[JsonCodec] = [_DefaultStrCodec(), JSON_CODECS["json"]()]
+    if orjson is not None:
+        codecs.append(JSON_CODECS["orjson"]())
+    else:
+        print("orjson não instalado — comparando só a stdlib (pip install orjson).")
+
+    print(f"\n{args.rows} cost_items, melhor de {args.repeat}\n")
+    print(f"{'codec':<20} {'encode ms':>10} {'decode ms':>10} {'linhas/s enc':>13} {'bytes':>10}")
+    baseline = None
+    for codec in codecs:
+        enc, dec, size = bench(codec, rows, args.repeat)
+        baseline = baseline or (enc + dec)
+        print(
+            f"{codec.name:<20} {enc * 1000:>10.2f} {dec * 1000:>10.2f} "
+            f"{args.rows / enc:>13,.0f} {size:>10,}   {baseline / (enc + dec):.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
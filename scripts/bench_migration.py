@@ -0,0 +1,185 @@
+# -*- coding: utf-8 -*-
+"""
+bench_migration.py
+
+Benchmark offline da migracao (migrate_sheets_data.py) contra o fake PostgREST.
+
+Gera CSVs sinteticos (freelancers, jobs, custos) com semente fixa, sobe o
+fake_postgrest em processo com a latencia/erros pedidos e roda a migracao
+N vezes seguidas (a partir da 2a rodada mede o caminho idempotente).
+Argumentos desconhecidos sao repassados ao migrate_sheets_data.
+
+Uso:
+    python scripts/bench_migration.py
+    python scripts/bench_migration.py --vendors 2000 --jobs 500 --costs 8000 \\
+        --latency 0.05 --rounds 2 -- --async --concurrency 32
+    python scripts/bench_migration.py --error-rate 0.1 --csv-dir scripts/data
+"""
+
+import argparse
+import csv
+import os
+import random
+import sys
+import tempfile
+import time
+from typing import Dict, List
+
+from migration.fake_postgrest import FakePostgrest
+
+BENCH_TENANT_ID = "00000000-0000-4000-8000-000000000001"
+
+NOMES = ["Ana", "Joao", "Mariana", "Carlos", "Fernanda", "Jose", "Lucia", "Andre", "Beatriz", "Otavio"]
+SOBRENOMES = ["Silva", "Araujo", "Conceicao", "Mendes", "Lima", "Goncalves", "Sa", "Brandao", "Costa"]
+BANCOS = ["Itau", "Bradesco", "Nubank", "Banco do Brasil", "Caixa", "Inter", "Santander", "C6 Bank", "341"]
+STATUS = ["entregue", "em_andamento", "finalizado", "aprovado"]
+CONDICOES = ["a vista", "C/NF 30 dias", "C/NF 45", "S/NF 30", ""]
+
+
+# ---------------------------------------------------------------------------
+# Dados sinteticos
+# ---------------------------------------------------------------------------
+
+def _write_csv(path: str, header: List[str], rows: List[List[str]]) -> None:
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        writer.writerows(rows)
+
+
+def _money(rnd: random.Random) -> str:
+    cents = rnd.randint(5_000, 2_500_000)
+    inteiro = f"{cents // 100:,}".replace(",", ".")
+    return f"R$ {inteiro},{cents % 100:02d}"
+
+
+def generate_dataset(directory: str, vendors: int, jobs: int, costs: int, seed: int = 7) -> Dict[str, int]:
+    """
+    Gera freelancers.csv, jobs.csv e costs.csv em `directory`. Inclui ~10% de
+    fornecedores repetidos e custos repetidos para exercitar dedup/idempotencia.
+    """
+    rnd = random.Random(seed)
+    people = [
+        f"{rnd.choice(NOMES)} {rnd.choice(SOBRENOMES)} {i}" for i in range(vendors)
+    ]
+
+    freelancers = []
+    for i, name in enumerate(people + rnd.sample(people, vendors // 10)):
+        cpf = f"{(i * 7919) % 10**11:011d}"
+        email = f"pessoa{i}@exemplo.com.br" if i % 3 else ""
+        freelancers.append([
+            name, email, rnd.choice(BANCOS), cpf, f"(11) 9{rnd.randint(1000, 9999)}-{i % 10000:04d}",
+            f"{rnd.randint(1, 9999):04d}", f"{rnd.randint(10000, 99999)}-{i % 10}", "",
+        ])
+    _write_csv(
+        os.path.join(directory, "freelancers.csv"),
+        ["nome", "email", "banco", "documento_pix", "telefone", "agencia", "conta", "observacoes"],
+        freelancers,
+    )
+
+    clients = [f"Cliente {i}" for i in range(max(1, jobs // 8))]
+    agencies = [f"Agencia {i}" for i in range(max(1, jobs // 25))]
+    codes = [f"J-{i:04d}" for i in range(jobs)]
+    job_rows = []
+    for i, code in enumerate(codes):
+        job_rows.append([
+            f"Job {i}", code, rnd.choice(clients), rnd.choice(agencies) if i % 2 else "",
+            rnd.choice(STATUS), "filme_publicitario", "",
+            f"{rnd.randint(1, 28):02d}/{rnd.randint(1, 12):02d}/2024", "", _money(rnd), "", "", "",
+        ])
+    _write_csv(
+        os.path.join(directory, "jobs.csv"),
+        ["titulo", "codigo", "cliente", "agencia", "status", "tipo", "marca", "data_briefing",
+         "data_entrega", "valor_fechado", "custo_producao", "observacoes", "drive_url"],
+        job_rows,
+    )
+
+    cost_rows = []
+    for i in range(costs):
+        code = codes[i % len(codes)] if codes else ""
+        item = (i // max(1, len(codes))) % 99 + 1
+        vendor = rnd.choice(people) if people else ""
+        cost_rows.append([
+            code, str(item), "0", f"Custo {i}", _money(rnd), str(rnd.randint(1, 3)), vendor, "", "",
+            rnd.choice(CONDICOES), f"{rnd.randint(1, 28):02d}/{rnd.randint(1, 12):02d}/2024",
+            rnd.choice(["sim", "nao", ""]), "", "", "",
+        ])
+    cost_rows += rnd.sample(cost_rows, costs // 10)
+    _write_csv(
+        os.path.join(directory, "costs.csv"),
+        ["job_code", "item", "sub_item", "descricao", "valor_unitario", "quantidade", "fornecedor",
+         "email_fornecedor", "pix", "condicao_pagamento", "data_pagamento", "pago", "horas_extra",
+         "valor_he", "observacoes"],
+        cost_rows,
+    )
+    return {"freelancers": len(freelancers), "jobs": len(job_rows), "costs": len(cost_rows)}
+
+
+# ---------------------------------------------------------------------------
+# Execucao
+# ---------------------------------------------------------------------------
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Benchmark offline do migrate_sheets_data contra o fake PostgREST."
+    )
+    parser.add_argument("--csv-dir", default=None, dest="csv_dir",
+                        help="Usa CSVs existentes em vez de gerar dados sinteticos")
+    parser.add_argument("--vendors", type=int, default=400)
+    parser.add_argument("--jobs", type=int, default=150)
+    parser.add_argument("--costs", type=int, default=1500)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--rounds", type=int, default=2, help="Execucoes seguidas (padrao: 2)")
+    parser.add_argument("--latency", type=float, default=0.0, help="Latencia por requisicao (s)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Jitter da latencia (s)")
+    parser.add_argument("--error-rate", type=float, default=0.0, dest="error_rate")
+    parser.add_argument("--max-rows", type=int, default=1000, dest="max_rows")
+    args, extra = parser.parse_known_args()
+    extra = [a for a in extra if a != "--"]
+
+    with tempfile.TemporaryDirectory(prefix="bench-migracao-") as tmp:
+        csv_dir = args.csv_dir
+        if csv_dir is None:
+            csv_dir = tmp
+            sizes = generate_dataset(tmp, args.vendors, args.jobs, args.costs, args.seed)
+            print(f"Dados sinteticos: {sizes}")
+
+        server = FakePostgrest(
+            latency=args.latency, jitter=args.jitter, error_rate=args.error_rate,
+            retry_after=0, max_rows=args.max_rows, seed=args.seed,
+        )
+        with server:
+            os.environ.update(
+                SUPABASE_URL=server.url,
+                SUPABASE_SERVICE_ROLE_KEY="fake-service-role",
+                TENANT_ID=BENCH_TENANT_ID,
+            )
+            # Importado depois do ambiente pronto: o modulo le as variaveis no import
+            import migrate_sheets_data
+
+            results = []
+            for rnd in range(args.rounds):
+                before = dict(server.stats)
+                sys.argv = ["migrate_sheets_data.py", "--csv-dir", csv_dir] + extra
+                start = time.perf_counter()
+                migrate_sheets_data.main()
+                elapsed = time.perf_counter() - start
+                delta = {k: server.stats[k] - before[k] for k in server.stats}
+                results.append((rnd + 1, elapsed, delta))
+
+            counts = {name: len(rows) for name, rows in server.db.dump().items()}
+
+    print("\n" + "=" * 60)
+    print(f"BENCHMARK  latencia={args.latency}s  erros={args.error_rate:.0%}  args={' '.join(extra) or '-'}")
+    print("=" * 60)
+    for rnd, elapsed, delta in results:
+        print(
+            f"  rodada {rnd}: {elapsed:8.2f}s  {delta['requests']:6d} req  "
+            f"{delta['errors_injected']:4d} erros inj.  {delta['connections']:3d} conexoes  "
+            f"{delta['bytes_in'] / 1024:8.1f} KB enviados"
+        )
+    print(f"  linhas no banco: {counts}")
+
+
+if __name__ == "__main__":
+    main()
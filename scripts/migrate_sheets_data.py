@@ -24,14 +24,19 @@ Arquivos CSV esperados em --csv-dir:
 """
 
 import argparse
+import asyncio
 import csv
-import json
 import os
 import re
 import sys
-import unicodedata
-from datetime import datetime, timezone, date
-from typing import Any, Dict, List, Optional, Tuple
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager, nullcontext
+from datetime import datetime, timezone
+from typing import (
+    Any, Callable, ContextManager, Dict, Iterable, Iterator, List, Optional, Tuple,
+)
 
 # Forca stdout/stderr para UTF-8 no Windows (cp1252 nao suporta caracteres como ->)
 if sys.stdout.encoding and sys.stdout.encoding.lower() not in ("utf-8", "utf-8-sig"):
@@ -60,6 +65,44 @@ except ImportError:
     print("[ERRO] Pacote 'requests' não encontrado. Execute: pip install requests")
     sys.exit(1)
 
+# Módulos compartilhados com os scripts de scripts/migration/
+from migration.bank_matcher import match_bank
+from migration.columns import ColumnMap, Columns
+from migration.csv_io import read_csv, read_csv_dicts
+from migration.dates import parse_date_br
+from migration.documents import DOCUMENT_CLASSIFIER, classify_document
+from migration.fingerprint import (
+    FINGERPRINT_CONFLICT,
+    bank_account_fingerprint,
+    cost_item_fingerprint,
+    job_fingerprint,
+    vendor_fingerprint,
+)
+from migration.log import (
+    BOLD, CYAN, GREEN, RED, RESET, YELLOW,
+    log_debug, log_error, log_info, log_ok, log_skip, log_warn, set_verbose,
+)
+from migration.lookup_cache import LookupCache
+from migration.money import parse_brl, parse_brl_column
+from migration.rest_client import (
+    DEFAULT_BATCH_ROWS,
+    DEFAULT_COMPRESS_THRESHOLD,
+    DEFAULT_CONCURRENCY,
+    DEFAULT_MAX_CONN_PER_HOST,
+    DEFAULT_MAX_RETRIES,
+    DEFAULT_POOL_SIZE,
+    JSON_CODECS,
+    RETURN_MINIMAL,
+    AsyncSupabaseRestClient,
+    BulkWriter,
+    RetryPolicy,
+    SupabaseRestClient,
+    get_json_codec,
+    is_conflict,
+)
+from migration.sync_ledger import SyncLedger, SyncRun, tombstone
+from migration.text import normalize_cache_stats, normalize_text
+
 
 # ===========================================================================
 # Configuração
@@ -185,228 +228,99 @@ PAYMENT_CONDITION_MAP: Dict[str, str] = {
     "snf30":            "snf_30",
 }
 
-# Mapeamento banco de texto livre → (bank_code, bank_name_canonico)
-BANK_NORMALIZE: Dict[str, Tuple[Optional[str], str]] = {
-    "nubank":           ("260", "Nu Pagamentos"),
-    "nu bank":          ("260", "Nu Pagamentos"),
-    "nu":               ("260", "Nu Pagamentos"),
-    "260":              ("260", "Nu Pagamentos"),
-    "itau":             ("341", "Itau Unibanco"),
-    "itaú":             ("341", "Itau Unibanco"),
-    "bradesco":         ("237", "Bradesco"),
-    "banco do brasil":  ("001", "Banco do Brasil"),
-    "bb":               ("001", "Banco do Brasil"),
-    "caixa":            ("104", "Caixa Economica Federal"),
-    "cef":              ("104", "Caixa Economica Federal"),
-    "santander":        ("033", "Santander"),
-    "inter":            ("077", "Banco Inter"),
-    "banco inter":      ("077", "Banco Inter"),
-    "c6":               ("336", "C6 Bank"),
-    "c6 bank":          ("336", "C6 Bank"),
-    "picpay":           ("380", "PicPay"),
-    "mercado pago":     ("323", "Mercado Pago"),
-    "safra":            ("422", "Safra"),
-    "sicoob":           ("756", "Sicoob"),
-    "sicredi":          ("748", "Sicredi"),
-    "original":         ("212", "Banco Original"),
-    "neon":             ("655", "Neon"),
-    "next":             ("237", "Bradesco"),
-    "pagbank":          ("290", "PagBank"),
-    "pagseguro":        ("290", "PagBank"),
-    "cora":             ("403", "Cora"),
-    "stone":            ("197", "Stone"),
-    "xp":               ("102", "XP Investimentos"),
-    "will":             ("280", "Will Bank"),
-    "iti":              ("341", "Itau Unibanco"),
-}
-
-
-# ===========================================================================
-# Cores ANSI para terminal
-# ===========================================================================
-
-GREEN  = "\033[92m"
-YELLOW = "\033[93m"
-RED    = "\033[91m"
-CYAN   = "\033[96m"
-BOLD   = "\033[1m"
-RESET  = "\033[0m"
-
-_verbose_global = False
-
-
-def _log(msg: str, level: str = "INFO") -> None:
-    if level == "DEBUG" and not _verbose_global:
-        return
-    now = datetime.now(timezone.utc).strftime("%H:%M:%S")
-    color = {
-        "OK":    GREEN,
-        "SKIP":  YELLOW,
-        "ERROR": RED,
-        "INFO":  CYAN,
-        "WARN":  YELLOW,
-        "DEBUG": RESET,
-    }.get(level, RESET)
-    print(f"{color}[{now}] [{level:5s}] {msg}{RESET}", flush=True)
-
-
-def log_ok(msg: str)    -> None: _log(msg, "OK")
-def log_skip(msg: str)  -> None: _log(msg, "SKIP")
-def log_error(msg: str) -> None: _log(msg, "ERROR")
-def log_info(msg: str)  -> None: _log(msg, "INFO")
-def log_warn(msg: str)  -> None: _log(msg, "WARN")
-def log_debug(msg: str) -> None: _log(msg, "DEBUG")
-
 
 # ===========================================================================
 # Utilitários de normalização
 # ===========================================================================
 
-def normalize_text(text: str) -> str:
-    """
-    Normaliza texto: lowercase, strip, remove acentos, colapsa espaços extras.
-    Equivalente ao normalize_vendor_name() do PostgreSQL.
-    """
-    if not text:
-        return ""
-    text = text.strip()
-    nfkd = unicodedata.normalize("NFKD", text)
-    ascii_str = "".join(c for c in nfkd if not unicodedata.combining(c))
-    cleaned = re.sub(r"[^a-zA-Z0-9\s\-]", "", ascii_str)
-    return re.sub(r"\s+", " ", cleaned).lower().strip()
-
-
 def only_digits(value: str) -> str:
     """Retorna apenas os dígitos de uma string."""
     return re.sub(r"\D", "", value or "")
 
 
-def parse_brl(value: str) -> Optional[float]:
-    """
-    Converte string de moeda brasileira para float.
-    Aceita: 'R$ 1.000,00', '1.000,00', '1000', '50.000,00'.
-    Retorna None se inválido ou zero.
-    """
-    if not value:
-        return None
-    v = value.strip()
-    v = re.sub(r"[R\$\s]", "", v)
-    if not v or v in ("-", "–", "—"):
-        return None
-    v_clean = re.sub(r"[\s\-]", "", v)
-    if not v_clean:
-        return None
-    if "," in v:
-        v = v.replace(".", "").replace(",", ".")
-    else:
-        dot_idx = v.rfind(".")
-        if dot_idx != -1:
-            after = v[dot_idx + 1:]
-            if len(after) == 3:
-                v = v.replace(".", "")
-    try:
-        f = float(v)
-        return f if f != 0.0 else None
-    except ValueError:
-        return None
-
-
-def parse_date_br(value: str) -> Optional[str]:
-    """
-    Converte DD/MM/YYYY ou DD/MM/YY → YYYY-MM-DD.
-    Retorna None se inválido.
-    """
-    if not value:
-        return None
-    v = value.strip()
-    m = re.match(r"^(\d{1,2})/(\d{1,2})/(\d{2,4})$", v)
-    if m:
-        day, month, year = m.groups()
-        if len(year) == 2:
-            year = "20" + year
-        try:
-            date(int(year), int(month), int(day))  # valida
-            return f"{year}-{month.zfill(2)}-{day.zfill(2)}"
-        except ValueError:
-            return None
-    # Tenta YYYY-MM-DD direto
-    m2 = re.match(r"^(\d{4})-(\d{2})-(\d{2})$", v)
-    if m2:
-        return v
-    return None
+# Campos de cada etapa e os cabeçalhos aceitos (em ordem de preferência). O
+# cabeçalho de cada arquivo/aba é resolvido uma vez (migration/columns.py)
+FREELANCER_COLUMNS = Columns(
+    "FreelancerRow",
+    full_name=("nome", "name", "full_name"),
+    email=("email", "e-mail"),
+    bank=("banco", "bank", "bank_name"),
+    document=("documento_pix", "cpf", "cnpj", "documento", "pix"),
+    phone=("telefone", "phone"),
+    agency=("agencia", "agency"),
+    account=("conta", "account"),
+    notes=("observacoes", "notes"),
+)
+# Ordem das colunas de freelancers.csv sem cabeçalho
+FREELANCER_POSITIONAL_HEADERS = (
+    "nome", "email", "banco", "documento_pix", "telefone", "agencia", "conta", "observacoes",
+)
+
+JOB_COLUMNS = Columns(
+    "JobRow",
+    title=("titulo", "title", "nome", "name"),
+    code=("codigo", "code", "job_code", "id"),
+    client=("cliente", "client", "anunciante"),
+    agency=("agencia", "agency"),
+    status=("status", "situacao"),
+    project_type=("tipo", "type", "project_type"),
+    brand=("marca", "brand"),
+    briefing_date=("data_briefing", "briefing_date", "data_inicio"),
+    delivery_date=("data_entrega", "delivery_date", "expected_delivery_date"),
+    closed_value=("valor_fechado", "closed_value", "valor"),
+    production_cost=("custo_producao", "production_cost", "custo"),
+    notes=("observacoes", "notes", "obs"),
+    drive_url=("drive_url", "pasta_drive", "folder_url"),
+)
+
+COST_COLUMNS = Columns(
+    "CostRow",
+    job_code=("job_code", "codigo_job", "job"),
+    job_title=("job_titulo", "job_title"),
+    item=("item", "item_number", "categoria"),
+    sub_item=("sub_item", "sub_item_number"),
+    description=("descricao", "description", "service_description"),
+    quantity=("quantidade", "quantity", "qtde"),
+    vendor=("fornecedor", "vendor", "vendor_name"),
+    payment_condition=("condicao_pagamento", "payment_condition", "c_nf"),
+    payment_due_date=("data_pagamento", "payment_due_date", "vencimento"),
+    notes=("observacoes", "notes", "obs"),
+    paid=("pago", "paid", "status_pagamento"),
+    vendor_email=("email_fornecedor", "vendor_email", "email"),
+    vendor_pix=("pix", "vendor_pix"),
+    unit_value=("valor_unitario", "unit_value", "valor"),
+    overtime_hours=("horas_extra", "overtime_hours"),
+    overtime_rate=("valor_he", "overtime_rate"),
+    actual_paid=("valor_pago", "actual_paid_value"),
+)
+# Posições dos campos monetários nas linhas de COST_COLUMNS: valor unitário,
+# horas extras, valor da hora extra, valor pago
+COST_MONEY_FIELDS = tuple(
+    COST_COLUMNS.index(field)
+    for field in ("unit_value", "overtime_hours", "overtime_rate", "actual_paid")
+)
 
 
 def detect_document(raw: str) -> Dict[str, Any]:
     """
     Analisa campo bruto (CPF / CNPJ / email / telefone / UUID) e retorna dict:
     { entity_type, cpf, cnpj, pix_key, pix_key_type }
+    CPF/CNPJ com dígito verificador inválido não preenchem cpf/cnpj
+    (migration/documents.py).
     """
-    result: Dict[str, Any] = {
-        "entity_type": "pf",
-        "cpf": None,
-        "cnpj": None,
-        "pix_key": None,
-        "pix_key_type": None,
-    }
-    if not raw or not raw.strip():
-        return result
-
-    raw = raw.strip()
-    digits = only_digits(raw)
-
-    # UUID / chave aleatória PIX
-    if re.match(
-        r"^[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}$",
-        raw,
-    ):
-        result["pix_key"] = raw
-        result["pix_key_type"] = "aleatoria"
-        return result
-
-    # E-mail PIX
-    if "@" in raw and "." in raw.split("@")[-1]:
-        result["pix_key"] = raw
-        result["pix_key_type"] = "email"
-        return result
-
-    # CNPJ: 14 dígitos
-    if len(digits) == 14:
-        result["entity_type"] = "pj"
-        result["cnpj"] = digits
-        result["pix_key"] = digits
-        result["pix_key_type"] = "cnpj"
-        return result
-
-    # CPF: 11 dígitos
-    if len(digits) == 11:
-        result["cpf"] = digits
-        result["pix_key"] = digits
-        result["pix_key_type"] = "cpf"
-        return result
-
-    # Telefone
-    if 8 <= len(digits) <= 13:
-        phone = ("+" + digits) if raw.startswith("+") else digits
-        result["pix_key"] = phone
-        result["pix_key_type"] = "telefone"
-        return result
-
-    # Fallback: chave aleatória
-    result["pix_key"] = raw
-    result["pix_key_type"] = "aleatoria"
-    return result
+    return classify_document(raw).as_dict()
 
 
 def normalize_bank(raw: str) -> Tuple[Optional[str], Optional[str]]:
-    """Normaliza texto de banco → (bank_code, bank_name). Retorna (None, raw) se desconhecido."""
+    """
+    Normaliza texto de banco → (bank_code, bank_name) pelo apelido mais longo
+    reconhecido (migration/bank_matcher.py). Retorna (None, raw) se desconhecido.
+    """
     if not raw or not raw.strip():
         return None, None
-    key = raw.strip().lower()
-    if key in BANK_NORMALIZE:
-        return BANK_NORMALIZE[key]
-    for k, v in BANK_NORMALIZE.items():
-        if k in key:
-            return v
+    matched = match_bank(raw)
+    if matched:
+        return matched
     return None, raw.strip()
 
 
@@ -436,123 +350,26 @@ def map_payment_condition(raw: str) -> Optional[str]:
     return PAYMENT_CONDITION_MAP.get(key, PAYMENT_CONDITION_MAP.get(key_no_dias))
 
 
-# ===========================================================================
-# Cliente Supabase REST (service_role — bypass RLS)
-# ===========================================================================
-
-class SupabaseRestClient:
-    """
-    Cliente para a PostgREST API do Supabase.
-    Usa service_role key → ignora RLS completamente.
-    """
-
-    def __init__(self, url: str, key: str) -> None:
-        if not url:
-            raise ValueError("SUPABASE_URL não configurado.")
-        if not key:
-            raise ValueError(
-                "SUPABASE_SERVICE_ROLE_KEY não configurado. "
-                "Exporte a variável de ambiente antes de rodar o script."
-            )
-        self.base_url = url.rstrip("/")
-        self.headers = {
-            "apikey": key,
-            "Authorization": f"Bearer {key}",
-            "Content-Type": "application/json",
-            "Prefer": "return=representation",
-        }
-
-    def _table_url(self, table: str) -> str:
-        return f"{self.base_url}/rest/v1/{table}"
-
-    def select(
-        self,
-        table: str,
-        filters: Optional[Dict[str, str]] = None,
-        columns: str = "*",
-    ) -> List[Dict]:
-        """
-        SELECT com filtros opcionais no estilo PostgREST.
-        Exemplo: filters={"tenant_id": "eq.uuid", "deleted_at": "is.null"}
-        """
-        params: Dict[str, str] = {"select": columns}
-        if filters:
-            params.update(filters)
-        resp = requests.get(self._table_url(table), headers=self.headers, params=params, timeout=30)
-        resp.raise_for_status()
-        return resp.json()
-
-    def insert(self, table: str, data: Dict) -> Optional[Dict]:
-        """INSERT de um registro. Retorna o registro criado."""
-        resp = requests.post(
-            self._table_url(table),
-            headers=self.headers,
-            data=json.dumps(data, default=str),
-            timeout=30,
-        )
-        resp.raise_for_status()
-        result = resp.json()
-        return result[0] if isinstance(result, list) else result
-
-    def upsert(self, table: str, data: Dict, on_conflict: str) -> Optional[Dict]:
-        """
-        INSERT com ON CONFLICT DO UPDATE (upsert).
-        on_conflict: nome da coluna ou colunas separadas por vírgula.
-        """
-        headers = {
-            **self.headers,
-            "Prefer": f"return=representation,resolution=merge-duplicates",
-        }
-        resp = requests.post(
-            self._table_url(table),
-            headers=headers,
-            data=json.dumps(data, default=str),
-            params={"on_conflict": on_conflict},
-            timeout=30,
-        )
-        resp.raise_for_status()
-        result = resp.json()
-        return result[0] if isinstance(result, list) else result
-
-    def update(self, table: str, data: Dict, filters: Dict[str, str]) -> Optional[Dict]:
-        """UPDATE com filtros PostgREST."""
-        resp = requests.patch(
-            self._table_url(table),
-            headers=self.headers,
-            data=json.dumps(data, default=str),
-            params=filters,
-            timeout=30,
-        )
-        resp.raise_for_status()
-        result = resp.json()
-        return result[0] if isinstance(result, list) and result else None
-
-
 # ===========================================================================
 # Leitor de CSV (modo CSV)
 # ===========================================================================
 
 def read_csv_file(filepath: str) -> List[Dict[str, str]]:
     """
-    Lê um CSV como lista de dicts, com fallback de encoding utf-8-sig → latin-1.
-    Retorna lista vazia se arquivo não encontrado.
+    Lê um CSV como lista de dicts (migration/csv_io.py: utf-8-sig → latin-1,
+    sem errors="replace"). Retorna lista vazia se o arquivo não existe ou não
+    decodifica.
     """
     if not os.path.isfile(filepath):
         log_warn(f"Arquivo não encontrado: {filepath}")
         return []
-
-    for encoding in ("utf-8-sig", "utf-8", "latin-1"):
-        try:
-            with open(filepath, newline="", encoding=encoding, errors="replace") as f:
-                reader = csv.DictReader(f)
-                rows = list(reader)
-            log_debug(f"Lido {filepath} ({len(rows)} linhas, encoding={encoding})")
-            return rows
-        except (UnicodeDecodeError, Exception):
-            continue
-
-    log_error(f"Não foi possível ler: {filepath}")
-    return []
+    try:
+        rows = read_csv_dicts(filepath)
+    except ValueError as e:
+        log_error(str(e))
+        return []
+    log_debug(f"Lido {filepath} ({len(rows)} linhas)")
+    return rows
 
 
 def read_csv_raw(filepath: str) -> List[List[str]]:
@@ -563,16 +380,83 @@ def read_csv_raw(filepath: str) -> List[List[str]]:
     if not os.path.isfile(filepath):
         log_warn(f"Arquivo não encontrado: {filepath}")
         return []
+    try:
+        return read_csv(filepath)
+    except ValueError as e:
+        log_error(str(e))
+        return []
 
-    for encoding in ("utf-8-sig", "utf-8", "latin-1"):
-        try:
-            with open(filepath, newline="", encoding=encoding, errors="replace") as f:
-                reader = csv.reader(f)
-                rows = list(reader)
-            return rows
-        except (UnicodeDecodeError, Exception):
-            continue
-    return []
+
+# ===========================================================================
+# Índice de identidade de vendors
+# ===========================================================================
+
+def normalize_pix_key(raw: Optional[str]) -> Optional[str]:
+    """
+    Forma canônica de uma chave PIX para comparação: e-mail e chave aleatória em
+    minúsculas; CPF, CNPJ e telefone só com dígitos.
+    """
+    if not raw or not raw.strip():
+        return None
+    raw = raw.strip()
+    if "@" in raw or re.match(r"^[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-", raw):
+        return raw.lower()
+    return only_digits(raw) or raw.lower()
+
+
+class VendorIndex:
+    """
+    Índice em memória de vendors por várias chaves de identidade.
+
+    Cada vendor é indexado por CPF, CNPJ, e-mail, chave PIX e nome normalizado,
+    com chaves no formato "<tipo>:<valor>" (as mesmas usadas na fila de pendentes).
+    A busca testa as chaves da mais forte (documento) para a mais fraca (nome).
+    """
+
+    KINDS = ("cpf", "cnpj", "email", "pix", "name")
+
+    def __init__(self) -> None:
+        self._ids: Dict[str, str] = {}
+
+    @staticmethod
+    def keys(
+        name: Optional[str] = None,
+        email: Optional[str] = None,
+        cpf: Optional[str] = None,
+        cnpj: Optional[str] = None,
+        pix: Optional[str] = None,
+        normalized_name: Optional[str] = None,
+    ) -> List[str]:
+        """Chaves de identidade na ordem de prioridade de busca."""
+        keys: List[str] = []
+        if cpf and only_digits(cpf):
+            keys.append(f"cpf:{only_digits(cpf)}")
+        if cnpj and only_digits(cnpj):
+            keys.append(f"cnpj:{only_digits(cnpj)}")
+        if email and email.strip():
+            keys.append(f"email:{email.strip().lower()}")
+        pix_key = normalize_pix_key(pix)
+        if pix_key:
+            keys.append(f"pix:{pix_key}")
+        for value in (normalize_text(name or ""), normalized_name):
+            if value and f"name:{value}" not in keys:
+                keys.append(f"name:{value}")
+        return keys
+
+    def add(self, vendor_id: str, keys: List[str]) -> None:
+        """Indexa o vendor; chaves já ocupadas mantêm o primeiro vendor."""
+        for key in keys:
+            self._ids.setdefault(key, vendor_id)
+
+    def find(self, keys: List[str]) -> Optional[str]:
+        for key in keys:
+            vendor_id = self._ids.get(key)
+            if vendor_id:
+                return vendor_id
+        return None
+
+    def __len__(self) -> int:
+        return len(set(self._ids.values()))
 
 
 # ===========================================================================
@@ -585,9 +469,28 @@ class DataMigrator:
     Subclasses implementam os métodos _load_freelancers/_load_jobs/_load_costs.
     """
 
-    def __init__(self, dry_run: bool = False) -> None:
+    def __init__(
+        self,
+        dry_run: bool = False,
+        client: Optional[SupabaseRestClient] = None,
+        batch_size: int = DEFAULT_BATCH_ROWS,
+        lookup_cache: Optional[LookupCache] = None,
+        sync_ledger: Optional[SyncLedger] = None,
+        tombstones: bool = False,
+    ) -> None:
         self.dry_run = dry_run
-        self.client = SupabaseRestClient(SUPABASE_URL, SUPABASE_SERVICE_KEY)
+        # Um único cliente (e pool de conexões) compartilhado por todas as etapas
+        self.client = client or SupabaseRestClient(SUPABASE_URL, SUPABASE_SERVICE_KEY)
+        self.batch_size = batch_size
+        # Cache local de lookups (--lookup-cache); None = sempre baixa do banco
+        self.lookup_cache = lookup_cache
+        # Re-sync incremental (--sync-ledger): só linhas novas ou alteradas de cada
+        # fonte são processadas; com tombstones, as removidas sofrem soft delete
+        self.sync_ledger = sync_ledger
+        self.tombstones = tombstones
+        self._sync: Dict[str, SyncRun] = {}        # etapa → passada incremental
+        # linha → valores monetários da etapa de custos, convertidos por coluna
+        self._cost_money: Dict[int, Tuple[Optional[float], ...]] = {}
         self.tenant_id = TENANT_ID
         self.stats: Dict[str, int] = {
             "vendors_created":       0,
@@ -599,14 +502,44 @@ class DataMigrator:
             "jobs_skipped":          0,
             "cost_items_created":    0,
             "cost_items_skipped":    0,
+            "rows_unchanged":        0,
+            "tombstones":            0,
             "errors":                0,
         }
         self.error_log: List[str] = []
 
         # Caches em memória para evitar múltiplas queries à mesma tabela
-        self._vendor_cache: Dict[str, str]  = {}   # normalized_name → id
+        self._vendor_index = VendorIndex()        # cpf/cnpj/email/pix/nome → id
         self._client_cache: Dict[str, str]  = {}   # normalized_name → id
+        self._client_failures: Dict[str, str] = {}  # normalized_name → erro da 1ª tentativa
+        self._agency_cache: Dict[str, str]  = {}   # normalized_name → id
         self._job_cache: Dict[str, str]     = {}   # code            → id
+        # Caches já carregados nesta execução: as etapas seguintes só os atualizam
+        self._caches_loaded: set = set()
+        self.timings: Dict[str, float] = {}        # etapa → segundos
+
+        # Escrita em lote: registros enfileirados ainda sem id no banco. vendors,
+        # bank_accounts e cost_items levam import_fingerprint e são gravados com
+        # ON CONFLICT DO NOTHING — reimportar (em qualquer dia) não duplica linhas
+        self._vendor_writer = BulkWriter(
+            self.client, "vendors", batch_size,
+            on_conflict=FINGERPRINT_CONFLICT, ignore_duplicates=True,
+        )
+        self._bank_writer   = BulkWriter(
+            self.client, "bank_accounts", batch_size, on_conflict=FINGERPRINT_CONFLICT,
+            returning=RETURN_MINIMAL, ignore_duplicates=True,
+        )
+        # No re-sync incremental a linha alterada atualiza o cost_item (merge)
+        self._cost_writer   = BulkWriter(
+            self.client, "cost_items", batch_size,
+            on_conflict=FINGERPRINT_CONFLICT, ignore_duplicates=sync_ledger is None,
+        )
+        self._job_writer    = BulkWriter(
+            self.client, "jobs", batch_size, on_conflict="tenant_id,code"
+        )
+        self._pending_vendors: set = set()   # chaves do VendorIndex na fila
+        self._pending_jobs: set    = set()   # code / "title:<normalizado>" na fila
+        self._pending_costs: set   = set()   # import_fingerprint de cost_items na fila
 
     # -----------------------------------------------------------------------
     # Validação de configuração
@@ -624,22 +557,96 @@ class DataMigrator:
     # Helpers de cache e lookup
     # -----------------------------------------------------------------------
 
+    # Cache → método que o carrega (usado no aquecimento e por cada etapa)
+    CACHE_LOADERS: Dict[str, str] = {
+        "vendors":  "_load_vendor_cache",
+        "clients":  "_load_client_cache",
+        "agencies": "_load_agency_cache",
+        "jobs":     "_load_job_cache",
+    }
+
+    def _warm_caches(self, *names: str) -> None:
+        """Carrega os caches pedidos que ainda não foram carregados nesta execução."""
+        for name in names:
+            if name not in self._caches_loaded:
+                getattr(self, self.CACHE_LOADERS[name])()
+
+    def warm_up(self) -> Dict[str, List[Any]]:
+        """
+        Carrega todos os caches em paralelo (um GET paginado por tabela) enquanto
+        as fontes (CSV/Sheets) são lidas numa thread à parte. Retorna as linhas
+        de cada etapa; as etapas reutilizam os caches em vez de recarregá-los.
+        """
+        start = time.perf_counter()
+        log_info("Aquecendo caches e lendo as fontes em paralelo...")
+        with ThreadPoolExecutor(max_workers=len(self.CACHE_LOADERS) + 1) as executor:
+            sources = executor.submit(
+                lambda: {
+                    "freelancers": self._load_freelancers(),
+                    "jobs":        self._load_jobs(),
+                    "costs":       self._load_costs(),
+                }
+            )
+            loads = [
+                executor.submit(getattr(self, loader))
+                for loader in self.CACHE_LOADERS.values()
+            ]
+            for future in loads:
+                future.result()
+            rows = sources.result()
+        self.timings["aquecimento"] = time.perf_counter() - start
+        log_info(f"Aquecimento concluído em {self.timings['aquecimento']:.2f}s.")
+        return rows
+
+    def _tenant_rows(self, table: str, columns: str) -> Iterable[Dict]:
+        """
+        Linhas ativas do tenant para aquecer um cache: do LookupCache local
+        (refresh incremental por updated_at) ou paginadas direto do banco.
+        """
+        if self.lookup_cache is not None:
+            return self.lookup_cache.load(table, self.client.select)
+        return self.client.select_iter(
+            table,
+            {"tenant_id": f"eq.{self.tenant_id}", "deleted_at": "is.null"},
+            columns=columns,
+        )
+
     def _load_vendor_cache(self) -> None:
-        """Carrega todos os vendors do tenant em memória para dedup rápido."""
+        """
+        Carrega os vendors do tenant (com as chaves PIX das contas bancárias,
+        embutidas no mesmo SELECT paginado) no índice de identidade.
+        """
         log_info("Carregando cache de vendors...")
         try:
-            rows = self.client.select(
-                "vendors",
-                {
-                    "tenant_id": f"eq.{self.tenant_id}",
-                    "deleted_at": "is.null",
-                },
-                columns="id,normalized_name,email",
-            )
+            if self.lookup_cache is not None:
+                # No cache local as contas ficam em tabela própria; junta por vendor_id
+                accounts: Dict[str, List[Dict]] = {}
+                for a in self.lookup_cache.load("bank_accounts", self.client.select):
+                    accounts.setdefault(a.get("vendor_id"), []).append(a)
+                rows: Iterable[Dict] = [
+                    {**v, "bank_accounts": accounts.get(v["id"], [])}
+                    for v in self.lookup_cache.load("vendors", self.client.select)
+                ]
+            else:
+                rows = self._tenant_rows(
+                    "vendors",
+                    "id,full_name,normalized_name,email,cpf,cnpj,"
+                    "bank_accounts(pix_key,deleted_at)",
+                )
             for r in rows:
-                if r.get("normalized_name"):
-                    self._vendor_cache[r["normalized_name"]] = r["id"]
-            log_debug(f"  {len(self._vendor_cache)} vendors em cache.")
+                keys = VendorIndex.keys(
+                    name=r.get("full_name"),
+                    email=r.get("email"),
+                    cpf=r.get("cpf"),
+                    cnpj=r.get("cnpj"),
+                    normalized_name=r.get("normalized_name"),
+                )
+                for account in r.get("bank_accounts") or []:
+                    if account.get("pix_key") and not account.get("deleted_at"):
+                        keys += VendorIndex.keys(pix=account["pix_key"])
+                self._vendor_index.add(r["id"], keys)
+            self._caches_loaded.add("vendors")
+            log_debug(f"  {len(self._vendor_index)} vendors em cache.")
         except Exception as e:
             log_warn(f"Não foi possível pré-carregar vendor cache: {e}")
 
@@ -647,28 +654,35 @@ class DataMigrator:
         """Carrega todos os clients do tenant em memória."""
         log_info("Carregando cache de clients...")
         try:
-            rows = self.client.select(
-                "clients",
-                {"tenant_id": f"eq.{self.tenant_id}", "deleted_at": "is.null"},
-                columns="id,name",
-            )
+            rows = self._tenant_rows("clients", "id,name")
             for r in rows:
                 key = normalize_text(r.get("name", ""))
                 if key:
-                    self._client_cache[key] = r["id"]
+                    self._client_cache.setdefault(key, r["id"])
+            self._caches_loaded.add("clients")
             log_debug(f"  {len(self._client_cache)} clients em cache.")
         except Exception as e:
             log_warn(f"Não foi possível pré-carregar client cache: {e}")
 
+    def _load_agency_cache(self) -> None:
+        """Carrega todas as agencies do tenant em memória (por nome normalizado)."""
+        log_info("Carregando cache de agencies...")
+        try:
+            rows = self._tenant_rows("agencies", "id,name")
+            for r in rows:
+                key = normalize_text(r.get("name", ""))
+                if key:
+                    self._agency_cache.setdefault(key, r["id"])
+            self._caches_loaded.add("agencies")
+            log_debug(f"  {len(self._agency_cache)} agencies em cache.")
+        except Exception as e:
+            log_warn(f"Não foi possível pré-carregar agency cache: {e}")
+
     def _load_job_cache(self) -> None:
         """Carrega todos os jobs do tenant em memória (por code)."""
         log_info("Carregando cache de jobs...")
         try:
-            rows = self.client.select(
-                "jobs",
-                {"tenant_id": f"eq.{self.tenant_id}", "deleted_at": "is.null"},
-                columns="id,code,title",
-            )
+            rows = self._tenant_rows("jobs", "id,code,title")
             for r in rows:
                 code = (r.get("code") or "").strip()
                 if code:
@@ -677,40 +691,63 @@ class DataMigrator:
                 title_key = normalize_text(r.get("title", ""))
                 if title_key:
                     self._job_cache[f"title:{title_key}"] = r["id"]
+            self._caches_loaded.add("jobs")
             log_debug(f"  {len(self._job_cache)} entries de job em cache.")
         except Exception as e:
             log_warn(f"Não foi possível pré-carregar job cache: {e}")
 
-    def _find_vendor_id(self, name: str, email: Optional[str] = None) -> Optional[str]:
-        """Busca vendor por nome normalizado ou email. Retorna UUID ou None."""
-        norm = normalize_text(name)
-        if norm in self._vendor_cache:
-            return self._vendor_cache[norm]
-        # Tenta busca por email no cache (itera — O(n) mas cache é pequeno)
-        if email:
-            norm_email = email.strip().lower()
-            try:
-                rows = self.client.select(
-                    "vendors",
-                    {
-                        "tenant_id": f"eq.{self.tenant_id}",
-                        "email": f"eq.{norm_email}",
-                        "deleted_at": "is.null",
-                    },
-                    columns="id,normalized_name",
-                )
-                if rows:
-                    vendor_id = rows[0]["id"]
-                    self._vendor_cache[rows[0].get("normalized_name", norm)] = vendor_id
-                    return vendor_id
-            except Exception:
-                pass
+    def _find_vendor_id(self, keys: List[str], email: Optional[str] = None) -> Optional[str]:
+        """
+        Busca vendor pelas chaves de identidade (VendorIndex.keys). Retorna UUID ou None.
+        Só consulta o banco (por e-mail) se o índice não pôde ser pré-carregado.
+        """
+        vendor_id = self._vendor_index.find(keys)
+        if vendor_id or "vendors" in self._caches_loaded or not email:
+            return vendor_id
+        try:
+            rows = self.client.select(
+                "vendors",
+                {
+                    "tenant_id": f"eq.{self.tenant_id}",
+                    "email": f"eq.{email.strip().lower()}",
+                    "deleted_at": "is.null",
+                },
+                columns="id",
+            )
+            if rows:
+                vendor_id = rows[0]["id"]
+                self._vendor_index.add(vendor_id, keys)
+                return vendor_id
+        except Exception:
+            pass
         return None
 
+    def _queue_bank_account(
+        self,
+        vendor_id: str,
+        bank_payload: Dict[str, Any],
+        pix_key: Optional[str],
+        bank_code: Optional[str],
+        agency: Optional[str],
+        account: Optional[str],
+        on_success: Callable[[Optional[str]], None],
+        on_error: Callable[[Exception], None],
+    ) -> None:
+        """Enfileira a conta bancária do vendor (upsert pelo fingerprint da conta)."""
+        bank_fingerprint = bank_account_fingerprint(vendor_id, pix_key, bank_code, agency, account)
+        self._bank_writer.add(
+            {**bank_payload, "vendor_id": vendor_id, "import_fingerprint": bank_fingerprint},
+            on_success, on_error,
+        )
+
     def _find_or_create_client(self, client_name: str) -> Optional[str]:
         """
         Encontra client por nome ou cria um novo.
         Retorna o UUID do client.
+
+        O cache pré-carregado é a fonte da verdade: um miss vira um único INSERT.
+        Linhas concorrentes com o mesmo nome aguardam a primeira (single-flight)
+        e nomes que já falharam nesta execução não são tentados de novo.
         """
         if not client_name or not client_name.strip():
             return None
@@ -718,27 +755,43 @@ class DataMigrator:
         key = normalize_text(client_name)
         if key in self._client_cache:
             return self._client_cache[key]
+        if key in self._client_failures:
+            log_debug(f"  Client '{client_name}' já falhou nesta execução: {self._client_failures[key]}")
+            return None
 
         if self.dry_run:
             log_skip(f"[DRY-RUN] Criaria client: {client_name}")
             return None
 
+        with self._exclusive(f"client:{key}"):
+            # Outra linha pode ter criado (ou falhado) o client enquanto esta aguardava
+            if key in self._client_cache:
+                return self._client_cache[key]
+            if key in self._client_failures:
+                return None
+            return self._create_client(client_name, key)
+
+    def _create_client(self, client_name: str, key: str) -> Optional[str]:
+        """
+        Cria o client e registra no cache. Se o cache não pôde ser pré-carregado,
+        busca no banco pelo nome normalizado antes de criar.
+        """
         try:
-            rows = self.client.select(
-                "clients",
-                {
-                    "tenant_id": f"eq.{self.tenant_id}",
-                    "deleted_at": "is.null",
-                },
-                columns="id,name",
-            )
-            for r in rows:
-                if normalize_text(r.get("name", "")) == key:
-                    client_id = r["id"]
-                    self._client_cache[key] = client_id
-                    return client_id
+            if "clients" not in self._caches_loaded:
+                rows = self.client.select_iter(
+                    "clients",
+                    {
+                        "tenant_id": f"eq.{self.tenant_id}",
+                        "deleted_at": "is.null",
+                    },
+                    columns="id,name",
+                )
+                for r in rows:
+                    if normalize_text(r.get("name", "")) == key:
+                        client_id = r["id"]
+                        self._client_cache[key] = client_id
+                        return client_id
 
-            # Cria novo client
             result = self.client.insert("clients", {
                 "tenant_id": self.tenant_id,
                 "name": client_name.strip().title(),
@@ -750,6 +803,7 @@ class DataMigrator:
             log_ok(f"  Client criado: {client_name} (id={client_id})")
             return client_id
         except Exception as e:
+            self._client_failures[key] = str(e)
             self._record_error(f"clients/_find_or_create: {e}")
             return None
 
@@ -768,6 +822,98 @@ class DataMigrator:
     # Persistência
     # -----------------------------------------------------------------------
 
+    def _process_rows(
+        self, rows: List[Tuple[int, Any]], process: Callable[[Any, int], None]
+    ) -> None:
+        """Aplica process(row, line_num) a cada linha numerada, em ordem."""
+        for line_num, row in rows:
+            process(row, line_num)
+
+    # Etapa → tabela gravada (ledger e tombstones)
+    SYNC_TABLES: Dict[str, str] = {
+        "freelancers": "vendors",
+        "jobs":        "jobs",
+        "costs":       "cost_items",
+    }
+    # Etapas cujos registros removidos da fonte viram tombstones (--tombstones).
+    # vendors ficam de fora: são compartilhados com cadastros feitos no app
+    TOMBSTONE_STAGES = ("jobs", "costs")
+
+    def _source_name(self, stage: str) -> str:
+        """Identifica a fonte da etapa no ledger; subclasses usam arquivo/planilha."""
+        return stage
+
+    def _stage_rows(self, stage: str, rows: List[Any]) -> List[Tuple[int, Any]]:
+        """
+        Linhas numeradas a processar na etapa. Com o ledger, só as novas ou
+        alteradas desde a última sincronização da fonte.
+        """
+        if self.sync_ledger is None:
+            return list(enumerate(rows, start=1))
+        run = SyncRun(self.sync_ledger, self._source_name(stage), self.SYNC_TABLES[stage], rows)
+        self._sync[stage] = run
+        self.stats["rows_unchanged"] += len(rows) - len(run.changed)
+        log_info(
+            f"Sync incremental: {len(run.changed)} de {len(rows)} linhas novas ou alteradas."
+        )
+        return run.changed
+
+    def _map_columns(
+        self,
+        stage: str,
+        columns: Columns,
+        rows: List[Any],
+        numbered: List[Tuple[int, Any]],
+        positional_headers: Tuple[str, ...] = (),
+    ) -> List[Tuple[int, Any]]:
+        """
+        Resolve o cabeçalho da etapa uma vez (avisando colunas ignoradas,
+        ambíguas ou repetidas) e converte as linhas numeradas para tuplas
+        de `columns` (campos na ordem declarada).
+        """
+        column_map: ColumnMap = columns.for_rows(rows, positional_headers)
+        for problem in column_map.report():
+            log_warn(f"Cabeçalho de {stage}: {problem}")
+        if column_map.missing:
+            log_debug(f"Cabeçalho de {stage}: sem coluna para {', '.join(column_map.missing)}")
+        return [(line_num, column_map.row(row)) for line_num, row in numbered]
+
+    def _sync_touch(self, stage: str, fingerprint: Optional[str]) -> None:
+        run = self._sync.get(stage)
+        if run is not None:
+            run.touch(fingerprint)
+
+    def _sync_mark(self, stage: str, line_num: int, fingerprint: Optional[str]) -> None:
+        run = self._sync.get(stage)
+        if run is not None:
+            run.mark(line_num, fingerprint)
+
+    def _finish_sync(self, stage: str) -> None:
+        """Grava o ledger da etapa e aplica os tombstones pedidos."""
+        run = self._sync.pop(stage, None)
+        if run is None or self.dry_run:
+            return
+        removed = run.finish()
+        if not removed:
+            return
+        if not self.tombstones or stage not in self.TOMBSTONE_STAGES:
+            log_info(
+                f"{len(removed)} registros de {run.table} saíram da fonte "
+                "(mantidos; --tombstones remove jobs e custos)."
+            )
+            return
+        try:
+            self.stats["tombstones"] += tombstone(
+                self.client.update, run.table, self.tenant_id, removed
+            )
+            log_ok(f"{len(removed)} registros de {run.table} removidos (soft delete).")
+        except Exception as e:
+            self._record_error(f"Tombstones de {run.table}: {e}")
+
+    def _exclusive(self, key: str) -> ContextManager[None]:
+        """Seção find-or-create por chave; no modo síncrono não há concorrência."""
+        return nullcontext()
+
     def _record_error(self, msg: str) -> None:
         self.stats["errors"] += 1
         self.error_log.append(msg)
@@ -777,60 +923,38 @@ class DataMigrator:
     # Migração de Freelancers → vendors + bank_accounts
     # -----------------------------------------------------------------------
 
-    def migrate_freelancers(self) -> None:
+    def migrate_freelancers(self, rows: Optional[List[Any]] = None) -> None:
         """
         Importa freelancers como vendors (+ bank_accounts quando disponível).
-        Subclasses sobrescrevem _load_freelancers() para retornar os dados.
+        Subclasses sobrescrevem _load_freelancers() para retornar os dados;
+        migrate_all passa as linhas já lidas no aquecimento.
         """
         print(f"\n{BOLD}--- Migrando Freelancers → vendors ---{RESET}")
-        rows = self._load_freelancers()
+        start = time.perf_counter()
+        rows = self._load_freelancers() if rows is None else rows
         if not rows:
             log_warn("Nenhum dado de freelancer encontrado.")
             return
 
-        self._load_vendor_cache()
-
-        for i, row in enumerate(rows, start=1):
-            self._process_freelancer_row(row, i)
-
-    def _process_freelancer_row(self, row: Dict[str, Any], line_num: int) -> None:
-        """Processa uma linha de freelancer e persiste vendor + bank_account."""
-        # Suporta tanto dict (CSV com header) quanto list (CSV sem header)
-        if isinstance(row, (list, tuple)):
-            cols = list(row) + [""] * 8
-            full_name_raw = cols[0]
-            email_raw     = cols[1] if len(cols) > 1 else ""
-            bank_raw      = cols[2] if len(cols) > 2 else ""
-            doc_raw       = cols[3] if len(cols) > 3 else ""
-            phone_raw     = cols[4] if len(cols) > 4 else ""
-            agency_raw    = cols[5] if len(cols) > 5 else ""
-            account_raw   = cols[6] if len(cols) > 6 else ""
-            notes_raw     = cols[7] if len(cols) > 7 else ""
-        else:
-            # Normaliza possíveis variações de nome de coluna
-            full_name_raw = (
-                row.get("nome") or row.get("name") or row.get("full_name") or ""
-            )
-            email_raw  = row.get("email") or row.get("e-mail") or ""
-            bank_raw   = (
-                row.get("banco") or row.get("bank") or row.get("bank_name") or ""
-            )
-            doc_raw    = (
-                row.get("documento_pix") or row.get("cpf") or row.get("cnpj")
-                or row.get("documento") or row.get("pix") or ""
-            )
-            phone_raw  = row.get("telefone") or row.get("phone") or ""
-            agency_raw = row.get("agencia") or row.get("agency") or ""
-            account_raw = row.get("conta") or row.get("account") or ""
-            notes_raw  = row.get("observacoes") or row.get("notes") or ""
-
-        full_name_raw = (full_name_raw or "").strip()
-        email_raw     = (email_raw or "").strip()
-        bank_raw      = (bank_raw or "").strip()
-        doc_raw       = (doc_raw or "").strip()
-        phone_raw     = (phone_raw or "").strip()
-        agency_raw    = (agency_raw or "").strip()
-        account_raw   = (account_raw or "").strip()
+        self._warm_caches("vendors")
+
+        numbered = self._map_columns(
+            "freelancers", FREELANCER_COLUMNS, rows, self._stage_rows("freelancers", rows),
+            FREELANCER_POSITIONAL_HEADERS,
+        )
+        self._process_rows(numbered, self._process_freelancer_row)
+        # Vendors primeiro: os callbacks enfileiram as bank_accounts com o vendor_id
+        self._vendor_writer.flush()
+        self._bank_writer.flush()
+        self._finish_sync("freelancers")
+        self.timings["freelancers"] = time.perf_counter() - start
+
+    def _process_freelancer_row(self, row: Any, line_num: int) -> None:
+        """Processa uma linha de freelancer (FREELANCER_COLUMNS) e persiste vendor + bank_account."""
+        (
+            full_name_raw, email_raw, bank_raw, doc_raw, phone_raw, agency_raw,
+            account_raw, _notes,
+        ) = row
 
         if not full_name_raw:
             log_debug(f"Linha {line_num}: nome vazio — ignorada.")
@@ -860,11 +984,71 @@ class DataMigrator:
             )
             return
 
-        # Verifica duplicata por nome normalizado ou email
-        existing_id = self._find_vendor_id(full_name, email)
+        # Verifica duplicata por documento, email, PIX ou nome (banco ou fila do lote)
+        pending_keys = VendorIndex.keys(
+            name=full_name,
+            email=email,
+            cpf=doc_info["cpf"],
+            cnpj=doc_info["cnpj"],
+            pix=doc_info["pix_key"],
+        )
+        fingerprint = vendor_fingerprint(full_name, email, doc_info["cpf"], doc_info["cnpj"])
+        self._sync_touch("freelancers", fingerprint)
+
+        # Monta payload da conta bancária (vendor_id é preenchido depois)
+        bank_payload: Dict[str, Any] = {
+            "tenant_id": self.tenant_id,
+            "is_primary": True,
+        }
+        if bank_name:
+            bank_payload["bank_name"] = bank_name
+        if bank_code:
+            bank_payload["bank_code"] = bank_code
+        if agency_raw:
+            bank_payload["agency"] = agency_raw
+        if account_raw:
+            bank_payload["account_number"] = account_raw
+        if doc_info["pix_key"]:
+            bank_payload["pix_key"]      = doc_info["pix_key"]
+            bank_payload["pix_key_type"] = doc_info["pix_key_type"]
+
+        # Só persiste bank_account se tiver algum dado bancário útil
+        has_bank_data = any(
+            bank_payload.get(k) for k in
+            ("bank_name", "pix_key", "agency", "account_number")
+        )
+
+        def on_bank_repaired(_bank_id: Optional[str]) -> None:
+            # Com RETURN_MINIMAL não dá para distinguir criada de já existente
+            log_ok(f"  bank_account conferida para '{full_name}'")
+            self._sync_mark("freelancers", line_num, fingerprint)
+
+        def on_bank_repair_error(e: Exception) -> None:
+            if is_conflict(e):
+                # O vendor já tem outra conta principal: nada a reparar
+                log_skip(f"  '{full_name}' já tem conta bancária principal.")
+                self._sync_mark("freelancers", line_num, fingerprint)
+                return
+            log_warn(f"  bank_account de '{full_name}' falhou de novo: {e}")
+
+        existing_id = self._find_vendor_id(pending_keys, email)
         if existing_id:
             log_skip(f"Linha {line_num}: vendor '{full_name}' já existe (id={existing_id})")
             self.stats["vendors_skipped"] += 1
+            if has_bank_data and "freelancers" in self._sync:
+                # Linha fora do ledger: pode ser a conta bancária que falhou numa
+                # execução anterior. O upsert pelo fingerprint da conta não duplica
+                self._queue_bank_account(
+                    existing_id, bank_payload, doc_info["pix_key"], bank_code,
+                    agency_raw, account_raw, on_bank_repaired, on_bank_repair_error,
+                )
+            else:
+                self._sync_mark("freelancers", line_num, fingerprint)
+            return
+        if any(k in self._pending_vendors for k in pending_keys):
+            log_skip(f"Linha {line_num}: vendor '{full_name}' já enfileirado neste lote.")
+            self.stats["vendors_skipped"] += 1
+            self._sync_mark("freelancers", line_num, fingerprint)
             return
 
         # Monta payload do vendor
@@ -873,6 +1057,7 @@ class DataMigrator:
             "full_name":     full_name,
             "entity_type":   doc_info["entity_type"],
             "import_source": IMPORT_SOURCE,
+            "import_fingerprint": fingerprint,
         }
         if email:
             vendor_payload["email"] = email
@@ -883,113 +1068,107 @@ class DataMigrator:
         if doc_info["cnpj"]:
             vendor_payload["cnpj"] = doc_info["cnpj"]
 
-        try:
-            vendor = self.client.insert("vendors", vendor_payload)
-            vendor_id: str = vendor["id"]
-            self._vendor_cache[normalize_text(full_name)] = vendor_id
+        def on_bank_created(_bank_id: Optional[str]) -> None:
+            self.stats["bank_accounts_created"] += 1
+            self._sync_mark("freelancers", line_num, fingerprint)
+            log_ok(
+                f"  bank_account criada para '{full_name}' "
+                f"(bank={bank_name}, pix_type={doc_info['pix_key_type']})"
+            )
+
+        def on_bank_error(e: Exception) -> None:
+            # Vendor já foi criado — registra aviso mas não conta como erro fatal.
+            # A linha fica fora do ledger: a próxima passada refaz só a conta
+            log_warn(f"  Vendor criado mas bank_account falhou para '{full_name}': {e}")
+
+        def on_vendor_created(vendor_id: str) -> None:
+            self._pending_vendors.difference_update(pending_keys)
+            self._vendor_index.add(vendor_id, pending_keys)
             self.stats["vendors_created"] += 1
             log_ok(f"Linha {line_num}: vendor criado '{full_name}' (id={vendor_id})")
-        except Exception as e:
-            self._record_error(f"Linha {line_num}: vendor '{full_name}': {e}")
-            return
-
-        # Monta payload da conta bancária
-        bank_payload: Dict[str, Any] = {
-            "tenant_id": self.tenant_id,
-            "vendor_id": vendor_id,
-            "is_primary": True,
-        }
-        if bank_name:
-            bank_payload["bank_name"] = bank_name
-        if bank_code:
-            bank_payload["bank_code"] = bank_code
-        if agency_raw:
-            bank_payload["agency"] = agency_raw
-        if account_raw:
-            bank_payload["account_number"] = account_raw
-        if doc_info["pix_key"]:
-            bank_payload["pix_key"]      = doc_info["pix_key"]
-            bank_payload["pix_key_type"] = doc_info["pix_key_type"]
+            if not has_bank_data:
+                self._sync_mark("freelancers", line_num, fingerprint)
+                return
+            self._queue_bank_account(
+                vendor_id, bank_payload, doc_info["pix_key"], bank_code,
+                agency_raw, account_raw, on_bank_created, on_bank_error,
+            )
 
-        # Só persiste bank_account se tiver algum dado bancário útil
-        has_bank_data = any(
-            bank_payload.get(k) for k in
-            ("bank_name", "pix_key", "agency", "account_number")
-        )
-        if has_bank_data:
+        def on_vendor_duplicate(payload: Dict) -> None:
+            # Importado antes (outro dia ou execução concorrente) e fora do índice:
+            # só busca o id para que os custos seguintes achem o vendor
+            self._pending_vendors.difference_update(pending_keys)
+            self.stats["vendors_skipped"] += 1
             try:
-                self.client.insert("bank_accounts", bank_payload)
-                self.stats["bank_accounts_created"] += 1
-                log_ok(
-                    f"  bank_account criada para '{full_name}' "
-                    f"(bank={bank_name}, pix_type={doc_info['pix_key_type']})"
+                found = self.client.select(
+                    "vendors",
+                    {
+                        "tenant_id": f"eq.{self.tenant_id}",
+                        "import_fingerprint": f"eq.{payload['import_fingerprint']}",
+                        "deleted_at": "is.null",
+                    },
+                    columns="id",
                 )
             except Exception as e:
-                # Vendor já foi criado — registra aviso mas não conta como erro fatal
+                log_warn(f"Linha {line_num}: vendor '{full_name}' já importado; id não lido: {e}")
+                return
+            if not found:
+                # O fingerprint fica no vendor removido/mesclado: o id dele não
+                # é reaproveitado, senão custos e contas iriam para um vendor morto
                 log_warn(
-                    f"  Vendor criado mas bank_account falhou para '{full_name}': {e}"
+                    f"Linha {line_num}: vendor '{full_name}' já importado, mas removido "
+                    "ou mesclado — custos dele não serão vinculados por esta linha."
+                )
+                self._sync_mark("freelancers", line_num, fingerprint)
+                return
+            self._vendor_index.add(found[0]["id"], pending_keys)
+            log_skip(f"Linha {line_num}: vendor '{full_name}' já importado (fingerprint).")
+            if has_bank_data and "freelancers" in self._sync:
+                self._queue_bank_account(
+                    found[0]["id"], bank_payload, doc_info["pix_key"], bank_code,
+                    agency_raw, account_raw, on_bank_repaired, on_bank_repair_error,
                 )
+            else:
+                self._sync_mark("freelancers", line_num, fingerprint)
+
+        def on_vendor_error(e: Exception) -> None:
+            self._pending_vendors.difference_update(pending_keys)
+            self._record_error(f"Linha {line_num}: vendor '{full_name}': {e}")
+
+        self._pending_vendors.update(pending_keys)
+        self._vendor_writer.add(
+            vendor_payload, on_vendor_created, on_vendor_error, on_vendor_duplicate
+        )
 
     # -----------------------------------------------------------------------
     # Migração de Jobs
     # -----------------------------------------------------------------------
 
-    def migrate_jobs(self) -> None:
+    def migrate_jobs(self, rows: Optional[List[Any]] = None) -> None:
         """Importa jobs para a tabela jobs."""
         print(f"\n{BOLD}--- Migrando Jobs ---{RESET}")
-        rows = self._load_jobs()
+        start = time.perf_counter()
+        rows = self._load_jobs() if rows is None else rows
         if not rows:
             log_warn("Nenhum dado de job encontrado.")
             return
 
-        self._load_client_cache()
-        self._load_job_cache()
-
-        for i, row in enumerate(rows, start=1):
-            self._process_job_row(row, i)
-
-    def _process_job_row(self, row: Dict[str, Any], line_num: int) -> None:
-        """Processa uma linha de job e persiste na tabela jobs."""
-        # Extrai campos com fallback para múltiplos nomes de coluna
-        title = (
-            row.get("titulo") or row.get("title") or row.get("nome") or row.get("name") or ""
-        ).strip()
-        code_raw = (
-            row.get("codigo") or row.get("code") or row.get("job_code") or row.get("id") or ""
-        ).strip()
-        client_name = (
-            row.get("cliente") or row.get("client") or row.get("anunciante") or ""
-        ).strip()
-        agency_name = (
-            row.get("agencia") or row.get("agency") or ""
-        ).strip()
-        status_raw = (
-            row.get("status") or row.get("situacao") or ""
-        ).strip()
-        project_type_raw = (
-            row.get("tipo") or row.get("type") or row.get("project_type") or ""
-        ).strip()
-        brand = (
-            row.get("marca") or row.get("brand") or ""
-        ).strip()
-        briefing_date_raw = (
-            row.get("data_briefing") or row.get("briefing_date") or row.get("data_inicio") or ""
-        ).strip()
-        delivery_date_raw = (
-            row.get("data_entrega") or row.get("delivery_date") or row.get("expected_delivery_date") or ""
-        ).strip()
-        closed_value_raw = (
-            row.get("valor_fechado") or row.get("closed_value") or row.get("valor") or ""
-        ).strip()
-        production_cost_raw = (
-            row.get("custo_producao") or row.get("production_cost") or row.get("custo") or ""
-        ).strip()
-        notes = (
-            row.get("observacoes") or row.get("notes") or row.get("obs") or ""
-        ).strip()
-        drive_url = (
-            row.get("drive_url") or row.get("pasta_drive") or row.get("folder_url") or ""
-        ).strip()
+        self._warm_caches("clients", "agencies", "jobs")
+
+        # Cada linha resolve client/agency e enfileira o payload; o upsert vai em lote
+        numbered = self._map_columns("jobs", JOB_COLUMNS, rows, self._stage_rows("jobs", rows))
+        self._process_rows(numbered, self._process_job_row)
+        self._job_writer.flush()
+        self._finish_sync("jobs")
+        self.timings["jobs"] = time.perf_counter() - start
+
+    def _process_job_row(self, row: Any, line_num: int) -> None:
+        """Processa uma linha de job (JOB_COLUMNS) e persiste na tabela jobs."""
+        (
+            title, code_raw, client_name, agency_name, status_raw, project_type_raw,
+            brand, briefing_date_raw, delivery_date_raw, closed_value_raw,
+            production_cost_raw, notes, drive_url,
+        ) = row
 
         if not title and not code_raw:
             log_debug(f"Linha {line_num}: título e código vazios — ignorada.")
@@ -999,24 +1178,44 @@ class DataMigrator:
         if normalize_text(title) in ("titulo", "title", "nome", "job"):
             return
 
-        # Verifica se já existe (idempotência por code)
+        title_key = f"title:{normalize_text(title)}"
+        pending_key = code_raw.lower() if code_raw else title_key
+        # Calculado antes do code gerado (IMPORT-NNNN), que depende da linha
+        fingerprint = job_fingerprint(code_raw, normalize_text(title))
+        self._sync_touch("jobs", fingerprint)
+
+        # Verifica se já existe (idempotência por code). No re-sync incremental a
+        # linha alterada de um job com code segue para o upsert, que o atualiza
         if code_raw:
             existing_id = self._find_job_id(code_raw, title)
-            if existing_id:
+            updates = self.sync_ledger is not None and code_raw.lower() in self._job_cache
+            if existing_id and not updates:
                 log_skip(f"Linha {line_num}: job '{code_raw} - {title}' já existe.")
                 self.stats["jobs_skipped"] += 1
+                self._sync_mark("jobs", line_num, fingerprint)
                 return
         elif title:
             existing_id = self._find_job_id("", title)
             if existing_id:
                 log_skip(f"Linha {line_num}: job '{title}' já existe.")
                 self.stats["jobs_skipped"] += 1
+                self._sync_mark("jobs", line_num, fingerprint)
                 return
 
+        if pending_key in self._pending_jobs:
+            log_skip(f"Linha {line_num}: job '{code_raw or title}' já enfileirado neste lote.")
+            self.stats["jobs_skipped"] += 1
+            self._sync_mark("jobs", line_num, fingerprint)
+            return
+
         if self.dry_run:
             log_skip(f"[DRY-RUN] Linha {line_num}: job '{code_raw} - {title}'")
             return
 
+        # Reserva a chave antes de qualquer I/O (client/agency), para que linhas
+        # repetidas processadas em paralelo não enfileirem o mesmo job
+        self._pending_jobs.add(pending_key)
+
         # Resolve client_id (cria client se necessário)
         client_id = None
         if client_name:
@@ -1025,6 +1224,7 @@ class DataMigrator:
             # jobs.client_id é NOT NULL — cria um placeholder "Desconhecido"
             client_id = self._find_or_create_client("Desconhecido")
             if not client_id:
+                self._pending_jobs.discard(pending_key)
                 self._record_error(
                     f"Linha {line_num}: não foi possível resolver client_id para job '{title}'."
                 )
@@ -1051,6 +1251,7 @@ class DataMigrator:
             "client_id":    client_id,
             "status":       map_job_status(status_raw),
             "project_type": map_project_type(project_type_raw),
+            "import_fingerprint": fingerprint,
             "import_source": IMPORT_SOURCE,  # armazenado em custom_fields pois jobs não tem import_source direto
         }
 
@@ -1091,35 +1292,53 @@ class DataMigrator:
             if agency_id:
                 job_payload["agency_id"] = agency_id
 
-        try:
-            result = self.client.upsert(
-                "jobs",
-                job_payload,
-                on_conflict="tenant_id,code",
-            )
-            job_id: str = result["id"]
+        def on_job_saved(job_id: str) -> None:
+            self._pending_jobs.discard(pending_key)
             self._job_cache[code_raw.lower()] = job_id
-            self._job_cache[f"title:{normalize_text(title)}"] = job_id
+            self._job_cache[title_key] = job_id
             self.stats["jobs_created"] += 1
+            self._sync_mark("jobs", line_num, fingerprint)
             log_ok(f"Linha {line_num}: job criado/atualizado '{code_raw} - {title}' (id={job_id})")
-        except Exception as e:
+
+        def on_job_error(e: Exception) -> None:
+            self._pending_jobs.discard(pending_key)
             self._record_error(f"Linha {line_num}: job '{code_raw}': {e}")
 
+        self._job_writer.add(job_payload, on_job_saved, on_job_error)
+
     def _find_or_create_agency(self, agency_name: str) -> Optional[str]:
         """Encontra ou cria uma agência. Retorna UUID."""
         key = normalize_text(agency_name)
+        if not key:
+            return None
+        if key in self._agency_cache:
+            return self._agency_cache[key]
+
+        with self._exclusive(f"agency:{key}"):
+            # Outra linha pode ter criado a agência enquanto esta aguardava
+            if key in self._agency_cache:
+                return self._agency_cache[key]
+            return self._create_agency(agency_name, key)
+
+    def _create_agency(self, agency_name: str, key: str) -> Optional[str]:
+        """
+        Cria a agência e registra no cache. Se o cache não pôde ser pré-carregado,
+        busca no banco pelo nome normalizado antes de criar.
+        """
         try:
-            rows = self.client.select(
-                "agencies",
-                {
-                    "tenant_id": f"eq.{self.tenant_id}",
-                    "deleted_at": "is.null",
-                },
-                columns="id,name",
-            )
-            for r in rows:
-                if normalize_text(r.get("name", "")) == key:
-                    return r["id"]
+            if "agencies" not in self._caches_loaded:
+                rows = self.client.select_iter(
+                    "agencies",
+                    {
+                        "tenant_id": f"eq.{self.tenant_id}",
+                        "deleted_at": "is.null",
+                    },
+                    columns="id,name",
+                )
+                for r in rows:
+                    if normalize_text(r.get("name", "")) == key:
+                        self._agency_cache[key] = r["id"]
+                        return r["id"]
 
             if self.dry_run:
                 log_skip(f"[DRY-RUN] Criaria agency: {agency_name}")
@@ -1130,8 +1349,10 @@ class DataMigrator:
                 "name": agency_name.strip().title(),
                 "is_active": True,
             })
+            agency_id = result["id"]
+            self._agency_cache[key] = agency_id
             log_ok(f"  Agency criada: {agency_name}")
-            return result["id"]
+            return agency_id
         except Exception as e:
             log_warn(f"  Não foi possível resolver agency '{agency_name}': {e}")
             return None
@@ -1140,75 +1361,53 @@ class DataMigrator:
     # Migração de Custos → cost_items
     # -----------------------------------------------------------------------
 
-    def migrate_costs(self) -> None:
+    def migrate_costs(self, rows: Optional[List[Any]] = None) -> None:
         """
         Importa custos para a tabela cost_items.
         Requer que vendors e jobs já existam no banco.
         """
         print(f"\n{BOLD}--- Migrando Custos → cost_items ---{RESET}")
-        rows = self._load_costs()
+        start = time.perf_counter()
+        rows = self._load_costs() if rows is None else rows
         if not rows:
             log_warn("Nenhum dado de custo encontrado.")
             return
 
-        self._load_vendor_cache()
-        self._load_job_cache()
+        # Vendors e jobs criados nas etapas anteriores já estão nos caches
+        self._warm_caches("vendors", "jobs")
 
-        for i, row in enumerate(rows, start=1):
-            self._process_cost_row(row, i)
+        numbered = self._map_columns("costs", COST_COLUMNS, rows, self._stage_rows("costs", rows))
+        self._cost_money = self._parse_cost_money(numbered)
+        self._process_rows(numbered, self._process_cost_row)
+        self._cost_money = {}
+        self._cost_writer.flush()
+        self._finish_sync("costs")
+        self.timings["custos"] = time.perf_counter() - start
 
-    def _process_cost_row(self, row: Dict[str, Any], line_num: int) -> None:
-        """Processa uma linha de custo e persiste em cost_items."""
+    def _parse_cost_money(
+        self, rows: List[Tuple[int, Any]]
+    ) -> Dict[int, Tuple[Optional[float], ...]]:
+        """
+        Valores monetários (unitário, horas extras, valor da HE, pago) de cada
+        linha, convertidos coluna a coluna com parse_brl_column.
+        """
+        columns = [
+            parse_brl_column(row[field] for _, row in rows)
+            for field in COST_MONEY_FIELDS
+        ]
+        return {
+            line_num: tuple(values[i] if mask[i] else None for values, mask in columns)
+            for i, (line_num, _) in enumerate(rows)
+        }
+
+    def _process_cost_row(self, row: Any, line_num: int) -> None:
+        """Processa uma linha de custo (COST_COLUMNS) e persiste em cost_items."""
         # Campos do item
-        job_code = (
-            row.get("job_code") or row.get("codigo_job") or row.get("job") or ""
-        ).strip()
-        job_title = (row.get("job_titulo") or row.get("job_title") or "").strip()
-        item_num_raw = (
-            row.get("item") or row.get("item_number") or row.get("categoria") or "1"
-        ).strip()
-        sub_item_raw = (
-            row.get("sub_item") or row.get("sub_item_number") or "1"
-        ).strip()
-        description = (
-            row.get("descricao") or row.get("description") or row.get("service_description") or ""
-        ).strip()
-        unit_value_raw = (
-            row.get("valor_unitario") or row.get("unit_value") or row.get("valor") or ""
-        ).strip()
-        qty_raw = (
-            row.get("quantidade") or row.get("quantity") or row.get("qtde") or "1"
-        ).strip()
-        vendor_name_raw = (
-            row.get("fornecedor") or row.get("vendor") or row.get("vendor_name") or ""
-        ).strip()
-        payment_cond_raw = (
-            row.get("condicao_pagamento") or row.get("payment_condition") or row.get("c_nf") or ""
-        ).strip()
-        payment_due_raw = (
-            row.get("data_pagamento") or row.get("payment_due_date") or row.get("vencimento") or ""
-        ).strip()
-        notes = (
-            row.get("observacoes") or row.get("notes") or row.get("obs") or ""
-        ).strip()
-        pago_raw = (
-            row.get("pago") or row.get("paid") or row.get("status_pagamento") or ""
-        ).strip()
-        overtime_h_raw = (
-            row.get("horas_extra") or row.get("overtime_hours") or ""
-        ).strip()
-        overtime_r_raw = (
-            row.get("valor_he") or row.get("overtime_rate") or ""
-        ).strip()
-        actual_paid_raw = (
-            row.get("valor_pago") or row.get("actual_paid_value") or ""
-        ).strip()
-        vendor_email_raw = (
-            row.get("email_fornecedor") or row.get("vendor_email") or row.get("email") or ""
-        ).strip()
-        vendor_pix_raw = (
-            row.get("pix") or row.get("vendor_pix") or ""
-        ).strip()
+        (
+            job_code, job_title, item_num_raw, sub_item_raw, description, qty_raw,
+            vendor_name_raw, payment_cond_raw, payment_due_raw, notes, pago_raw,
+            vendor_email_raw, vendor_pix_raw, *_money,
+        ) = row
 
         if not description:
             log_debug(f"Linha {line_num}: descrição vazia — ignorada.")
@@ -1237,10 +1436,10 @@ class DataMigrator:
             sub_item = 1
 
         # Parse valores monetários
-        unit_value  = parse_brl(unit_value_raw)
-        overtime_h  = parse_brl(overtime_h_raw)
-        overtime_r  = parse_brl(overtime_r_raw)
-        actual_paid = parse_brl(actual_paid_raw)
+        money = self._cost_money.get(line_num)
+        if money is None:
+            money = tuple(parse_brl(row[field]) for field in COST_MONEY_FIELDS)
+        unit_value, overtime_h, overtime_r, actual_paid = money
 
         try:
             qty = int(float(qty_raw)) if qty_raw else 1
@@ -1264,32 +1463,29 @@ class DataMigrator:
         vendor_name_snapshot: Optional[str] = None
         if vendor_name_raw and not vendor_name_raw.startswith("R$"):
             # Tenta encontrar no cache/banco
-            vendor_id = self._find_vendor_id(vendor_name_raw, vendor_email_raw or None)
+            pix_info = detect_document(vendor_pix_raw)
+            vendor_keys = VendorIndex.keys(
+                name=vendor_name_raw,
+                email=vendor_email_raw,
+                cpf=pix_info["cpf"],
+                cnpj=pix_info["cnpj"],
+                pix=pix_info["pix_key"],
+            )
+            vendor_id = self._find_vendor_id(vendor_keys, vendor_email_raw or None)
             vendor_name_snapshot = vendor_name_raw.strip()
 
-        # Verifica idempotência: busca por import_source + descrição + item_number + sub_item_number + job_id
-        if not self.dry_run:
-            try:
-                filters: Dict[str, str] = {
-                    "tenant_id":          f"eq.{self.tenant_id}",
-                    "service_description": f"eq.{description}",
-                    "item_number":        f"eq.{item_num}",
-                    "sub_item_number":    f"eq.{sub_item}",
-                    "import_source":      f"eq.{IMPORT_SOURCE}",
-                }
-                if job_id:
-                    filters["job_id"] = f"eq.{job_id}"
-                existing = self.client.select("cost_items", filters, columns="id")
-                if existing:
-                    log_skip(
-                        f"Linha {line_num}: cost_item já existe "
-                        f"(item={item_num}.{sub_item} '{description[:40]}') — ignorado."
-                    )
-                    self.stats["cost_items_skipped"] += 1
-                    return
-            except Exception:
-                pass  # Se a query falhar, tenta inserir (pior caso: duplicata tratada pelo DB)
-
+        # Idempotência pelo fingerprint (job + item.sub_item + descrição): repetidas
+        # no arquivo caem aqui; já gravadas são ignoradas pelo banco (DO NOTHING)
+        pending_key = cost_item_fingerprint(job_id, item_num, sub_item, description)
+        self._sync_touch("costs", pending_key)
+        if pending_key in self._pending_costs:
+            log_skip(
+                f"Linha {line_num}: cost_item já enfileirado neste lote "
+                f"(item={item_num}.{sub_item} '{description[:40]}') — ignorado."
+            )
+            self.stats["cost_items_skipped"] += 1
+            self._sync_mark("costs", line_num, pending_key)
+            return
         if self.dry_run:
             log_skip(
                 f"[DRY-RUN] Linha {line_num}: cost_item item={item_num}.{sub_item} "
@@ -1309,6 +1505,7 @@ class DataMigrator:
             "nf_request_status":  "pendente",
             "payment_status":     payment_status,
             "import_source":      IMPORT_SOURCE,
+            "import_fingerprint": pending_key,
         }
 
         if job_id:
@@ -1342,16 +1539,31 @@ class DataMigrator:
         if vendor_pix_raw:
             cost_payload["vendor_pix_snapshot"] = vendor_pix_raw
 
-        try:
-            result = self.client.insert("cost_items", cost_payload)
+        def on_cost_created(cost_id: str) -> None:
+            self._pending_costs.discard(pending_key)
             self.stats["cost_items_created"] += 1
+            self._sync_mark("costs", line_num, pending_key)
             log_ok(
                 f"Linha {line_num}: cost_item criado item={item_num}.{sub_item} "
-                f"'{description[:40]}' (id={result['id']})"
+                f"'{description[:40]}' (id={cost_id})"
             )
-        except Exception as e:
+
+        def on_cost_duplicate(_payload: Dict) -> None:
+            self._pending_costs.discard(pending_key)
+            self.stats["cost_items_skipped"] += 1
+            self._sync_mark("costs", line_num, pending_key)
+            log_skip(
+                f"Linha {line_num}: cost_item já importado "
+                f"(item={item_num}.{sub_item} '{description[:40]}') — ignorado."
+            )
+
+        def on_cost_error(e: Exception) -> None:
+            self._pending_costs.discard(pending_key)
             self._record_error(f"Linha {line_num}: cost_item '{description[:60]}': {e}")
 
+        self._pending_costs.add(pending_key)
+        self._cost_writer.add(cost_payload, on_cost_created, on_cost_error, on_cost_duplicate)
+
     # -----------------------------------------------------------------------
     # Orquestração principal
     # -----------------------------------------------------------------------
@@ -1368,10 +1580,13 @@ class DataMigrator:
         print(f"  Source:   {IMPORT_SOURCE}")
         print(f"{'=' * 60}\n")
 
+        # Caches carregados uma vez, em paralelo com a leitura das fontes
+        rows = self.warm_up()
+
         # Ordem importa por causa das foreign keys
-        self.migrate_freelancers()  # vendors (sem FK externa além de tenant)
-        self.migrate_jobs()         # jobs (FK: clients)
-        self.migrate_costs()        # cost_items (FK: jobs, vendors)
+        self.migrate_freelancers(rows["freelancers"])  # vendors (sem FK externa além de tenant)
+        self.migrate_jobs(rows["jobs"])                # jobs (FK: clients)
+        self.migrate_costs(rows["costs"])              # cost_items (FK: jobs, vendors)
 
         self.print_summary()
 
@@ -1392,7 +1607,23 @@ class DataMigrator:
         print(f"  {YELLOW}Jobs ignorados:          {s['jobs_skipped']}{RESET}")
         print(f"  {GREEN}Cost items criados:      {s['cost_items_created']}{RESET}")
         print(f"  {YELLOW}Cost items ignorados:    {s['cost_items_skipped']}{RESET}")
+        if self.sync_ledger is not None:
+            print(f"  {YELLOW}Linhas inalteradas:      {s['rows_unchanged']}{RESET}")
+            print(f"  {YELLOW}Tombstones:              {s['tombstones']}{RESET}")
         print(f"  {RED}Erros:                   {s['errors']}{RESET}")
+        for label, value in self.client.stats_lines():
+            print(f"  {CYAN}{label + ':':<25}{value}{RESET}")
+        norm = normalize_cache_stats()
+        print(
+            f"  {CYAN}Cache normalize_text:    {norm['hit_rate']:.1%} de acertos "
+            f"({norm['hits']}/{norm['hits'] + norm['misses']}, {norm['size']} entradas){RESET}"
+        )
+        if DOCUMENT_CLASSIFIER.counts:
+            tipos = ", ".join(f"{k} {v}" for k, v in DOCUMENT_CLASSIFIER.counts.most_common())
+            print(f"  {CYAN}Documentos/PIX:          {tipos}{RESET}")
+        if self.timings:
+            etapas = ", ".join(f"{k} {v:.2f}s" for k, v in self.timings.items())
+            print(f"  {CYAN}Tempo:                   {etapas}{RESET}")
         print(f"{'=' * 60}")
         if self.error_log:
             print(f"\n{RED}{BOLD}  ERROS DETALHADOS:{RESET}")
@@ -1433,13 +1664,28 @@ class CsvMigrator(DataMigrator):
       costs.csv        — Com cabeçalho: job_code,item,sub_item,descricao,valor_unitario,...
     """
 
-    def __init__(self, csv_dir: str, dry_run: bool = False) -> None:
-        super().__init__(dry_run=dry_run)
+    def __init__(
+        self,
+        csv_dir: str,
+        dry_run: bool = False,
+        client: Optional[SupabaseRestClient] = None,
+        batch_size: int = DEFAULT_BATCH_ROWS,
+        lookup_cache: Optional[LookupCache] = None,
+        sync_ledger: Optional[SyncLedger] = None,
+        tombstones: bool = False,
+    ) -> None:
+        super().__init__(
+            dry_run=dry_run, client=client, batch_size=batch_size, lookup_cache=lookup_cache,
+            sync_ledger=sync_ledger, tombstones=tombstones,
+        )
         self.csv_dir = csv_dir
 
     def _path(self, filename: str) -> str:
         return os.path.join(self.csv_dir, filename)
 
+    def _source_name(self, stage: str) -> str:
+        return os.path.abspath(self._path(f"{stage}.csv"))
+
     def _load_freelancers(self) -> List[Any]:
         """
         Lê freelancers.csv.
@@ -1498,8 +1744,19 @@ class SheetsMigrator(DataMigrator):
 
     SCOPES = ["https://www.googleapis.com/auth/spreadsheets.readonly"]
 
-    def __init__(self, dry_run: bool = False) -> None:
-        super().__init__(dry_run=dry_run)
+    def __init__(
+        self,
+        dry_run: bool = False,
+        client: Optional[SupabaseRestClient] = None,
+        batch_size: int = DEFAULT_BATCH_ROWS,
+        lookup_cache: Optional[LookupCache] = None,
+        sync_ledger: Optional[SyncLedger] = None,
+        tombstones: bool = False,
+    ) -> None:
+        super().__init__(
+            dry_run=dry_run, client=client, batch_size=batch_size, lookup_cache=lookup_cache,
+            sync_ledger=sync_ledger, tombstones=tombstones,
+        )
         self.sheet_ids = {
             "freelancers": os.getenv("SHEET_FREELANCERS_ID", ""),
             "jobs":        os.getenv("SHEET_JOBS_ID", ""),
@@ -1507,6 +1764,9 @@ class SheetsMigrator(DataMigrator):
         }
         self._sheets_service = None
 
+    def _source_name(self, stage: str) -> str:
+        return f"sheets:{self.sheet_ids[stage]}:{stage}"
+
     def _get_service(self):
         """Inicializa o serviço Google Sheets (lazy)."""
         if self._sheets_service:
@@ -1587,6 +1847,78 @@ class SheetsMigrator(DataMigrator):
         return dicts
 
 
+# ===========================================================================
+# Migrador assíncrono (--async)
+# ===========================================================================
+
+class AsyncDataMigrator(DataMigrator):
+    """
+    Migrador que processa as linhas de cada etapa como tasks asyncio, limitadas
+    por um semáforo de `concurrency`. Usa o mesmo código de linha do DataMigrator
+    (mesmos stats, caches e erros) via AsyncSupabaseRestClient.run_locked; a
+    ordem das etapas e os flushes de lote continuam sequenciais.
+    """
+
+    def __init__(
+        self,
+        *args: Any,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        **kwargs: Any,
+    ) -> None:
+        if kwargs.get("client") is None:
+            kwargs["client"] = AsyncSupabaseRestClient(
+                SUPABASE_URL, SUPABASE_SERVICE_KEY, concurrency=concurrency
+            )
+        super().__init__(*args, **kwargs)
+        if not isinstance(self.client, AsyncSupabaseRestClient):
+            raise TypeError("AsyncDataMigrator requer um AsyncSupabaseRestClient.")
+        self.concurrency = max(1, concurrency)
+        self._key_locks: Dict[str, threading.Lock] = {}
+
+    def _process_rows(
+        self, rows: List[Tuple[int, Any]], process: Callable[[Any, int], None]
+    ) -> None:
+        asyncio.run(self._process_rows_async(rows, process))
+
+    async def _process_rows_async(
+        self, rows: List[Tuple[int, Any]], process: Callable[[Any, int], None]
+    ) -> None:
+        semaphore = asyncio.Semaphore(self.concurrency)
+        tasks: List["asyncio.Task[Any]"] = []
+
+        async def run(row: Any, line_num: int) -> None:
+            try:
+                await self.client.run_locked(process, row, line_num)
+            finally:
+                semaphore.release()
+
+        # Adquire antes de criar a task: no máximo `concurrency` linhas vivas
+        for line_num, row in rows:
+            await semaphore.acquire()
+            tasks.append(asyncio.create_task(run(row, line_num)))
+        await asyncio.gather(*tasks)
+
+    @contextmanager
+    def _exclusive(self, key: str) -> Iterator[None]:
+        # Chamado com o StateLock seguro: a espera pelo lock da chave o libera,
+        # senão a linha que está criando o registro nunca voltaria do I/O
+        lock = self._key_locks.setdefault(key, threading.Lock())
+        with self.client.state.released():
+            lock.acquire()
+        try:
+            yield
+        finally:
+            lock.release()
+
+
+class AsyncCsvMigrator(AsyncDataMigrator, CsvMigrator):
+    """CsvMigrator com processamento assíncrono das linhas."""
+
+
+class AsyncSheetsMigrator(AsyncDataMigrator, SheetsMigrator):
+    """SheetsMigrator com processamento assíncrono das linhas."""
+
+
 # ===========================================================================
 # Entry point CLI
 # ===========================================================================
@@ -1639,14 +1971,123 @@ Exemplos:
         action="store_true",
         help="Exibe logs DEBUG detalhados.",
     )
+    parser.add_argument(
+        "--pool-size",
+        type=int,
+        default=DEFAULT_POOL_SIZE,
+        dest="pool_size",
+        help=f"Sessões HTTP keep-alive no pool (padrão: {DEFAULT_POOL_SIZE}).",
+    )
+    parser.add_argument(
+        "--max-conn-per-host",
+        type=int,
+        default=DEFAULT_MAX_CONN_PER_HOST,
+        dest="max_conn_per_host",
+        help=f"Conexões simultâneas por host em cada sessão (padrão: {DEFAULT_MAX_CONN_PER_HOST}).",
+    )
+    parser.add_argument(
+        "--no-keep-alive",
+        action="store_false",
+        dest="keep_alive",
+        help="Desativa keep-alive (uma conexão nova por requisição).",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=DEFAULT_BATCH_ROWS,
+        dest="batch_size",
+        help=f"Linhas por INSERT em lote (padrão: {DEFAULT_BATCH_ROWS}).",
+    )
+    parser.add_argument(
+        "--max-retries",
+        type=int,
+        default=DEFAULT_MAX_RETRIES,
+        dest="max_retries",
+        help=(
+            "Retentativas em falhas transitórias (429/502/503/504), com backoff "
+            f"exponencial e Retry-After; 0 desativa (padrão: {DEFAULT_MAX_RETRIES})."
+        ),
+    )
+    parser.add_argument(
+        "--compress",
+        action="store_true",
+        help=(
+            "Envia corpos de requisição com gzip a partir de "
+            f"{DEFAULT_COMPRESS_THRESHOLD} bytes (lotes grandes de custos)."
+        ),
+    )
+    parser.add_argument(
+        "--json-codec",
+        choices=["auto", *JSON_CODECS],
+        default="auto",
+        dest="json_codec",
+        help="Codec JSON dos corpos REST; auto usa orjson se instalado (padrão: auto).",
+    )
+    parser.add_argument(
+        "--async",
+        action="store_true",
+        dest="use_async",
+        help="Processa as linhas de cada etapa em paralelo (asyncio).",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=DEFAULT_CONCURRENCY,
+        help=f"Linhas simultâneas no modo --async (padrão: {DEFAULT_CONCURRENCY}).",
+    )
+    parser.add_argument(
+        "--lookup-cache",
+        nargs="?",
+        const=LookupCache.default_path(),
+        default=None,
+        dest="lookup_cache",
+        metavar="ARQUIVO",
+        help=(
+            "Mantém vendors/clients/agencies/jobs num cache SQLite local, atualizado "
+            "de forma incremental entre execuções (padrão do arquivo: $LOOKUP_CACHE_PATH "
+            "ou ~/.cache/ellahos/lookup_cache.sqlite)."
+        ),
+    )
+    parser.add_argument(
+        "--refresh-cache",
+        action="store_true",
+        dest="refresh_cache",
+        help="Descarta o cache de lookups do tenant e baixa tudo de novo.",
+    )
+    parser.add_argument(
+        "--sync-ledger",
+        nargs="?",
+        const=SyncLedger.default_path(),
+        default=None,
+        dest="sync_ledger",
+        metavar="ARQUIVO",
+        help=(
+            "Re-sync incremental: guarda o hash de cada linha sincronizada e, nas próximas "
+            "execuções, processa só as linhas novas ou alteradas; custos e jobs alterados "
+            "são atualizados (padrão do arquivo: $SYNC_LEDGER_PATH ou "
+            "~/.cache/ellahos/sync_ledger.sqlite)."
+        ),
+    )
+    parser.add_argument(
+        "--tombstones",
+        action="store_true",
+        help=(
+            "Com --sync-ledger: soft delete dos jobs e custos cujas linhas saíram da fonte."
+        ),
+    )
+    parser.add_argument(
+        "--reset-ledger",
+        action="store_true",
+        dest="reset_ledger",
+        help="Esquece as linhas já sincronizadas do tenant (a próxima execução envia tudo).",
+    )
     return parser
 
 
 def main() -> None:
-    global _verbose_global
     parser = build_parser()
     args = parser.parse_args()
-    _verbose_global = args.verbose
+    set_verbose(args.verbose)
 
     # Valida configuração mínima
     if not TENANT_ID:
@@ -1663,6 +2104,48 @@ def main() -> None:
         )
         sys.exit(1)
 
+    try:
+        codec = get_json_codec(args.json_codec)
+    except ValueError as e:
+        log_error(str(e))
+        sys.exit(1)
+
+    client_options: Dict[str, Any] = {
+        "pool_size":         args.pool_size,
+        "max_conn_per_host": args.max_conn_per_host,
+        "keep_alive":        args.keep_alive,
+        "retry":             RetryPolicy(max_retries=args.max_retries),
+        "compress":          args.compress,
+        "codec":             codec,
+    }
+    migrator_options: Dict[str, Any] = {}
+    lookup_cache: Optional[LookupCache] = None
+    if args.lookup_cache:
+        lookup_cache = LookupCache(args.lookup_cache, SUPABASE_URL, TENANT_ID)
+        if args.refresh_cache:
+            lookup_cache.reset()
+        migrator_options["lookup_cache"] = lookup_cache
+    sync_ledger: Optional[SyncLedger] = None
+    if args.sync_ledger:
+        sync_ledger = SyncLedger(args.sync_ledger, SUPABASE_URL, TENANT_ID)
+        if args.reset_ledger:
+            sync_ledger.reset()
+        migrator_options["sync_ledger"] = sync_ledger
+        migrator_options["tombstones"] = args.tombstones
+    elif args.tombstones or args.reset_ledger:
+        log_error("--tombstones e --reset-ledger exigem --sync-ledger.")
+        sys.exit(1)
+    if args.use_async:
+        client: SupabaseRestClient = AsyncSupabaseRestClient(
+            SUPABASE_URL, SUPABASE_SERVICE_KEY,
+            concurrency=args.concurrency, **client_options,
+        )
+        migrator_options["concurrency"] = args.concurrency
+        csv_class, sheets_class = AsyncCsvMigrator, AsyncSheetsMigrator
+    else:
+        client = SupabaseRestClient(SUPABASE_URL, SUPABASE_SERVICE_KEY, **client_options)
+        csv_class, sheets_class = CsvMigrator, SheetsMigrator
+
     # Instancia o migrador correto
     if args.mode == "csv":
         # Resolve caminho absoluto caso seja relativo
@@ -1673,9 +2156,20 @@ def main() -> None:
         if not os.path.isdir(csv_dir):
             log_warn(f"Diretório CSV não existe: {csv_dir} — será criado se necessário.")
             os.makedirs(csv_dir, exist_ok=True)
-        migrator: DataMigrator = CsvMigrator(csv_dir=csv_dir, dry_run=args.dry_run)
+        migrator: DataMigrator = csv_class(
+            csv_dir=csv_dir,
+            dry_run=args.dry_run,
+            client=client,
+            batch_size=args.batch_size,
+            **migrator_options,
+        )
     else:
-        migrator = SheetsMigrator(dry_run=args.dry_run)
+        migrator = sheets_class(
+            dry_run=args.dry_run,
+            client=client,
+            batch_size=args.batch_size,
+            **migrator_options,
+        )
 
     # Executa
     migrator._validate_config()
@@ -1690,8 +2184,6 @@ def main() -> None:
         print(f"{'=' * 60}\n")
 
         if args.only == "freelancers":
-            if args.mode == "csv":
-                migrator._load_vendor_cache()
             migrator.migrate_freelancers()
         elif args.only == "jobs":
             migrator.migrate_jobs()
@@ -1702,6 +2194,12 @@ def main() -> None:
     else:
         migrator.migrate_all()
 
+    client.close()
+    if lookup_cache is not None:
+        lookup_cache.close()
+    if sync_ledger is not None:
+        sync_ledger.close()
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,135 @@
+"""
+Reconhecimento de banco em texto livre (coluna "Banco" das planilhas).
+
+Os apelidos de cada banco sao compilados numa trie de palavras: o texto e
+quebrado em palavras (minusculas, sem acento, separadas por qualquer coisa que
+nao seja letra ou digito) e, a partir de cada palavra, a trie e percorrida ate
+onde der. Vence o apelido com mais palavras (depois o com mais caracteres, depois
+o que aparece primeiro), so em fronteira de palavra: "nu" nao casa dentro de
+"numero" e "Banco do Brasil" vence "brasil" sozinho, independente da ordem da
+tabela. Sem apelido, um codigo COMPE conhecido de ate 3 digitos ("341", "77",
+"077 - conta") identifica o banco so se for o texto inteiro ou a primeira
+palavra: numeros no meio do texto ("Banco 1", "Ag 33 Cc 1234") nao casam.
+
+O custo e proporcional ao numero de palavras do texto, nao ao tamanho da tabela,
+e cada texto bruto distinto e resolvido uma vez so (memo LRU).
+
+Uso:
+    match_bank("077 - Banco Inter")   # ("077", "Banco Inter")
+    match_bank("Nu")                  # ("260", "Nu Pagamentos")
+    match_bank("Cooperativa X")       # None
+    match_bank("Ag 33 Cc 1234")       # None
+
+Compartilhado por migrate_sheets_data.py, import_equipe.py e gen_equipe_sql.py.
+"""
+
+import re
+import unicodedata
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Codigo COMPE -> (nome canonico, apelidos). Apelidos em minusculas e sem acento;
+# pontuacao vira separador ("c.e.f." casa "c e f", "077-bancointer" casa "bancointer")
+BANKS: Dict[str, Tuple[str, Tuple[str, ...]]] = {
+    "001": ("Banco do Brasil", ("banco do brasil", "bb", "b b", "brasil")),
+    "033": ("Santander", ("santander", "banco santander")),
+    "077": ("Banco Inter", ("inter", "banco inter", "bancointer")),
+    "102": ("XP Investimentos", ("xp", "xp investimentos")),
+    "104": ("Caixa Economica Federal", (
+        "caixa", "caixa economica", "caixa economica federal", "cef", "c e f",
+    )),
+    "174": ("Pefisa", ("pefisa", "palmeiras pay", "palmeiraspay")),
+    "197": ("Stone", ("stone",)),
+    "212": ("Banco Original", ("original", "banco original")),
+    "237": ("Bradesco", ("bradesco", "next")),
+    "260": ("Nu Pagamentos", (
+        "nu", "nubank", "nu bank", "nubenk", "nu pagamento", "nu pagamentos", "nupagamentos",
+        "nuconta", "nu conta",
+    )),
+    "280": ("Will Bank", ("will", "will bank", "willbank")),
+    "290": ("PagBank", ("pagbank", "pag bank", "pagseguro", "pag seguro")),
+    "301": ("Dock", ("dock",)),
+    "323": ("Mercado Pago", ("mercado pago", "mercadopago")),
+    "336": ("C6 Bank", ("c6", "c6 bank", "c6bank", "banco c6")),
+    "341": ("Itau Unibanco", ("itau", "itau unibanco", "iti")),
+    "380": ("PicPay", ("picpay", "pic pay")),
+    "403": ("Cora", ("cora",)),
+    "422": ("Safra", ("safra", "banco safra")),
+    "536": ("Neon", ("neon",)),
+    "748": ("Sicredi", ("sicredi",)),
+    "756": ("Sicoob", ("sicoob",)),
+}
+
+# Textos brutos distintos memorizados por BankMatcher.match
+BANK_MEMO_SIZE = 4096
+
+_WORD_SEPARATORS = re.compile(r"[^a-z0-9]+")
+
+# Chave do no terminal da trie (nunca e uma palavra: palavras nao tem espaco)
+_END = " "
+
+
+def _words(text: str) -> List[str]:
+    """Palavras do texto: minusculas, sem acento, separadas por nao-alfanumericos."""
+    text = text.lower()
+    if not text.isascii():
+        nfkd = unicodedata.normalize("NFKD", text)
+        text = "".join(c for c in nfkd if not unicodedata.combining(c))
+    return [w for w in _WORD_SEPARATORS.split(text) if w]
+
+
+class BankMatcher:
+    """Trie de apelidos de bancos com match pelo apelido mais longo."""
+
+    def __init__(
+        self,
+        banks: Dict[str, Tuple[str, Iterable[str]]],
+        memo_size: int = BANK_MEMO_SIZE,
+    ) -> None:
+        self.names = {code: name for code, (name, _) in banks.items()}
+        self._trie: Dict[str, dict] = {}
+        for code, (name, aliases) in banks.items():
+            for alias in aliases:
+                node = self._trie
+                for word in _words(alias):
+                    node = node.setdefault(word, {})
+                node[_END] = (code, name)
+        self.match = lru_cache(maxsize=memo_size)(self._match)
+
+    def _match(self, raw: str) -> Optional[Tuple[str, str]]:
+        """(bank_code, bank_name) do texto, ou None se nenhum apelido casar."""
+        if not raw:
+            return None
+        words = _words(raw)
+        best: Optional[Tuple[str, str]] = None
+        best_rank = (0, 0)
+        for start, word in enumerate(words):
+            node = self._trie
+            chars = 0
+            for end in range(start, len(words)):
+                node = node.get(words[end])
+                if node is None:
+                    break
+                chars += len(words[end])
+                rank = (end - start + 1, chars)
+                if _END in node and rank > best_rank:
+                    best, best_rank = node[_END], rank
+        if best is None and words and words[0].isdigit() and len(words[0]) <= 3:
+            code = words[0].zfill(3)
+            if code in self.names:
+                best = (code, self.names[code])
+        return best
+
+    def cache_info(self):
+        """Estatisticas do memo (functools.lru_cache)."""
+        return self.match.cache_info()
+
+
+BANK_MATCHER = BankMatcher(BANKS)
+
+
+def match_bank(raw: Optional[str]) -> Optional[Tuple[str, str]]:
+    """(bank_code, bank_name) pelo BANK_MATCHER padrao, ou None se desconhecido."""
+    if not raw:
+        return None
+    return BANK_MATCHER.match(raw)
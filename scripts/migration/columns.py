@@ -0,0 +1,153 @@
+"""
+Mapeamento de colunas de planilha/CSV para campos logicos, resolvido uma vez
+por arquivo.
+
+Cada aba declara seus campos e os aliases de cabecalho aceitos, em ordem de
+preferencia (Columns). ColumnMap compila o cabecalho real contra essa lista:
+  - cada campo aponta para as colunas presentes entre os seus aliases; com uma
+    so, a extracao e um acesso direto por linha, sem tentativas que falham;
+  - um campo com mais de um alias presente ("titulo" e "nome") e ambiguo: a
+    linha usa o primeiro preenchido, na ordem dos aliases (a mesma semantica
+    das cadeias row.get(a) or row.get(b) antigas);
+  - cabecalhos que nao casam com nenhum campo e campos sem coluna ficam no
+    relatorio (unknown, missing, ambiguous, duplicates) para o log da etapa.
+
+Cabecalhos sao comparados sem espacos nas pontas e em minusculas. As linhas
+podem ser dicts (csv.DictReader, abas do Sheets) ou listas posicionais (CSV sem
+cabecalho); ColumnMap.row, gerada na compilacao do cabecalho, devolve uma
+tupla com os valores na ordem dos campos de Columns, ja sem espacos nas pontas
+("" quando vazio). Tupla simples, e nao namedtuple: o GC deixa de acompanhar
+tuplas so de strings, e a etapa guarda todas as linhas mapeadas de uma vez.
+"""
+
+from typing import Any, Callable, Dict, Hashable, List, Sequence, Tuple
+
+
+def _header_name(header: Any) -> str:
+    return header.strip().lower() if isinstance(header, str) else ""
+
+
+class Columns:
+    """Campos logicos de uma aba e seus aliases de cabecalho, em ordem de preferencia."""
+
+    def __init__(self, name: str, **aliases: Tuple[str, ...]) -> None:
+        self.name = name
+        self.aliases: Dict[str, Tuple[str, ...]] = aliases
+        self.fields: Tuple[str, ...] = tuple(aliases)
+
+    def index(self, field: str) -> int:
+        """Posicao do campo nas tuplas de ColumnMap.row."""
+        return self.fields.index(field)
+
+    def compile(self, headers: Sequence[Any], positional: bool = False) -> "ColumnMap":
+        """Mapa para linhas com este cabecalho (positional=True: linhas sao listas)."""
+        return ColumnMap(self, headers, positional)
+
+    def for_rows(
+        self, rows: Sequence[Any], positional_headers: Sequence[str] = ()
+    ) -> "ColumnMap":
+        """
+        Mapa pelo formato das linhas: dicts usam as chaves da primeira linha;
+        listas (sem cabecalho) usam positional_headers.
+        """
+        if rows and isinstance(rows[0], dict):
+            return self.compile([key for key in rows[0] if key is not None])
+        return self.compile(positional_headers, positional=True)
+
+
+class ColumnMap:
+    """Cabecalho compilado de um arquivo: campo -> colunas (ver docstring do modulo)."""
+
+    def __init__(self, columns: Columns, headers: Sequence[Any], positional: bool = False) -> None:
+        self.columns = columns
+        self.duplicates: List[str] = []
+        positions: Dict[str, Hashable] = {}
+        for i, header in enumerate(headers):
+            name = _header_name(header)
+            if not name:
+                continue
+            if name in positions:
+                self.duplicates.append(name)
+                continue
+            positions[name] = i if positional else header
+
+        keys: List[Hashable] = []
+        slot_of: Dict[Hashable, int] = {}
+        plan: List[Tuple[int, ...]] = []
+        used = set()
+        self.missing: List[str] = []
+        self.ambiguous: Dict[str, List[str]] = {}
+        for field, aliases in columns.aliases.items():
+            present = [alias for alias in aliases if alias in positions]
+            if not present:
+                self.missing.append(field)
+            elif len(present) > 1:
+                self.ambiguous[field] = present
+            slots = []
+            for alias in present:
+                key = positions[alias]
+                if key not in slot_of:
+                    slot_of[key] = len(keys)
+                    keys.append(key)
+                slots.append(slot_of[key])
+                used.add(alias)
+            plan.append(tuple(slots))
+        self.unknown: List[str] = [name for name in positions if name not in used]
+
+        self._keys: Tuple[Hashable, ...] = tuple(keys)
+        self._plan: Tuple[Tuple[int, ...], ...] = tuple(plan)
+        self.row: Callable[[Any], Any] = self._compile_row()
+
+    def _compile_row(self) -> Callable[[Any], Any]:
+        """
+        Gera a funcao linha -> tupla do mapa numa unica expressao, com as chaves
+        como constantes: ((r["titulo"] or r["nome"] or "").strip(), "", ...).
+        Campo sem coluna vira "" sem acesso a linha. E o mesmo recurso (exec)
+        que o namedtuple usa; nao ha laco por campo na linha.
+        """
+        def value(slots: Tuple[int, ...]) -> str:
+            if not slots:
+                return '""'
+            probes = [f"r[{self._keys[slot]!r}]" for slot in slots]
+            return "(" + " or ".join(probes + ['""']) + ").strip()"
+
+        fields = ", ".join(value(slots) for slots in self._plan)
+        source = (
+            "def row(r):\n"
+            "    try:\n"
+            f"        return ({fields},)\n"
+            "    except (KeyError, IndexError):\n"
+            "        return _padded(r)\n"
+        )
+        namespace: Dict[str, Any] = {"_padded": self._row_padded}
+        exec(source, namespace)
+        return namespace["row"]
+
+    def _row_padded(self, row: Any) -> Any:
+        """Linha fora do formato do cabecalho (CSV com colunas a menos)."""
+        if isinstance(row, dict):
+            values = [row.get(key) for key in self._keys]
+        else:
+            values = [row[key] if key < len(row) else None for key in self._keys]
+        out = []
+        for slots in self._plan:
+            value = None
+            for slot in slots:
+                value = values[slot]
+                if value:
+                    break
+            out.append(value.strip() if value else "")
+        return tuple(out)
+
+    def report(self) -> List[str]:
+        """Problemas do cabecalho, uma linha por tipo (vazio se nada a reportar)."""
+        lines = []
+        if self.unknown:
+            lines.append("colunas ignoradas: " + ", ".join(self.unknown))
+        for field, present in self.ambiguous.items():
+            lines.append(
+                f"campo {field} ambiguo ({', '.join(present)}): usa o primeiro preenchido"
+            )
+        if self.duplicates:
+            lines.append("colunas repetidas: " + ", ".join(self.duplicates))
+        return lines
@@ -0,0 +1,48 @@
+"""
+Leitura dos CSVs exportados das planilhas.
+
+O arquivo e lido uma vez (bytes) e decodificado pela primeira codificacao da
+lista que servir, sem errors="replace": um export latin-1 nao vira texto
+utf-8 cheio de U+FFFD, cai no proximo encoding. O parse e o do modulo csv sobre
+o texto inteiro (newline="" — celulas entre aspas com quebra de linha ficam
+inteiras).
+
+  CSV_ENCODINGS   exports do Sheets/Excel: utf-8 (com ou sem BOM), latin-1
+  GG_ENCODINGS    planilhas GG_ de custos, exportadas em latin-1
+
+Compartilhado por migrate_sheets_data.py, import_equipe.py,
+import_job_finances.py, gen_equipe_sql.py e parse_custos_csv.py.
+"""
+
+import csv
+import io
+from typing import Dict, List, Sequence
+
+CSV_ENCODINGS = ("utf-8-sig", "latin-1")
+GG_ENCODINGS = ("latin-1", "utf-8-sig")
+
+
+def read_text(path: str, encodings: Sequence[str] = CSV_ENCODINGS) -> str:
+    """Conteudo do arquivo na primeira codificacao que decodifica sem erro."""
+    with open(path, "rb") as f:
+        data = f.read()
+    for encoding in encodings:
+        try:
+            return data.decode(encoding)
+        except UnicodeDecodeError:
+            continue
+    raise ValueError(
+        f"Nao foi possivel ler o arquivo com encodings {'/'.join(encodings)}: {path}"
+    )
+
+
+def read_csv(path: str, encodings: Sequence[str] = CSV_ENCODINGS) -> List[List[str]]:
+    """CSV como lista de linhas (listas de strings), sem tratar cabecalho."""
+    return list(csv.reader(io.StringIO(read_text(path, encodings), newline="")))
+
+
+def read_csv_dicts(
+    path: str, encodings: Sequence[str] = CSV_ENCODINGS
+) -> List[Dict[str, str]]:
+    """CSV com cabecalho como lista de dicts (csv.DictReader)."""
+    return list(csv.DictReader(io.StringIO(read_text(path, encodings), newline="")))
@@ -0,0 +1,120 @@
+"""
+Parse de datas das planilhas (formato brasileiro), uma celula ou uma coluna.
+
+Formatos reconhecidos, sempre convertidos para ISO (YYYY-MM-DD):
+  - DD/MM/AAAA, com caminho rapido por posicao para o formato de largura fixa
+    ("05/03/2026"); D/M/AAAA e DD/MM/AA (ano 20AA) pelo regex;
+  - AAAA-MM-DD (ja ISO);
+  - numero serial do Google Sheets/Excel (dias desde 1899-12-30), quando a
+    celula chega sem formatacao ("46086" ou "46086.75"), entre SERIAL_MIN e
+    SERIAL_MAX;
+  - DATE_PLACEHOLDER ("18991230") e qualquer data em 1899 — o que a formula da
+    planilha devolve para "sem data" — viram None, assim como datas
+    inexistentes (31/02).
+
+Colunas de data tem poucos valores distintos: cada texto e convertido uma vez
+(memo LRU por DateParser), e parse_date_column deduplica a coluna antes.
+
+Compartilhado por migrate_sheets_data.py, import_job_finances.py e parse_custos_csv.py.
+"""
+
+import re
+from datetime import date, timedelta
+from functools import lru_cache
+from typing import Iterable, List, Optional, Union
+
+# Placeholder de data sem definicao (formula sheets retorna 1899-12-30)
+DATE_PLACEHOLDER = "18991230"
+
+# Dia zero dos numeros seriais de data do Sheets/Excel
+SHEETS_EPOCH = date(1899, 12, 30)
+# Faixa de seriais aceitos (1927-05-18 a 2173-10-14): numeros menores numa
+# coluna de data sao quantidade/dia digitado, nao data
+SERIAL_MIN = 10_000
+SERIAL_MAX = 99_999
+
+# Textos distintos memorizados por DateParser.parse
+DATE_MEMO_SIZE = 8192
+
+_BR_DATE = re.compile(r"([0-9]{1,2})/([0-9]{1,2})/([0-9]{4}|[0-9]{2})")
+_ISO_DATE = re.compile(r"([0-9]{4})-([0-9]{2})-([0-9]{2})")
+_SERIAL = re.compile(r"([0-9]{5})(?:\.[0-9]+)?")
+
+
+def _to_date(year: int, month: int, day: int) -> Optional[date]:
+    if year == 1899:
+        return None
+    try:
+        return date(year, month, day)
+    except ValueError:
+        return None
+
+
+def _parse(value: str) -> Optional[date]:
+    v = value.strip()
+    if len(v) == 10 and v[2] == "/" and v[5] == "/":
+        day, month, year = v[:2], v[3:5], v[6:]
+        if (day + month + year).isdigit() and v.isascii():
+            return _to_date(int(year), int(month), int(day))
+    m = _BR_DATE.fullmatch(v)
+    if m:
+        day, month, year = m.groups()
+        if len(year) == 2:
+            year = "20" + year
+        return _to_date(int(year), int(month), int(day))
+    m = _ISO_DATE.fullmatch(v)
+    if m:
+        year, month, day = m.groups()
+        return _to_date(int(year), int(month), int(day))
+    m = _SERIAL.fullmatch(v)
+    if m:
+        serial = int(m.group(1))
+        if SERIAL_MIN <= serial <= SERIAL_MAX:
+            return SHEETS_EPOCH + timedelta(days=serial)
+    return None
+
+
+class DateParser:
+    """Parse memorizado de datas de planilha (ver docstring do modulo)."""
+
+    def __init__(self, memo_size: int = DATE_MEMO_SIZE) -> None:
+        self._parse = lru_cache(maxsize=memo_size)(_parse)
+
+    def parse(self, value: Optional[str]) -> Optional[str]:
+        """Data ISO (YYYY-MM-DD) ou None se vazia, placeholder ou invalida."""
+        parsed = self.parse_date(value)
+        return parsed.isoformat() if parsed else None
+
+    def parse_date(self, value: Optional[str]) -> Optional[date]:
+        """Como parse, mas devolve datetime.date."""
+        if not value:
+            return None
+        return self._parse(value)
+
+    def parse_column(
+        self, values: Iterable[Optional[str]], as_date: bool = False
+    ) -> List[Union[str, date, None]]:
+        """Converte a coluna inteira: cada valor distinto passa uma vez pelo parse."""
+        values = list(values)
+        convert = self.parse_date if as_date else self.parse
+        parsed = {value: convert(value) for value in set(values)}
+        return [parsed[value] for value in values]
+
+    def cache_info(self):
+        """Estatisticas do memo (functools.lru_cache)."""
+        return self._parse.cache_info()
+
+
+DATE_PARSER = DateParser()
+
+
+def parse_date_br(value: Optional[str]) -> Optional[str]:
+    """DD/MM/AAAA (e demais formatos do modulo) -> YYYY-MM-DD, ou None."""
+    return DATE_PARSER.parse(value)
+
+
+def parse_date_column(
+    values: Iterable[Optional[str]], as_date: bool = False
+) -> List[Union[str, date, None]]:
+    """Coluna inteira pelo DATE_PARSER padrao: ISO strings ou datetime.date."""
+    return DATE_PARSER.parse_column(values, as_date=as_date)
@@ -20,127 +20,39 @@ Variaveis de ambiente obrigatorias:
 """
 
 import argparse
-import json
 import os
-import re
 import sys
-import unicodedata
 from datetime import datetime, timezone
 from typing import Dict, List, Optional
 
-import requests
 import yaml
 
-# ---------------------------------------------------------------------------
-# Cores ANSI
-# ---------------------------------------------------------------------------
-
-GREEN = "\033[92m"
-YELLOW = "\033[93m"
-RED = "\033[91m"
-RESET = "\033[0m"
-CYAN = "\033[96m"
-BOLD = "\033[1m"
-
-
-# ---------------------------------------------------------------------------
-# Utilitarios de log
-# ---------------------------------------------------------------------------
-
-def log_ok(msg: str) -> None:
-    print(f"{GREEN}[OK   ] {msg}{RESET}")
-
-
-def log_skip(msg: str) -> None:
-    print(f"{YELLOW}[SKIP ] {msg}{RESET}")
-
-
-def log_error(msg: str) -> None:
-    print(f"{RED}[ERROR] {msg}{RESET}")
-
+from log import BOLD, GREEN, RED, RESET, YELLOW, log_error, log_info, log_ok, log_skip
+from rest_client import SupabaseRestClient
+from text import normalize_name
 
-def log_info(msg: str) -> None:
-    print(f"{CYAN}[INFO ] {msg}{RESET}")
+# Colunas lidas de vendors para o agrupamento e o relatorio
+VENDOR_COLUMNS = "id,full_name,normalized_name,email,cpf,cnpj,created_at,import_source"
 
 
 # ---------------------------------------------------------------------------
-# Normalizacao de nome (replica normalize_vendor_name() do PostgreSQL)
+# Merge via Edge Function
 # ---------------------------------------------------------------------------
 
-def normalize_name(name: str) -> str:
+def post_merge(client: SupabaseRestClient, vendor_id: str, alias_ids: List[str]) -> Dict:
     """
-    Normaliza nome igual ao PostgreSQL normalize_vendor_name():
-    lower + trim + remove acentos + remove caracteres especiais (exceto espaco e hifen).
+    Chama POST /vendors/:id/merge via Edge Function vendors.
+    O endpoint reatribui cost_items e bank_accounts dos aliases para o primario
+    e marca os aliases como deleted.
     """
-    nfkd = unicodedata.normalize("NFKD", name)
-    ascii_str = "".join(c for c in nfkd if not unicodedata.combining(c))
-    cleaned = re.sub(r"[^a-zA-Z0-9\s\-]", "", ascii_str)
-    return cleaned.lower().strip()
-
-
-# ---------------------------------------------------------------------------
-# Cliente Supabase REST API
-# ---------------------------------------------------------------------------
-
-class SupabaseClient:
-    """Cliente simples para a REST API do Supabase usando service_role key."""
-
-    def __init__(self, url: str, key: str):
-        self.base_url = url.rstrip("/")
-        self.headers = {
-            "apikey": key,
-            "Authorization": f"Bearer {key}",
-            "Content-Type": "application/json",
-            "Prefer": "return=representation",
-        }
-
-    def _url(self, table: str) -> str:
-        return f"{self.base_url}/rest/v1/{table}"
-
-    def select_all(self, table: str, filters: Optional[Dict] = None) -> List[Dict]:
-        """
-        GET paginado de todos os registros.
-        Supabase limita 1000 por request — usa Range header para paginar.
-        """
-        all_rows: List[Dict] = []
-        page_size = 1000
-        offset = 0
-
-        while True:
-            hdrs = dict(self.headers)
-            hdrs["Range"] = f"{offset}-{offset + page_size - 1}"
-            params = dict(filters or {})
-            resp = requests.get(self._url(table), headers=hdrs, params=params)
-            resp.raise_for_status()
-            page = resp.json()
-            if not page:
-                break
-            all_rows.extend(page)
-            if len(page) < page_size:
-                break
-            offset += page_size
-
-        return all_rows
-
-    def post_merge(self, vendor_id: str, alias_ids: List[str]) -> Dict:
-        """
-        Chama POST /vendors/:id/merge via Edge Function vendors.
-        O endpoint reatribui cost_items e bank_accounts dos aliases para o primario
-        e marca os aliases como deleted.
-        """
-        url = f"{self.base_url}/functions/v1/vendors"
-        payload = {
+    return client.invoke_function(
+        "vendors",
+        {
             "action": "merge",
             "primary_vendor_id": vendor_id,
             "alias_vendor_ids": alias_ids,
-        }
-        resp = requests.post(
-            url,
-            headers=self.headers,
-            data=json.dumps(payload),
-        )
-        resp.raise_for_status()
-        return resp.json()
+        },
+    )
 
 
 # ---------------------------------------------------------------------------
@@ -244,7 +156,7 @@ def build_report(clusters: List[List[Dict]]) -> Dict:
 # ---------------------------------------------------------------------------
 
 def apply_merges(
-    client: SupabaseClient,
+    client: SupabaseRestClient,
     report: Dict,
     dry_run: bool,
 ) -> Dict:
@@ -278,7 +190,7 @@ def apply_merges(
             continue
 
         try:
-            result = client.post_merge(primary_id, alias_ids)
+            result = post_merge(client, primary_id, alias_ids)
             log_ok(
                 f"Merge OK: '{cluster.get('primary_name')}' "
                 f"absorveu {len(alias_ids)} alias(es). Resposta: {result}"
@@ -310,7 +222,7 @@ def run(args: argparse.Namespace) -> None:
         log_error("--tenant-id e obrigatorio.")
         sys.exit(1)
 
-    client = SupabaseClient(supabase_url, service_key)
+    client = SupabaseRestClient(supabase_url, service_key)
 
     # Modo --apply: le relatorio existente e aplica merges
     if args.apply:
@@ -340,14 +252,12 @@ def run(args: argparse.Namespace) -> None:
     # Busca todos os vendors do tenant
     log_info(f"Buscando vendors do tenant {args.tenant_id}...")
     try:
-        vendors = client.select_all(
+        # Paginacao por keyset (id): sem o corte do max-rows do PostgREST
+        vendors = list(client.select_iter(
             "vendors",
-            {
-                "tenant_id": f"eq.{args.tenant_id}",
-                "deleted_at": "is.null",
-                "select": "id,full_name,normalized_name,email,cpf,cnpj,created_at,import_source",
-            },
-        )
+            {"tenant_id": f"eq.{args.tenant_id}", "deleted_at": "is.null"},
+            columns=VENDOR_COLUMNS,
+        ))
     except Exception as exc:
         log_error(f"Falha ao buscar vendors: {exc}")
         sys.exit(1)
@@ -0,0 +1,206 @@
+"""
+Classificacao do campo de documento / chave PIX das planilhas (CPF, CNPJ,
+e-mail, telefone, chave aleatoria).
+
+Regras, na ordem:
+  1. rotulos digitados junto com a chave saem ("Pix(cpf): ...", "CNPJ:",
+     "... (chave email)");
+  2. UUID -> chave aleatoria; e-mail valido -> email (ambos em minusculas,
+     a mesma chave em qualquer script);
+  3. pelos digitos: 11 com digito verificador de CPF valido -> cpf; 12/13
+     digitos com "+" ou 55 na frente e cara de telefone -> telefone; 14 com DV
+     de CNPJ valido -> cnpj, pj — ou 13 (zero inicial perdido pela planilha),
+     so se o texto tiver pontuacao de CNPJ (". / -");
+  4. 8 a 13 digitos com cara de telefone -> telefone (mantem o "+" inicial).
+     Um celular com DDD tem 11 digitos, como o CPF: o DV desempata;
+  5. 11/14 digitos com DV invalido e sem cara de telefone continuam chave
+     cpf/cnpj (e o que a planilha diz), mas nao preenchem cpf/cnpj do vendor
+     (invalid_document=True) — nao viram identidade de deduplicacao;
+  6. qualquer outro texto fica como pix_key sem tipo (pix_key_type None).
+
+Tipos iguais ao CHECK de bank_accounts.pix_key_type: cpf, cnpj, email,
+telefone, aleatoria. Cada texto distinto e classificado uma vez (memo LRU);
+DocumentClassifier.counts conta os resultados por tipo.
+
+Compartilhado por migrate_sheets_data.py, import_equipe.py, gen_equipe_sql.py
+e parse_custos_csv.py.
+"""
+
+import re
+from collections import Counter
+from functools import lru_cache
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+PIX_KEY_TYPES = ("cpf", "cnpj", "email", "telefone", "aleatoria")
+
+# Textos distintos memorizados por DocumentClassifier
+DOCUMENT_MEMO_SIZE = 65536
+
+_UUID = re.compile(r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}", re.IGNORECASE)
+_EMAIL = re.compile(r"[^@\s]+@[^@\s]+\.[^@\s]+")
+_NON_DIGITS = re.compile(r"[^0-9]")
+_CNPJ_PUNCTUATION = re.compile(r"[./-]")
+_LABEL_PREFIX = re.compile(
+    r"^(pix\s*[\(\-:]*\s*)?(cpf|cnpj|celular|telefone|chave\s+email)[\s:\-]*",
+    re.IGNORECASE,
+)
+_LABEL_SUFFIX = re.compile(
+    r"\s*([\(\[]\s*)?(cpf|cnpj|celular|telefone|chave\s+email)(\s*[\)\]])?$",
+    re.IGNORECASE,
+)
+
+_CNPJ_WEIGHTS_1 = (5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2)
+_CNPJ_WEIGHTS_2 = (6, 5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2)
+
+
+class Document(NamedTuple):
+    entity_type: str                 # 'pf' | 'pj'
+    cpf: Optional[str]
+    cnpj: Optional[str]
+    pix_key: Optional[str]
+    pix_key_type: Optional[str]      # PIX_KEY_TYPES ou None
+    invalid_document: bool = False   # 11/14 digitos com DV invalido
+
+    def as_dict(self) -> Dict[str, Optional[str]]:
+        """Formato dos detect_document* antigos: entity_type, cpf, cnpj, pix_key, pix_key_type."""
+        return {
+            "entity_type": self.entity_type,
+            "cpf": self.cpf,
+            "cnpj": self.cnpj,
+            "pix_key": self.pix_key,
+            "pix_key_type": self.pix_key_type,
+        }
+
+
+EMPTY_DOCUMENT = Document("pf", None, None, None, None)
+
+
+def _check_digit(digits: str, weights: Iterable[int]) -> int:
+    rest = sum(int(d) * w for d, w in zip(digits, weights)) % 11
+    return 0 if rest < 2 else 11 - rest
+
+
+def valid_cpf(digits: str) -> bool:
+    """DV do CPF (11 digitos; sequencias repetidas sao invalidas)."""
+    if len(digits) != 11 or digits == digits[0] * 11:
+        return False
+    return (
+        _check_digit(digits[:9], range(10, 1, -1)) == int(digits[9])
+        and _check_digit(digits[:10], range(11, 1, -1)) == int(digits[10])
+    )
+
+
+def valid_cnpj(digits: str) -> bool:
+    """DV do CNPJ (14 digitos; sequencias repetidas sao invalidas)."""
+    if len(digits) != 14 or digits == digits[0] * 14:
+        return False
+    return (
+        _check_digit(digits[:12], _CNPJ_WEIGHTS_1) == int(digits[12])
+        and _check_digit(digits[:13], _CNPJ_WEIGHTS_2) == int(digits[13])
+    )
+
+
+def _looks_like_phone(digits: str) -> bool:
+    """Fixo/celular nacional (DDD sem zero), opcionalmente com o 55 na frente."""
+    if len(digits) in (12, 13) and digits.startswith("55"):
+        digits = digits[2:]
+    if len(digits) == 11:
+        return "0" not in digits[:2] and digits[2] == "9"
+    if len(digits) == 10:
+        return "0" not in digits[:2] and digits[2] in "2345"
+    return 8 <= len(digits) <= 9
+
+
+def _classify(raw: str) -> Document:
+    raw = raw.strip()
+    if not raw:
+        return EMPTY_DOCUMENT
+    key = _LABEL_SUFFIX.sub("", _LABEL_PREFIX.sub("", raw)).strip() or raw
+
+    if _UUID.fullmatch(key):
+        return Document("pf", None, None, key.lower(), "aleatoria")
+    if _EMAIL.fullmatch(key):
+        return Document("pf", None, None, key.lower(), "email")
+
+    digits = _NON_DIGITS.sub("", key)
+    phone = ("+" + digits) if key.startswith("+") else digits
+    if len(digits) == 11 and valid_cpf(digits):
+        return Document("pf", digits, None, digits, "cpf")
+    if (
+        len(digits) in (12, 13)
+        and (key.startswith("+") or digits.startswith("55"))
+        and _looks_like_phone(digits)
+    ):
+        # Celular com DDI antes do CNPJ: "+5511900000036" passa no DV de CNPJ
+        return Document("pf", None, None, phone, "telefone")
+    if (len(digits) == 14 or (len(digits) == 13 and _CNPJ_PUNCTUATION.search(key))) \
+            and valid_cnpj(digits.zfill(14)):
+        cnpj = digits.zfill(14)
+        return Document("pj", None, cnpj, cnpj, "cnpj")
+    if 8 <= len(digits) <= 13 and _looks_like_phone(digits):
+        return Document("pf", None, None, phone, "telefone")
+    if len(digits) == 11:
+        return Document("pf", None, None, digits, "cpf", invalid_document=True)
+    if len(digits) == 14:
+        return Document("pj", None, None, digits, "cnpj", invalid_document=True)
+    if 8 <= len(digits) <= 13:
+        return Document("pf", None, None, phone, "telefone")
+    return Document("pf", None, None, raw, None)
+
+
+def _kind(doc: Document) -> str:
+    """Chave do contador: tipo, tipo_invalido, desconhecido ou vazio."""
+    if doc.pix_key_type is None:
+        return "desconhecido" if doc.pix_key else "vazio"
+    if doc.invalid_document:
+        return f"{doc.pix_key_type}_invalido"
+    return doc.pix_key_type
+
+
+def _classify_counted(raw: str) -> Tuple[Document, str]:
+    doc = _classify(raw)
+    return doc, _kind(doc)
+
+
+_EMPTY_COUNTED = (EMPTY_DOCUMENT, "vazio")
+
+
+class DocumentClassifier:
+    """Classificador memorizado com contadores por tipo (ver docstring do modulo)."""
+
+    def __init__(self, memo_size: int = DOCUMENT_MEMO_SIZE) -> None:
+        self._classify = lru_cache(maxsize=memo_size)(_classify_counted)
+        self.counts: Counter = Counter()
+
+    def classify(self, raw: Optional[str]) -> Document:
+        """Classifica um valor e soma no contador do tipo."""
+        doc, kind = self._classify(raw) if raw else _EMPTY_COUNTED
+        self.counts[kind] += 1
+        return doc
+
+    def classify_many(self, values: Iterable[Optional[str]]) -> List[Document]:
+        """Classifica a coluna inteira: cada valor distinto passa uma vez pelas regras."""
+        values = list(values)
+        docs: Dict[Optional[str], Document] = {}
+        for value, n in Counter(values).items():
+            doc, kind = self._classify(value) if value else _EMPTY_COUNTED
+            docs[value] = doc
+            self.counts[kind] += n
+        return [docs[v] for v in values]
+
+    def cache_info(self):
+        """Estatisticas do memo (functools.lru_cache)."""
+        return self._classify.cache_info()
+
+
+DOCUMENT_CLASSIFIER = DocumentClassifier()
+
+
+def classify_document(raw: Optional[str]) -> Document:
+    """Classifica pelo DOCUMENT_CLASSIFIER padrao."""
+    return DOCUMENT_CLASSIFIER.classify(raw)
+
+
+def classify_many(values: Iterable[Optional[str]]) -> List[Document]:
+    """Coluna inteira pelo DOCUMENT_CLASSIFIER padrao."""
+    return DOCUMENT_CLASSIFIER.classify_many(values)
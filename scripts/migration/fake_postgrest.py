@@ -0,0 +1,949 @@
+"""
+Servidor PostgREST falso, em processo, para benchmarks e testes offline dos importadores.
+
+Cobre as tabelas usadas pelos scripts de migracao (vendors, bank_accounts, clients,
+agencies, jobs, cost_items) com as constraints UNIQUE e CHECK relevantes do schema,
+os filtros eq/neq/is/in/gt/gte/lt/lte/like/ilike (e not., or/and), paginacao por
+Range/limit/offset, selects com recursos embutidos (vendors -> bank_accounts),
+upserts com on_conflict (merge-duplicates/ignore-duplicates),
+Prefer return=minimal/representation e missing=default, e o endpoint de merge da
+Edge Function vendors. Latencia, jitter e injecao de erros sao configuraveis.
+
+Uso standalone:
+    python scripts/migration/fake_postgrest.py --port 54321 --latency 0.12 --jitter 0.03
+
+    SUPABASE_URL=http://127.0.0.1:54321 SUPABASE_SERVICE_ROLE_KEY=fake TENANT_ID=<uuid> \\
+        python scripts/migrate_sheets_data.py --csv-dir scripts/data
+
+Uso em processo (benchmarks):
+    with FakePostgrest(latency=0.1) as server:
+        os.environ["SUPABASE_URL"] = server.url
+        ...
+        print(server.stats)
+"""
+
+import argparse
+import gzip
+import json
+import random
+import re
+import threading
+import time
+import unicodedata
+import uuid
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+# ---------------------------------------------------------------------------
+# Schema simulado
+# ---------------------------------------------------------------------------
+
+TABLES = ("vendors", "bank_accounts", "clients", "agencies", "jobs", "cost_items")
+
+Row = Dict[str, Any]
+
+# (nome, colunas, predicado do indice parcial ou None). So indices totais podem
+# ser alvo de on_conflict, como no PostgreSQL.
+UNIQUE_CONSTRAINTS: Dict[str, List[Tuple[str, Tuple[str, ...], Optional[Callable[[Row], bool]]]]] = {
+    "vendors": [
+        ("uq_vendors_import_fingerprint", ("tenant_id", "import_fingerprint"), None),
+    ],
+    "jobs": [
+        ("jobs_tenant_id_code_key", ("tenant_id", "code"), None),
+        ("uq_jobs_import_fingerprint", ("tenant_id", "import_fingerprint"), None),
+    ],
+    "bank_accounts": [
+        ("uq_bank_accounts_primary", ("vendor_id",),
+         lambda r: r.get("is_primary") is True and r.get("deleted_at") is None),
+        ("uq_bank_accounts_import_fingerprint", ("tenant_id", "import_fingerprint"), None),
+    ],
+    "cost_items": [
+        ("uq_cost_items_import_fingerprint", ("tenant_id", "import_fingerprint"), None),
+    ],
+    "clients": [
+        ("idx_clients_cnpj_tenant_unique", ("tenant_id", "cnpj"),
+         lambda r: r.get("cnpj") is not None and r.get("deleted_at") is None),
+    ],
+    "agencies": [
+        ("idx_agencies_cnpj_tenant_unique", ("tenant_id", "cnpj"),
+         lambda r: r.get("cnpj") is not None and r.get("deleted_at") is None),
+    ],
+}
+
+PAYMENT_CONDITIONS = {"a_vista", "cnf_30", "cnf_40", "cnf_45", "cnf_60", "cnf_90", "snf_30"}
+
+CHECK_CONSTRAINTS: Dict[str, List[Tuple[str, Callable[[Row], bool]]]] = {
+    "vendors": [
+        ("chk_vendors_entity_type", lambda r: r.get("entity_type") in ("pf", "pj")),
+        ("chk_vendors_cpf_format",
+         lambda r: r.get("cpf") is None or re.fullmatch(r"\d{11}", str(r["cpf"])) is not None),
+        ("chk_vendors_cnpj_format",
+         lambda r: r.get("cnpj") is None or re.fullmatch(r"\d{14}", str(r["cnpj"])) is not None),
+    ],
+    "bank_accounts": [
+        ("chk_bank_accounts_pix_key_type",
+         lambda r: r.get("pix_key_type") in (None, "cpf", "cnpj", "email", "telefone", "aleatoria")),
+        ("chk_bank_accounts_account_type",
+         lambda r: r.get("account_type") in (None, "corrente", "poupanca")),
+    ],
+    "cost_items": [
+        ("chk_cost_items_item_number",
+         lambda r: r.get("item_number") is not None and 1 <= int(r["item_number"]) <= 99),
+        ("chk_cost_items_payment_condition",
+         lambda r: r.get("payment_condition") is None or r["payment_condition"] in PAYMENT_CONDITIONS),
+        ("chk_cost_items_payment_status",
+         lambda r: r.get("payment_status") in ("pendente", "pago", "cancelado")),
+        ("chk_cost_items_period_month_for_fixed",
+         lambda r: r.get("job_id") is not None or r.get("period_month") is not None),
+        ("chk_cost_items_quantity_positive",
+         lambda r: r.get("quantity") is None or float(r["quantity"]) >= 0),
+    ],
+}
+
+# Valores padrao das colunas com DEFAULT no schema (aplicados em missing=default)
+COLUMN_DEFAULTS: Dict[str, Row] = {
+    "vendors":       {"entity_type": "pf", "is_active": True},
+    "bank_accounts": {"is_primary": False, "is_active": True},
+    "clients":       {"is_active": True},
+    "agencies":      {"is_active": True},
+    "jobs":          {"custom_fields": {}, "status": "briefing_recebido"},
+    "cost_items":    {
+        "sub_item_number": 0, "sort_order": 0, "quantity": 1,
+        "item_status": "orcado", "nf_request_status": "pendente",
+        "payment_status": "pendente",
+    },
+}
+
+# Colunas GENERATED: nao podem ser gravadas pelo cliente
+GENERATED_COLUMNS: Dict[str, Set[str]] = {
+    "vendors":    {"normalized_name"},
+    "cost_items": {"is_category_header"},
+}
+
+# Recursos embutidos um-para-muitos aceitos no select: (tabela, embutida) -> FK
+EMBEDDED_RELATIONS: Dict[Tuple[str, str], str] = {
+    ("vendors", "bank_accounts"): "vendor_id",
+    ("jobs", "cost_items"):       "job_id",
+}
+
+# Parametros de query que nao sao filtros
+RESERVED_PARAMS = {"select", "order", "limit", "offset", "on_conflict", "columns"}
+
+
+def _now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="microseconds")
+
+
+def normalize_vendor_name(name: Optional[str]) -> Optional[str]:
+    """
+    Replica normalize_vendor_name() do PostgreSQL (coluna GENERATED de vendors):
+    lower(trim(unaccent(regexp_replace(name, '[^a-zA-Z0-9\\s\\-]', '', 'g')))).
+    O regexp roda antes do unaccent, entao letras acentuadas sao descartadas.
+    """
+    if name is None:
+        return None
+    cleaned = re.sub(r"[^a-zA-Z0-9\s\-]", "", name)
+    nfkd = unicodedata.normalize("NFKD", cleaned)
+    ascii_str = "".join(c for c in nfkd if not unicodedata.combining(c))
+    return ascii_str.strip().lower()
+
+
+class PostgrestError(Exception):
+    """Erro com status HTTP e corpo no formato do PostgREST."""
+
+    def __init__(self, status: int, code: str, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+        self.body = {"code": code, "message": message, "details": None, "hint": None}
+
+
+# ---------------------------------------------------------------------------
+# Armazenamento em memoria
+# ---------------------------------------------------------------------------
+
+def _as_text(value: Any) -> Optional[str]:
+    """Representacao textual usada nos filtros e nas chaves de indice."""
+    if value is None:
+        return None
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, sort_keys=True)
+    return str(value)
+
+
+class UniqueIndex:
+    """Indice hash de uma constraint UNIQUE (NULLs nunca conflitam)."""
+
+    def __init__(
+        self, name: str, columns: Tuple[str, ...], predicate: Optional[Callable[[Row], bool]]
+    ) -> None:
+        self.name = name
+        self.columns = columns
+        self.predicate = predicate
+        self.entries: Dict[Tuple[str, ...], str] = {}  # chave -> id
+
+    def key(self, row: Row) -> Optional[Tuple[str, ...]]:
+        if self.predicate is not None and not self.predicate(row):
+            return None
+        values = tuple(_as_text(row.get(c)) for c in self.columns)
+        if any(v is None for v in values):
+            return None
+        return values  # type: ignore[return-value]
+
+
+class FakeTable:
+    """Linhas por id (ordem de insercao), indices UNIQUE e indices de igualdade."""
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.rows: Dict[str, Row] = {}
+        self.unique = [UniqueIndex(*spec) for spec in UNIQUE_CONSTRAINTS.get(name, [])]
+        self.checks = CHECK_CONSTRAINTS.get(name, [])
+        # coluna -> valor textual -> ids; criado sob demanda no primeiro filtro eq
+        self.eq_index: Dict[str, Dict[Optional[str], Set[str]]] = {}
+
+    # -- indices ------------------------------------------------------------
+
+    def _index(self, row: Row) -> None:
+        for idx in self.unique:
+            key = idx.key(row)
+            if key is not None:
+                idx.entries[key] = row["id"]
+        for col, values in self.eq_index.items():
+            values.setdefault(_as_text(row.get(col)), set()).add(row["id"])
+
+    def _unindex(self, row: Row) -> None:
+        for idx in self.unique:
+            key = idx.key(row)
+            if key is not None and idx.entries.get(key) == row["id"]:
+                del idx.entries[key]
+        for col, values in self.eq_index.items():
+            ids = values.get(_as_text(row.get(col)))
+            if ids is not None:
+                ids.discard(row["id"])
+
+    def conflict(self, row: Row) -> Tuple[Optional[Row], Optional[UniqueIndex]]:
+        """Linha existente (outra que nao `row`) que violaria algum UNIQUE."""
+        for idx in self.unique:
+            key = idx.key(row)
+            if key is None:
+                continue
+            other = idx.entries.get(key)
+            if other is not None and other != row.get("id"):
+                return self.rows[other], idx
+        return None, None
+
+    def check(self, row: Row) -> None:
+        for name, predicate in self.checks:
+            try:
+                ok = predicate(row)
+            except (TypeError, ValueError):
+                ok = False
+            if not ok:
+                raise PostgrestError(
+                    400, "23514",
+                    f'new row for relation "{self.name}" violates check constraint "{name}"',
+                )
+
+    def unique_index_for(self, columns: Tuple[str, ...]) -> UniqueIndex:
+        for idx in self.unique:
+            if idx.predicate is None and set(idx.columns) == set(columns):
+                return idx
+        raise PostgrestError(
+            400, "42P10",
+            "there is no unique or exclusion constraint matching the ON CONFLICT specification",
+        )
+
+    # -- operacoes ----------------------------------------------------------
+
+    def add(self, row: Row) -> None:
+        self.rows[row["id"]] = row
+        self._index(row)
+
+    def replace(self, row: Row, changes: Row) -> None:
+        self._unindex(row)
+        row.update(changes)
+        self._index(row)
+
+    def remove(self, row: Row) -> None:
+        self._unindex(row)
+        del self.rows[row["id"]]
+
+    def candidates(self, filters: List[Tuple[str, str]]) -> Iterable[Row]:
+        """Linhas a testar: usa o indice de igualdade mais seletivo entre os filtros eq."""
+        best: Optional[Set[str]] = None
+        for col, expr in filters:
+            if not expr.startswith("eq."):
+                continue
+            values = self.eq_index.get(col)
+            if values is None:
+                values = {}
+                for row in self.rows.values():
+                    values.setdefault(_as_text(row.get(col)), set()).add(row["id"])
+                self.eq_index[col] = values
+            ids = values.get(expr[3:], set())
+            if best is None or len(ids) < len(best):
+                best = ids
+        if best is None:
+            return list(self.rows.values())
+        return sorted((self.rows[i] for i in best), key=lambda r: r["_seq"])
+
+
+class FakeDatabase:
+    """Tabelas em memoria com semantica minima de PostgREST."""
+
+    def __init__(self) -> None:
+        self.tables: Dict[str, FakeTable] = {t: FakeTable(t) for t in TABLES}
+        self.lock = threading.RLock()
+        self._seq = 0
+
+    def _table(self, name: str) -> FakeTable:
+        if name not in self.tables:
+            raise PostgrestError(404, "42P01", f'relation "public.{name}" does not exist')
+        return self.tables[name]
+
+    @staticmethod
+    def _generated(table: str, row: Row) -> None:
+        if table == "vendors":
+            row["normalized_name"] = normalize_vendor_name(row.get("full_name"))
+        elif table == "cost_items":
+            row["is_category_header"] = row.get("sub_item_number") == 0
+
+    def _new_row(self, table: str, payload: Row, use_defaults: bool) -> Row:
+        for col in GENERATED_COLUMNS.get(table, ()):
+            if col in payload:
+                raise PostgrestError(
+                    400, "428C9", f'column "{col}" can only be updated to DEFAULT'
+                )
+        now = _now_iso()
+        self._seq += 1
+        row: Row = {
+            "id": str(uuid.uuid4()), "created_at": now, "updated_at": now,
+            "deleted_at": None, "_seq": self._seq,
+        }
+        if use_defaults:
+            row.update(json.loads(json.dumps(COLUMN_DEFAULTS.get(table, {}))))
+        row.update(payload)
+        self._generated(table, row)
+        return row
+
+    @staticmethod
+    def _public(row: Row) -> Row:
+        return {k: v for k, v in row.items() if k != "_seq"}
+
+    # -- operacoes ------------------------------------------------------------
+
+    def select(self, table: str, filters: List[Tuple[str, str]]) -> List[Row]:
+        with self.lock:
+            t = self._table(table)
+            return [self._public(r) for r in t.candidates(filters) if _match_all(r, filters)]
+
+    def insert(
+        self,
+        table: str,
+        payloads: List[Row],
+        on_conflict: Optional[Tuple[str, ...]],
+        resolution: Optional[str],
+        use_defaults: bool,
+    ) -> List[Row]:
+        """
+        Insere (ou faz upsert) de forma atomica: qualquer erro desfaz o lote.
+        Retorna as linhas afetadas, na ordem do payload.
+        """
+        with self.lock:
+            t = self._table(table)
+            target = t.unique_index_for(on_conflict) if on_conflict else None
+            if resolution and target is None:
+                # PostgREST sem on_conflict usa a PK; ids nunca vem nos payloads
+                resolution = None
+            done: List[Tuple[str, Row, Optional[Row]]] = []  # (acao, linha, estado anterior)
+            result: List[Row] = []
+            touched: Set[str] = set()
+            try:
+                for payload in payloads:
+                    candidate = self._new_row(table, payload, use_defaults)
+                    t.check(candidate)
+                    existing, idx = t.conflict(candidate)
+                    if existing is None:
+                        t.add(candidate)
+                        done.append(("add", candidate, None))
+                        result.append(candidate)
+                        continue
+                    if resolution is None or idx is not target:
+                        raise PostgrestError(
+                            409, "23505",
+                            f'duplicate key value violates unique constraint "{idx.name}"',
+                        )
+                    if resolution == "ignore-duplicates":
+                        continue
+                    if existing["id"] in touched:
+                        raise PostgrestError(
+                            500, "21000",
+                            "ON CONFLICT DO UPDATE command cannot affect row a second time",
+                        )
+                    touched.add(existing["id"])
+                    merged = {k: v for k, v in payload.items() if k != "id"}
+                    merged["updated_at"] = _now_iso()
+                    after = {**existing, **merged}
+                    self._generated(table, after)
+                    t.check(after)
+                    other, other_idx = t.conflict(after)
+                    if other is not None:
+                        raise PostgrestError(
+                            409, "23505",
+                            f'duplicate key value violates unique constraint "{other_idx.name}"',
+                        )
+                    done.append(("update", existing, dict(existing)))
+                    t.replace(existing, after)
+                    result.append(existing)
+            except PostgrestError:
+                for action, row, before in reversed(done):
+                    if action == "add":
+                        t.remove(row)
+                    else:
+                        t.replace(row, before)
+                raise
+            return [self._public(r) for r in result]
+
+    def update(self, table: str, filters: List[Tuple[str, str]], data: Row) -> List[Row]:
+        with self.lock:
+            t = self._table(table)
+            out = []
+            now = _now_iso()
+            for row in [r for r in t.candidates(filters) if _match_all(r, filters)]:
+                after = {**row, **data, "updated_at": now}
+                self._generated(table, after)
+                t.check(after)
+                other, idx = t.conflict(after)
+                if other is not None:
+                    raise PostgrestError(
+                        409, "23505", f'duplicate key value violates unique constraint "{idx.name}"'
+                    )
+                t.replace(row, after)
+                out.append(self._public(row))
+            return out
+
+    def delete(self, table: str, filters: List[Tuple[str, str]]) -> List[Row]:
+        with self.lock:
+            t = self._table(table)
+            gone = [r for r in t.candidates(filters) if _match_all(r, filters)]
+            for row in gone:
+                t.remove(row)
+            return [self._public(r) for r in gone]
+
+    def merge_vendors(self, primary_id: str, alias_ids: List[str]) -> Row:
+        """Replica POST /functions/v1/vendors {action: merge}."""
+        with self.lock:
+            moved = {"cost_items": 0, "bank_accounts": 0}
+            for table in ("cost_items", "bank_accounts"):
+                t = self.tables[table]
+                for row in list(t.rows.values()):
+                    if row.get("vendor_id") in alias_ids:
+                        changes: Row = {"vendor_id": primary_id}
+                        if table == "bank_accounts":
+                            changes["is_primary"] = False
+                        t.replace(row, changes)
+                        moved[table] += 1
+            now = _now_iso()
+            vendors = self.tables["vendors"]
+            for alias_id in alias_ids:
+                row = vendors.rows.get(alias_id)
+                if row is not None:
+                    vendors.replace(row, {"deleted_at": now, "updated_at": now})
+            return {"primary_vendor_id": primary_id, "merged": len(alias_ids), "moved": moved}
+
+    def dump(self) -> Dict[str, List[Row]]:
+        with self.lock:
+            return {
+                name: [self._public(r) for r in t.rows.values()]
+                for name, t in self.tables.items()
+            }
+
+
+# ---------------------------------------------------------------------------
+# Filtros PostgREST
+# ---------------------------------------------------------------------------
+
+def _split_in(raw: str) -> List[str]:
+    inner = raw[1:-1] if raw.startswith("(") and raw.endswith(")") else raw
+    items, buf, quoted = [], "", False
+    for ch in inner:
+        if ch == '"':
+            quoted = not quoted
+        elif ch == "," and not quoted:
+            items.append(buf)
+            buf = ""
+        else:
+            buf += ch
+    items.append(buf)
+    return items
+
+
+def _compare(left: Optional[str], right: str) -> Optional[int]:
+    if left is None:
+        return None
+    try:
+        a, b = float(left), float(right)
+    except ValueError:
+        a, b = left, right  # type: ignore[assignment]
+    return (a > b) - (a < b)
+
+
+def _match(row: Row, column: str, expr: str) -> bool:
+    op, _, raw = expr.partition(".")
+    negate = False
+    if op == "not":
+        negate = True
+        op, _, raw = raw.partition(".")
+    value = _as_text(row.get(column))
+    if op == "eq":
+        ok = value is not None and value == raw
+    elif op == "neq":
+        ok = value is not None and value != raw
+    elif op == "is":
+        target = {"null": None, "true": "true", "false": "false"}.get(raw.lower(), raw)
+        ok = value == target
+    elif op == "in":
+        ok = value is not None and value in _split_in(raw)
+    elif op in ("gt", "gte", "lt", "lte"):
+        cmp = _compare(value, raw)
+        ok = cmp is not None and {
+            "gt": cmp > 0, "gte": cmp >= 0, "lt": cmp < 0, "lte": cmp <= 0,
+        }[op]
+    elif op in ("like", "ilike"):
+        pattern = "^" + re.escape(raw).replace(r"\*", ".*").replace("%", ".*") + "$"
+        flags = re.IGNORECASE if op == "ilike" else 0
+        ok = value is not None and re.match(pattern, value, flags) is not None
+    else:
+        raise PostgrestError(400, "PGRST100", f"operador nao suportado: {op}")
+    return not ok if negate else ok
+
+
+def _split_logic(inner: str) -> List[str]:
+    """Separa `a.eq.1,and(b.gt.2,c.lt.3)` nas virgulas de primeiro nivel."""
+    parts, buf, depth, quoted = [], "", 0, False
+    for ch in inner:
+        if ch == '"':
+            quoted = not quoted
+        elif not quoted and ch in "()":
+            depth += 1 if ch == "(" else -1
+        elif not quoted and ch == "," and depth == 0:
+            parts.append(buf)
+            buf = ""
+            continue
+        buf += ch
+    parts.append(buf)
+    return [p.strip() for p in parts if p.strip()]
+
+
+def _match_logic(row: Row, op: str, expr: str) -> bool:
+    """Avalia or=(...) / and=(...) do PostgREST, com aninhamento e valores entre aspas."""
+    if not (expr.startswith("(") and expr.endswith(")")):
+        raise PostgrestError(400, "PGRST100", f"arvore logica invalida: {expr}")
+    results = []
+    for term in _split_logic(expr[1:-1]):
+        head, _, rest = term.partition("(")
+        if head in ("and", "or") and term.endswith(")"):
+            results.append(_match_logic(row, head, "(" + rest))
+            continue
+        column, _, cond = term.partition(".")
+        operator, _, value = cond.partition(".")
+        if operator == "not":
+            inner_op, _, value = value.partition(".")
+            operator = f"not.{inner_op}"
+        if len(value) >= 2 and value.startswith('"') and value.endswith('"'):
+            value = value[1:-1]
+        results.append(_match(row, column, f"{operator}.{value}"))
+    return any(results) if op == "or" else all(results)
+
+
+def _match_all(row: Row, filters: List[Tuple[str, str]]) -> bool:
+    for col, expr in filters:
+        if col in ("or", "and"):
+            if not _match_logic(row, col, expr):
+                return False
+        elif not _match(row, col, expr):
+            return False
+    return True
+
+
+def _split_select(select: str) -> List[str]:
+    """Separa o select por virgulas de primeiro nivel (respeita `tabela(colunas)`)."""
+    parts, buf, depth = [], "", 0
+    for ch in select:
+        if ch == "," and depth == 0:
+            parts.append(buf.strip())
+            buf = ""
+            continue
+        depth += {"(": 1, ")": -1}.get(ch, 0)
+        buf += ch
+    parts.append(buf.strip())
+    return [p for p in parts if p]
+
+
+def _project(row: Row, select: str, db: Optional["FakeDatabase"] = None, table: str = "") -> Row:
+    if not select or select == "*":
+        return row
+    out: Row = {}
+    for col in _split_select(select):
+        if col.endswith(")") and "(" in col and db is not None:
+            child, _, inner = col[:-1].partition("(")
+            fk = EMBEDDED_RELATIONS.get((table, child))
+            if fk is None:
+                raise PostgrestError(
+                    400, "PGRST200",
+                    f"Could not find a relationship between '{table}' and '{child}'",
+                )
+            children = db.select(child, [(fk, f"eq.{row['id']}")])
+            out[child] = [_project(c, inner) for c in children]
+        else:
+            out[col] = row.get(col)
+    return out
+
+
+def _sort_key(value: Any) -> Tuple[int, Any]:
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return (0, value)
+    return (1, str(value))
+
+
+def _order(rows: List[Row], order: str) -> List[Row]:
+    for part in reversed([p for p in order.split(",") if p]):
+        col, _, direction = part.partition(".")
+        desc = direction.startswith("desc")
+        present = [r for r in rows if r.get(col) is not None]
+        missing = [r for r in rows if r.get(col) is None]
+        present.sort(key=lambda r: _sort_key(r.get(col)), reverse=desc)
+        rows = present + missing  # NULLS LAST (padrao do PostgreSQL em ASC)
+    return rows
+
+
+def _parse_prefer(header: str) -> Dict[str, str]:
+    prefs: Dict[str, str] = {}
+    for part in (header or "").split(","):
+        key, _, value = part.strip().partition("=")
+        if key:
+            prefs[key] = value
+    return prefs
+
+
+# ---------------------------------------------------------------------------
+# Servidor HTTP
+# ---------------------------------------------------------------------------
+
+class FakePostgrest:
+    """
+    Servidor PostgREST falso em thread propria.
+
+    latency/jitter em segundos; error_rate em [0, 1] injeta respostas com status
+    sorteado de error_statuses (com Retry-After, em segundos inteiros, se
+    retry_after for informado). max_rows simula o db-max-rows do PostgREST
+    (corte silencioso de SELECTs). `stats` conta requisicoes, erros injetados,
+    bytes no fio e conexoes TCP aceitas.
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        error_statuses: Tuple[int, ...] = (503,),
+        retry_after: Optional[int] = None,
+        max_rows: int = 1000,
+        seed: Optional[int] = None,
+        compress_responses: bool = True,
+    ) -> None:
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_statuses = error_statuses
+        self.retry_after = retry_after
+        self.max_rows = max_rows
+        self.compress_responses = compress_responses
+        self.db = FakeDatabase()
+        self._rng = random.Random(seed)
+        self._rng_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self.stats: Dict[str, int] = {
+            "requests": 0, "errors_injected": 0, "bytes_in": 0, "bytes_out": 0,
+            "connections": 0,
+        }
+        self._httpd: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    # -- ciclo de vida --------------------------------------------------------
+
+    def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """Sobe o servidor numa thread daemon e retorna a URL base."""
+        self._httpd = ThreadingHTTPServer((host, port), _make_handler(self))
+        self._httpd.daemon_threads = True
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self.url
+
+    @property
+    def url(self) -> str:
+        if self._httpd is None:
+            raise RuntimeError("servidor nao iniciado")
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def stop(self) -> None:
+        if self._httpd is not None:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+
+    def __enter__(self) -> "FakePostgrest":
+        self.start()
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.stop()
+
+    # -- comportamento --------------------------------------------------------
+
+    def _bump(self, key: str, amount: int = 1) -> None:
+        with self._stats_lock:
+            self.stats[key] += amount
+
+    def _delay(self) -> None:
+        if self.latency <= 0 and self.jitter <= 0:
+            return
+        with self._rng_lock:
+            delta = self._rng.uniform(-self.jitter, self.jitter) if self.jitter else 0.0
+        time.sleep(max(0.0, self.latency + delta))
+
+    def _inject_error(self) -> Optional[int]:
+        if self.error_rate <= 0:
+            return None
+        with self._rng_lock:
+            if self._rng.random() >= self.error_rate:
+                return None
+            return self._rng.choice(self.error_statuses)
+
+    def seed_rows(self, table: str, rows: List[Row]) -> List[Row]:
+        """Popula uma tabela diretamente (sem HTTP). Util para montar cenarios."""
+        return self.db.insert(table, rows, None, None, use_defaults=True)
+
+
+def _make_handler(server: FakePostgrest):
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        # Cabecalho + corpo num unico write (evita Nagle/delayed-ACK no keep-alive)
+        wbufsize = -1
+        disable_nagle_algorithm = True
+
+        def log_message(self, format: str, *args: Any) -> None:  # silencioso
+            pass
+
+        def setup(self) -> None:
+            super().setup()
+            server._bump("connections")
+
+        # -- utilitarios ------------------------------------------------------
+
+        def _read_body(self) -> Any:
+            length = int(self.headers.get("Content-Length") or 0)
+            raw = self.rfile.read(length) if length else b""
+            server._bump("bytes_in", len(raw))
+            if self.headers.get("Content-Encoding", "").lower() == "gzip":
+                raw = gzip.decompress(raw)
+            return json.loads(raw) if raw else None
+
+        def _send(self, status: int, body: Any = None, headers: Optional[Dict[str, str]] = None) -> None:
+            payload = b"" if body is None else json.dumps(body, default=str).encode("utf-8")
+            accept = self.headers.get("Accept-Encoding", "")
+            encoded = False
+            if server.compress_responses and "gzip" in accept and len(payload) > 1024:
+                payload = gzip.compress(payload)
+                encoded = True
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(payload)))
+            if encoded:
+                self.send_header("Content-Encoding", "gzip")
+            for k, v in (headers or {}).items():
+                self.send_header(k, v)
+            self.end_headers()
+            if payload:
+                self.wfile.write(payload)
+            server._bump("bytes_out", len(payload))
+
+        def _split(self) -> Tuple[str, List[Tuple[str, str]], Dict[str, str]]:
+            parts = urlsplit(self.path)
+            pairs = parse_qsl(parts.query, keep_blank_values=True)
+            filters = [(k, v) for k, v in pairs if k not in RESERVED_PARAMS]
+            options = {k: v for k, v in pairs if k in RESERVED_PARAMS}
+            return parts.path, filters, options
+
+        def _dispatch(self, method: str) -> None:
+            server._bump("requests")
+            server._delay()
+            status = server._inject_error()
+            if status is not None:
+                server._bump("errors_injected")
+                # Consome o corpo para manter a conexao utilizavel
+                length = int(self.headers.get("Content-Length") or 0)
+                if length:
+                    self.rfile.read(length)
+                headers = {}
+                if server.retry_after is not None:
+                    headers["Retry-After"] = str(server.retry_after)
+                self._send(status, {"message": "injected error"}, headers)
+                return
+            try:
+                path, filters, options = self._split()
+                if path.startswith("/rest/v1/"):
+                    self._rest(method, path[len("/rest/v1/"):], filters, options)
+                elif path == "/functions/v1/vendors" and method == "POST":
+                    self._merge()
+                else:
+                    self._send(404, {"message": f"rota desconhecida: {path}"})
+            except PostgrestError as exc:
+                self._send(exc.status, exc.body)
+            except (json.JSONDecodeError, OSError, EOFError) as exc:
+                self._send(400, {"code": "PGRST102", "message": f"corpo invalido: {exc}"})
+
+        # -- REST -------------------------------------------------------------
+
+        def _rest(self, method: str, table: str, filters, options) -> None:
+            prefer = _parse_prefer(self.headers.get("Prefer", ""))
+            select = options.get("select", "*")
+            if method == "GET":
+                rows = server.db.select(table, filters)
+                if "order" in options:
+                    rows = _order(rows, options["order"])
+                offset = int(options.get("offset") or 0)
+                limit = int(options["limit"]) if "limit" in options else None
+                rng = self.headers.get("Range")
+                if rng:
+                    start_s, _, end_s = rng.partition("-")
+                    offset = int(start_s)
+                    if end_s:
+                        limit = int(end_s) - offset + 1
+                total = len(rows)
+                cap = server.max_rows if limit is None else min(limit, server.max_rows)
+                page = rows[offset:offset + cap]
+                end = offset + len(page) - 1
+                count = str(total) if prefer.get("count") == "exact" else "*"
+                content_range = f"{offset}-{end}/{count}" if page else f"*/{total}"
+                self._send(200, [_project(r, select, server.db, table) for r in page],
+                           {"Content-Range": content_range})
+                return
+
+            if method == "POST":
+                body = self._read_body()
+                payloads = body if isinstance(body, list) else [body]
+                if "columns" in options:
+                    cols = [c.strip() for c in options["columns"].split(",")]
+                    payloads = [{c: p[c] for c in cols if c in p} for p in payloads]
+                on_conflict = None
+                if "on_conflict" in options:
+                    on_conflict = tuple(c.strip() for c in options["on_conflict"].split(","))
+                resolution = prefer.get("resolution")
+                use_defaults = prefer.get("missing") == "default" or not isinstance(body, list)
+                if isinstance(body, list) and not use_defaults:
+                    # PostgREST: chaves ausentes num lote viram NULL
+                    keys: Set[str] = set()
+                    for p in payloads:
+                        keys.update(p)
+                    payloads = [{k: p.get(k) for k in keys} for p in payloads]
+                rows = server.db.insert(table, payloads, on_conflict, resolution, use_defaults)
+                self._respond_write(201, rows, prefer, select)
+                return
+
+            if method == "PATCH":
+                data = self._read_body() or {}
+                rows = server.db.update(table, filters, data)
+                self._respond_write(200, rows, prefer, select)
+                return
+
+            if method == "DELETE":
+                rows = server.db.delete(table, filters)
+                self._respond_write(200, rows, prefer, select)
+                return
+
+            self._send(405, {"message": f"metodo nao suportado: {method}"})
+
+        def _respond_write(self, status: int, rows, prefer: Dict[str, str], select: str) -> None:
+            if prefer.get("return") == "representation":
+                self._send(status, [_project(r, select) for r in rows])
+            else:
+                self._send(204 if status == 200 else status, None)
+
+        def _merge(self) -> None:
+            body = self._read_body() or {}
+            if body.get("action") != "merge":
+                raise PostgrestError(400, "BAD_REQUEST", "action invalida")
+            result = server.db.merge_vendors(
+                body.get("primary_vendor_id"), body.get("alias_vendor_ids") or []
+            )
+            self._send(200, {"data": result})
+
+        # -- verbos -----------------------------------------------------------
+
+        def do_GET(self) -> None:
+            self._dispatch("GET")
+
+        def do_POST(self) -> None:
+            self._dispatch("POST")
+
+        def do_PATCH(self) -> None:
+            self._dispatch("PATCH")
+
+        def do_DELETE(self) -> None:
+            self._dispatch("DELETE")
+
+    return Handler
+
+
+# ---------------------------------------------------------------------------
+# Entry point
+# ---------------------------------------------------------------------------
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Servidor PostgREST falso para testes/benchmarks offline dos importadores."
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=54321)
+    parser.add_argument("--latency", type=float, default=0.0, help="Latencia base em segundos")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Jitter (+/-) em segundos")
+    parser.add_argument("--error-rate", type=float, default=0.0, dest="error_rate",
+                        help="Fracao de requisicoes respondidas com erro (0-1)")
+    parser.add_argument("--error-status", type=int, nargs="+", default=[503], dest="error_statuses",
+                        help="Status HTTP sorteados na injecao de erros")
+    parser.add_argument("--retry-after", type=int, default=None, dest="retry_after",
+                        help="Valor do header Retry-After (segundos) nas respostas de erro")
+    parser.add_argument("--max-rows", type=int, default=1000, dest="max_rows",
+                        help="Equivalente ao db-max-rows do PostgREST")
+    parser.add_argument("--seed", type=int, default=None, help="Semente do gerador aleatorio")
+    args = parser.parse_args()
+
+    server = FakePostgrest(
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        error_statuses=tuple(args.error_statuses),
+        retry_after=args.retry_after,
+        max_rows=args.max_rows,
+        seed=args.seed,
+    )
+    url = server.start(args.host, args.port)
+    print(f"Fake PostgREST ouvindo em {url} (Ctrl+C para sair)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
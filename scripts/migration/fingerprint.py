@@ -0,0 +1,89 @@
+"""
+Fingerprints deterministicos das linhas importadas (coluna import_fingerprint).
+
+Cada linha gravada pelos importadores (vendors, bank_accounts, jobs, cost_items)
+leva um sha256 da sua chave natural, independente da data da execucao e do
+IMPORT_SOURCE. Com a constraint UNIQUE (tenant_id, import_fingerprint) as
+escritas viram upserts com Prefer: resolution=ignore-duplicates — reimportar o
+mesmo arquivo em qualquer dia nao duplica nada e dispensa SELECTs previos.
+
+As formulas de vendors (cpf/cnpj/email), bank_accounts, jobs (code) e
+cost_items sao reproduzidas em SQL no backfill da migration
+supabase/migrations/20260314100000_import_fingerprints.sql — altere as duas
+juntas. A de nome (sem SQL) usa text.normalize_text, a mesma chave "name:" do
+VendorIndex de migrate_sheets_data.py.
+
+Compartilhado por migrate_sheets_data.py, import_job_finances.py e import_equipe.py.
+"""
+
+import hashlib
+from typing import Any, Optional
+
+try:
+    from .text import normalize_text
+except ImportError:  # executado de dentro de scripts/migration/
+    from text import normalize_text
+
+# Separador das partes (ASCII Unit Separator): nao aparece em dados de planilha
+SEPARATOR = "\x1f"
+
+# Colunas do alvo ON CONFLICT (constraint UNIQUE de cada tabela importada)
+FINGERPRINT_CONFLICT = "tenant_id,import_fingerprint"
+
+
+def row_fingerprint(*parts: Any) -> str:
+    """sha256 hex das partes (None vira string vazia) separadas por SEPARATOR."""
+    text = SEPARATOR.join("" if p is None else str(p) for p in parts)
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def vendor_fingerprint(
+    name: Optional[str],
+    email: Optional[str] = None,
+    cpf: Optional[str] = None,
+    cnpj: Optional[str] = None,
+) -> Optional[str]:
+    """
+    Fingerprint pela identidade mais forte disponivel: CPF, CNPJ, e-mail ou nome.
+    cpf/cnpj devem vir so com digitos, como gravados no banco.
+    """
+    if cpf:
+        key = f"cpf:{cpf}"
+    elif cnpj:
+        key = f"cnpj:{cnpj}"
+    elif email and email.strip():
+        key = f"email:{email.strip().lower()}"
+    elif name and normalize_text(name):
+        key = f"name:{normalize_text(name)}"
+    else:
+        return None
+    return row_fingerprint("vendors", key)
+
+
+def bank_account_fingerprint(
+    vendor_id: str,
+    pix_key: Optional[str] = None,
+    bank_code: Optional[str] = None,
+    agency: Optional[str] = None,
+    account_number: Optional[str] = None,
+) -> str:
+    """Conta bancaria: vendor + PIX + banco/agencia/conta."""
+    return row_fingerprint(
+        "bank_accounts", vendor_id, pix_key, bank_code, agency, account_number
+    )
+
+
+def job_fingerprint(code: Optional[str], normalized_title: str = "") -> str:
+    """Job pelo code (sem diferenciar maiusculas) ou, sem code, pelo titulo normalizado."""
+    if code and code.strip():
+        return row_fingerprint("jobs", code.strip().lower())
+    return row_fingerprint("jobs", f"title:{normalized_title}")
+
+
+def cost_item_fingerprint(
+    job_id: Optional[str], item_number: int, sub_item_number: int, description: str
+) -> str:
+    """cost_item pela posicao no job (item.sub_item) e descricao, como gravados."""
+    return row_fingerprint(
+        "cost_items", job_id or "", item_number, sub_item_number, description
+    )
@@ -6,7 +6,11 @@ Dedup por:
 """
 
 import re
-import unicodedata
+
+from bank_matcher import match_bank
+from csv_io import read_text
+from documents import classify_document
+from text import fold_text
 
 TENANT_ID = '11111111-1111-1111-1111-111111111111'
 IMPORT_SOURCE = 'migration_equipe_20260227'
@@ -28,15 +32,9 @@ PJ_SUFFIXES = re.compile(
 # Helpers de normalização
 # ---------------------------------------------------------------------------
 
-def remove_accents(s: str) -> str:
-    return ''.join(
-        c for c in unicodedata.normalize('NFD', s)
-        if unicodedata.category(c) != 'Mn'
-    )
-
 def normalize_key(name: str) -> str:
-    """Chave de dedup: lowercase, sem acentos, trim, espaços simples."""
-    return re.sub(r'\s+', ' ', remove_accents(name.strip().lower()))
+    """Chave de dedup: lowercase, sem acentos, trim, espaços simples (text.fold_text)."""
+    return fold_text(name)
 
 def title_case(name: str) -> str:
     """Title Case preservando artigos comuns em minúsculo quando não são a primeira palavra."""
@@ -50,10 +48,6 @@ def title_case(name: str) -> str:
             result.append(w.lower())
     return ' '.join(result)
 
-def clean_digits(s: str) -> str:
-    """Remove tudo que não for dígito."""
-    return re.sub(r'\D', '', s)
-
 def sql_escape(s: str) -> str:
     """Escapa aspas simples para SQL."""
     return s.replace("'", "''")
@@ -62,109 +56,37 @@ def sql_escape(s: str) -> str:
 # Detecção de tipo de documento / PIX
 # ---------------------------------------------------------------------------
 
-UUID_RE = re.compile(
-    r'^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$',
-    re.IGNORECASE,
-)
 EMAIL_RE = re.compile(r'^[^@\s]+@[^@\s]+\.[^@\s]+$')
 
 def classify_pix(raw: str):
     """
     Retorna (pix_key_clean, pix_key_type, cpf_digits_or_None, cnpj_digits_or_None)
-    pix_key_type: 'cpf'|'cnpj'|'email'|'telefone'|'aleatoria'|None
+    pix_key_type: 'cpf'|'cnpj'|'email'|'telefone'|'aleatoria'|None (documents.py)
     """
-    raw = raw.strip()
-
-    # Remove prefixos comuns como "Pix(cpf):", "CNPJ:", "CPF", "chave email" etc.
-    raw_clean = re.sub(
-        r'^(pix\s*[\(\-:]*\s*)?(cpf|cnpj|celular|telefone|chave\s+email)[\s:\-]*',
-        '', raw, flags=re.IGNORECASE
-    ).strip()
-
-    # Remove sufixos como "(cnpj)", "CPF", "celular", "(chave email)" etc.
-    raw_clean = re.sub(
-        r'\s*([\(\[]\s*)?(cpf|cnpj|celular|telefone|chave\s+email)(\s*[\)\]])?$',
-        '', raw_clean, flags=re.IGNORECASE
-    ).strip()
-
-    # Verifica UUID
-    if UUID_RE.match(raw_clean.lower()):
-        return raw_clean.lower(), 'aleatoria', None, None
-
-    # Verifica e-mail
-    if EMAIL_RE.match(raw_clean):
-        return raw_clean.lower(), 'email', None, None
-
-    # Extrai só dígitos
-    digits = clean_digits(raw_clean)
-
-    if len(digits) == 11:
-        return digits, 'cpf', digits, None
-    if len(digits) == 14:
-        return digits, 'cnpj', None, digits
-
-    # CNPJ com zero inicial faltando (13 digitos) → pad para 14
-    if len(digits) == 13:
-        cnpj14 = digits.zfill(14)
-        return cnpj14, 'cnpj', None, cnpj14
-
-    # Telefone: 10-11 dígitos (com DDD)
-    if 10 <= len(digits) <= 11:
-        return digits, 'telefone', None, None
-
-    # Fallback: testa o raw original como e-mail (remove sufixo de descrição primeiro)
-    raw_strip = raw.strip().lower()
-    raw_strip = re.sub(r'\s*\(chave\s+email\)\s*$', '', raw_strip).strip()
-    if EMAIL_RE.match(raw_strip):
-        return raw_strip, 'email', None, None
-
+    doc = classify_document(raw)
     # Não reconhecido (ex: #ERROR!, texto livre) → retorna None
-    return None, None, None, None
+    if doc.pix_key_type is None:
+        return None, None, None, None
+    return doc.pix_key, doc.pix_key_type, doc.cpf, doc.cnpj
 
 
 # ---------------------------------------------------------------------------
 # Normalização de banco
 # ---------------------------------------------------------------------------
 
-BANK_MAP = [
-    (r'nu\s*pagamentos?|nubank|nu\s*bank|nubenk|nu\b', 'Nu Pagamentos', '260'),
-    (r'ita[uú]', 'Itau Unibanco', '341'),
-    (r'bradesco', 'Bradesco', '237'),
-    (r'banco\s+do\s+brasil|b\.?\s*b\.?\b', 'Banco do Brasil', '001'),
-    (r'caixa\s*(econ[oô]mica)?|c\.?\s*e\.?\s*f\.?|cef\b', 'Caixa Economica Federal', '104'),
-    (r'santander', 'Santander', '033'),
-    (r'inter\b|banco\s+inter', 'Banco Inter', '077'),
-    (r'c6\s*bank|c6\b|banco\s+c6', 'C6 Bank', '336'),
-    (r'picpay', 'PicPay', '380'),
-    (r'mercado\s*pago', 'Mercado Pago', '323'),
-    (r'cora\b', 'Cora', '403'),
-    (r'neon\b', 'Neon', '536'),
-    (r'pefisa|palmeiras\s*pay', 'Pefisa', '174'),
-    (r'dock\b', 'Dock', '301'),
-    (r'brasil\b', 'Banco do Brasil', '001'),
-]
-
-CODE_TO_NAME = {
-    '001': 'Banco do Brasil', '033': 'Santander', '077': 'Banco Inter',
-    '104': 'Caixa Economica Federal', '174': 'Pefisa', '206': 'Banco 206',
-    '237': 'Bradesco', '260': 'Nu Pagamentos', '301': 'Dock',
-    '323': 'Mercado Pago', '336': 'C6 Bank', '341': 'Itau Unibanco',
-    '380': 'PicPay', '403': 'Cora', '536': 'Neon',
-}
-
 def normalize_bank(raw: str):
-    """Retorna (bank_name, bank_code)."""
+    """Retorna (bank_name, bank_code) pelo apelido mais longo reconhecido (bank_matcher.py)."""
     if not raw or not raw.strip():
         return None, None
-    s = raw.strip().lower()
-    for pattern, name, code in BANK_MAP:
-        if re.search(pattern, s):
-            return name, code
-    # Tenta extrair código numérico puro (ex: "237", "341", "77")
-    code_match = re.match(r'^0*(\d{1,3})\b', s)
+    matched = match_bank(raw)
+    if matched:
+        code, name = matched
+        return name, code
+    # Codigo numerico fora da tabela (ex: "206")
+    code_match = re.match(r'^0*(\d{1,3})\b', raw.strip())
     if code_match:
         code_raw = code_match.group(1).zfill(3)
-        return CODE_TO_NAME.get(code_raw, f'Banco {code_raw}'), code_raw
+        return f'Banco {code_raw}', code_raw
     return raw.strip()[:60], None
 
 
@@ -173,27 +95,24 @@ def normalize_bank(raw: str):
 # ---------------------------------------------------------------------------
 
 def read_csv(path: str):
-    """Le CSV — tenta UTF-8 primeiro, depois latin-1."""
+    """Le CSV — UTF-8 primeiro, depois latin-1 (csv_io.read_text)."""
     rows = []
-    for enc in ('utf-8-sig', 'utf-8', 'latin-1'):
-        try:
-            with open(path, encoding=enc, errors='replace') as f:
-                for line in f:
-                    line = line.rstrip('\r\n')
-                    if not line.strip():
-                        continue
-                    parts = line.split(',')
-                    if len(parts) < 2:
-                        continue
-                    nome = parts[0].strip()
-                    email = parts[1].strip().lower() if len(parts) > 1 else ''
-                    banco = parts[2].strip() if len(parts) > 2 else ''
-                    # Reagrupa campos 3+ caso haja vírgula interna no PIX
-                    pix_raw = ','.join(parts[3:]).strip() if len(parts) > 3 else ''
-                    rows.append((nome, email, banco, pix_raw))
-            return rows
-        except Exception:
+    try:
+        text = read_text(path)
+    except (OSError, ValueError):
+        return rows
+    for line in text.splitlines():
+        if not line.strip():
+            continue
+        parts = line.split(',')
+        if len(parts) < 2:
             continue
+        nome = parts[0].strip()
+        email = parts[1].strip().lower() if len(parts) > 1 else ''
+        banco = parts[2].strip() if len(parts) > 2 else ''
+        # Reagrupa campos 3+ caso haja vírgula interna no PIX
+        pix_raw = ','.join(parts[3:]).strip() if len(parts) > 3 else ''
+        rows.append((nome, email, banco, pix_raw))
     return rows
 
 
@@ -6,6 +6,7 @@ Documentacao: docs/specs/analise-custos-reais-detalhada.md (secao 2)
 
 Uso:
     python scripts/migration/import_equipe.py --csv PATH --tenant-id UUID [--dry-run] [--verbose]
+        [--sync-ledger [ARQUIVO]]
 
 Variaveis de ambiente obrigatorias:
     SUPABASE_URL             URL do projeto Supabase (ex: https://xxx.supabase.co)
@@ -13,123 +14,20 @@ Variaveis de ambiente obrigatorias:
 """
 
 import argparse
-import csv
-import json
 import os
-import re
 import sys
-import unicodedata
 from datetime import datetime, timezone
 from typing import Dict, List, Optional, Tuple
 
-import requests
-
-# ---------------------------------------------------------------------------
-# Constantes
-# ---------------------------------------------------------------------------
-
-# Mapeamento de texto livre de banco -> (codigo_ispb, nome_canonico)
-BANK_NORMALIZE = {
-    "nubank": ("260", "Nu Pagamentos"),
-    "nu bank": ("260", "Nu Pagamentos"),
-    "nu": ("260", "Nu Pagamentos"),
-    "260": ("260", "Nu Pagamentos"),
-    "itau": ("341", "Itau Unibanco"),
-    "itaú": ("341", "Itau Unibanco"),
-    "itaú ": ("341", "Itau Unibanco"),
-    "itau ": ("341", "Itau Unibanco"),
-    "bradesco": ("237", "Bradesco"),
-    "banco do brasil": ("001", "Banco do Brasil"),
-    "bb": ("001", "Banco do Brasil"),
-    "caixa": ("104", "Caixa Economica Federal"),
-    "cef": ("104", "Caixa Economica Federal"),
-    "santander": ("033", "Santander"),
-    "inter": ("077", "Banco Inter"),
-    "banco inter": ("077", "Banco Inter"),
-    "077-bancointer": ("077", "Banco Inter"),
-    "c6": ("336", "C6 Bank"),
-    "c6 bank": ("336", "C6 Bank"),
-    "picpay": ("380", "PicPay"),
-    "mercado pago": ("323", "Mercado Pago"),
-    "safra": ("422", "Safra"),
-    "sicoob": ("756", "Sicoob"),
-    "sicredi": ("748", "Sicredi"),
-    "original": ("212", "Banco Original"),
-    "neon": ("655", "Neon"),
-    "next": ("237", "Bradesco"),  # Next e marca do Bradesco
-    "pagbank": ("290", "PagBank"),
-    "pagseguro": ("290", "PagBank"),
-    "cora": ("403", "Cora"),
-    "stone": ("197", "Stone"),
-    "xp": ("102", "XP Investimentos"),
-    "will": ("280", "Will Bank"),
-}
-
-# Cores ANSI para output no terminal
-GREEN = "\033[92m"
-YELLOW = "\033[93m"
-RED = "\033[91m"
-RESET = "\033[0m"
-CYAN = "\033[96m"
-BOLD = "\033[1m"
-
-
-# ---------------------------------------------------------------------------
-# Utilitarios de log
-# ---------------------------------------------------------------------------
-
-def log(msg: str, level: str = "INFO", verbose: bool = False) -> None:
-    """Imprime mensagem com timestamp e cor conforme nivel."""
-    if level == "DEBUG" and not verbose:
-        return
-    now = datetime.now(timezone.utc).strftime("%H:%M:%S")
-    color = {
-        "OK": GREEN,
-        "SKIP": YELLOW,
-        "ERROR": RED,
-        "INFO": CYAN,
-        "DEBUG": RESET,
-    }.get(level, RESET)
-    print(f"{color}[{now}] [{level:5s}] {msg}{RESET}")
-
-
-def log_ok(msg: str) -> None:
-    log(msg, "OK")
-
-
-def log_skip(msg: str) -> None:
-    log(msg, "SKIP")
-
-
-def log_error(msg: str) -> None:
-    log(msg, "ERROR")
-
-
-def log_info(msg: str) -> None:
-    log(msg, "INFO")
-
-
-# ---------------------------------------------------------------------------
-# Normalizacao de texto
-# ---------------------------------------------------------------------------
-
-def normalize_name(name: str) -> str:
-    """
-    Normaliza nome de vendor igual ao PostgreSQL normalize_vendor_name().
-    Lower + trim + remove acentos + remove caracteres especiais (exceto espaco e hifen).
-    """
-    # Remove acentos via unicodedata (equivalente ao unaccent do Postgres)
-    nfkd = unicodedata.normalize("NFKD", name)
-    ascii_str = "".join(c for c in nfkd if not unicodedata.combining(c))
-    # Remove tudo que nao for alfanumerico, espaco ou hifen
-    cleaned = re.sub(r"[^a-zA-Z0-9\s\-]", "", ascii_str)
-    return cleaned.lower().strip()
-
-
-def only_digits(value: str) -> str:
-    """Retorna apenas os digitos de uma string."""
-    return re.sub(r"\D", "", value)
-
+from bank_matcher import match_bank
+from csv_io import read_csv
+from documents import DOCUMENT_CLASSIFIER, classify_document
+from fingerprint import FINGERPRINT_CONFLICT, bank_account_fingerprint, vendor_fingerprint
+from log import BOLD, GREEN, RED, RESET, YELLOW, log, log_error, log_info, log_ok, log_skip
+from lookup_cache import LookupCache, index_vendors
+from rest_client import SupabaseRestClient, is_conflict
+from sync_ledger import SyncLedger, SyncRun
+from text import normalize_name
 
 # ---------------------------------------------------------------------------
 # Deteccao de tipo de documento e chave PIX
@@ -145,138 +43,48 @@ def detect_document_type(raw: str) -> dict:
         pix_key: str | None,
         pix_key_type: str | None,
     }
+    CPF/CNPJ com digito verificador invalido nao preenchem cpf/cnpj (documents.py).
     """
-    result = {
-        "entity_type": "pf",
-        "cpf": None,
-        "cnpj": None,
-        "pix_key": None,
-        "pix_key_type": None,
-    }
-
-    if not raw or not raw.strip():
-        return result
-
-    raw = raw.strip()
-    digits = only_digits(raw)
-
-    # UUID / chave aleatoria PIX (formato: 8-4-4-4-12)
-    uuid_pattern = re.compile(
-        r"^[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}$"
-    )
-    if uuid_pattern.match(raw):
-        result["pix_key"] = raw
-        result["pix_key_type"] = "aleatoria"
-        return result
-
-    # E-mail PIX
-    if "@" in raw and "." in raw.split("@")[-1]:
-        result["pix_key"] = raw.strip()
-        result["pix_key_type"] = "email"
-        # Sem informacao de CPF/CNPJ
-        return result
-
-    # CNPJ: 14 digitos
-    if len(digits) == 14:
-        result["entity_type"] = "pj"
-        result["cnpj"] = digits
-        result["pix_key"] = digits
-        result["pix_key_type"] = "cnpj"
-        return result
-
-    # CPF: 11 digitos
-    if len(digits) == 11:
-        result["entity_type"] = "pf"
-        result["cpf"] = digits
-        result["pix_key"] = digits
-        result["pix_key_type"] = "cpf"
-        return result
-
-    # Telefone: 8+ digitos (formato nacional ou internacional)
-    if len(digits) >= 8:
-        phone_clean = digits if not raw.startswith("+") else "+" + digits
-        result["pix_key"] = phone_clean
-        result["pix_key_type"] = "telefone"
-        return result
-
-    # Fallback: trata como chave aleatoria
-    result["pix_key"] = raw
-    result["pix_key_type"] = "aleatoria"
-    return result
+    return classify_document(raw).as_dict()
 
 
 def normalize_bank(raw: str) -> Tuple[Optional[str], Optional[str]]:
     """
-    Normaliza texto livre de banco para (bank_code, bank_name).
-    Retorna (None, None) se nao reconhecido.
+    Normaliza texto livre de banco para (bank_code, bank_name), pelo apelido mais
+    longo reconhecido (bank_matcher.py). Retorna (None, raw) se nao reconhecido.
     """
     if not raw or not raw.strip():
         return None, None
 
-    key = raw.strip().lower()
-    # Tenta match exato
-    if key in BANK_NORMALIZE:
-        return BANK_NORMALIZE[key]
-
-    # Tenta match parcial (banco contem a chave)
-    for k, v in BANK_NORMALIZE.items():
-        if k in key:
-            return v
+    matched = match_bank(raw)
+    if matched:
+        return matched
 
     # Retorna o nome original sem codigo
     return None, raw.strip()
 
 
-# ---------------------------------------------------------------------------
-# Cliente Supabase REST API
-# ---------------------------------------------------------------------------
-
-class SupabaseClient:
-    """Cliente simples para a REST API do Supabase usando service_role key."""
-
-    def __init__(self, url: str, key: str):
-        self.base_url = url.rstrip("/")
-        self.headers = {
-            "apikey": key,
-            "Authorization": f"Bearer {key}",
-            "Content-Type": "application/json",
-            "Prefer": "return=representation",
-        }
-
-    def _url(self, table: str) -> str:
-        return f"{self.base_url}/rest/v1/{table}"
-
-    def select(self, table: str, filters: Optional[Dict] = None) -> List[Dict]:
-        """GET de registros com filtros opcionais."""
-        params = filters or {}
-        resp = requests.get(self._url(table), headers=self.headers, params=params)
-        resp.raise_for_status()
-        return resp.json()
-
-    def insert(self, table: str, data: dict) -> dict:
-        """POST para inserir um registro. Retorna o registro criado."""
-        resp = requests.post(
-            self._url(table),
-            headers=self.headers,
-            data=json.dumps(data),
-        )
-        resp.raise_for_status()
-        result = resp.json()
-        # Supabase retorna lista quando Prefer=return=representation
-        return result[0] if isinstance(result, list) else result
-
-
 # ---------------------------------------------------------------------------
 # Logica principal de importacao
 # ---------------------------------------------------------------------------
 
 def find_existing_vendor(
-    client: SupabaseClient, tenant_id: str, normalized: str, email: Optional[str]
+    client: SupabaseRestClient,
+    tenant_id: str,
+    normalized: str,
+    email: Optional[str],
+    vendor_index: Optional[Dict[str, Dict]] = None,
 ) -> Optional[Dict]:
     """
     Busca vendor existente por normalized_name ou email.
     Retorna o primeiro match ou None.
+    Com vendor_index (--lookup-cache) a busca e feita so em memoria.
     """
+    if vendor_index is not None:
+        return vendor_index.get(f"name:{normalized}") or (
+            vendor_index.get(f"email:{email.strip().lower()}") if email else None
+        )
+
     # Busca por normalized_name
     try:
         rows = client.select(
@@ -311,18 +119,98 @@ def find_existing_vendor(
     return None
 
 
+def load_vendor_index(
+    client: SupabaseRestClient, supabase_url: str, tenant_id: str, path: str, refresh: bool
+) -> Dict[str, Dict]:
+    """Atualiza o cache local de vendors do tenant e retorna o indice nome/email."""
+    cache = LookupCache(path, supabase_url, tenant_id)
+    try:
+        if refresh:
+            cache.reset()
+        changed = cache.refresh("vendors", client.select)
+        index = index_vendors(cache.rows("vendors"))
+        log_info(f"Cache de vendors: {len(index)} chaves ({changed} linhas atualizadas) em {path}")
+        return index
+    finally:
+        cache.close()
+
+
+def build_bank_payload(
+    tenant_id: str,
+    vendor_id: str,
+    bank_code: Optional[str],
+    bank_name: Optional[str],
+    doc_info: dict,
+) -> dict:
+    """Payload da conta bancaria principal do vendor (upsert pelo fingerprint da conta)."""
+    bank_payload: dict = {
+        "tenant_id": tenant_id,
+        "vendor_id": vendor_id,
+        "is_primary": True,
+    }
+    if bank_name:
+        bank_payload["bank_name"] = bank_name
+    if bank_code:
+        bank_payload["bank_code"] = bank_code
+    if doc_info["pix_key"]:
+        bank_payload["pix_key"] = doc_info["pix_key"]
+        bank_payload["pix_key_type"] = doc_info["pix_key_type"]
+
+    bank_payload["import_fingerprint"] = bank_account_fingerprint(
+        vendor_id, doc_info["pix_key"], bank_code
+    )
+    return bank_payload
+
+
+def repair_bank_account(
+    client: SupabaseRestClient,
+    line_number: int,
+    full_name: str,
+    bank_payload: dict,
+    result: Dict,
+) -> Dict:
+    """
+    Garante a conta bancaria de um vendor ja existente (re-sync de linha fora do
+    ledger, p.ex. bank_account que falhou numa execucao anterior). Retorna
+    `result` ou, se a conta falhar de novo, um resultado 'error'.
+    """
+    try:
+        created = client.upsert(
+            "bank_accounts", bank_payload, FINGERPRINT_CONFLICT, ignore_duplicates=True
+        )
+    except Exception as exc:
+        if is_conflict(exc):
+            # O vendor ja tem outra conta principal: nada a reparar
+            log_skip(f"  '{full_name}' ja tem conta bancaria principal")
+            return result
+        log_error(f"Linha {line_number}: bank_account de '{full_name}' falhou de novo: {exc}")
+        return {
+            "status": "error",
+            "detail": f"bank_account falhou: {exc}",
+            "fingerprint": result["fingerprint"],
+        }
+    if created is not None:
+        log_ok(f"  bank_account criada para '{full_name}' (vendor ja existente)")
+        return {**result, "bank_account": True}
+    return result
+
+
 def process_row(
     row: List[str],
     line_number: int,
-    client: SupabaseClient,
+    client: SupabaseRestClient,
     tenant_id: str,
     import_source: str,
     dry_run: bool,
     verbose: bool,
+    vendor_index: Optional[Dict[str, Dict]] = None,
+    repair_bank: bool = False,
 ) -> Dict:
     """
     Processa uma linha do EQUIPE.csv e persiste (ou simula) vendor + bank_account.
-    Retorna dicionario com resultado: {'status': 'created'|'skipped'|'error', 'detail': str}.
+    Retorna dicionario com resultado: {'status': 'created'|'skipped'|'error', 'detail': str},
+    mais 'fingerprint' do vendor quando a linha chegou a ser processada.
+    Com repair_bank, a conta bancaria de um vendor ja existente tambem e garantida.
     """
     # Garante colunas suficientes
     while len(row) < 4:
@@ -359,18 +247,25 @@ def process_row(
         )
         return {"status": "dry_run", "detail": f"Vendor: {full_name}"}
 
+    fingerprint = vendor_fingerprint(full_name, email, doc_info["cpf"], doc_info["cnpj"])
+
     # Verifica se ja existe
-    existing = find_existing_vendor(client, tenant_id, normalized, email)
+    existing = find_existing_vendor(client, tenant_id, normalized, email, vendor_index)
     if existing:
         log_skip(
             f"Linha {line_number}: vendor '{full_name}' ja existe "
             f"(id={existing['id']}, normalized='{existing['normalized_name']}')"
         )
-        return {
+        result = {
             "status": "skipped",
             "detail": f"Vendor existente: {existing['id']}",
             "vendor_id": existing["id"],
+            "fingerprint": fingerprint,
         }
+        if not repair_bank:
+            return result
+        bank_payload = build_bank_payload(tenant_id, existing["id"], bank_code, bank_name, doc_info)
+        return repair_bank_account(client, line_number, full_name, bank_payload, result)
 
     # Monta payload do vendor
     vendor_payload = {
@@ -379,6 +274,7 @@ def process_row(
         "entity_type": doc_info["entity_type"],
         "email": email,
         "import_source": import_source,
+        "import_fingerprint": fingerprint,
     }
     if doc_info["cpf"]:
         vendor_payload["cpf"] = doc_info["cpf"]
@@ -386,61 +282,80 @@ def process_row(
         vendor_payload["cnpj"] = doc_info["cnpj"]
 
     try:
-        vendor = client.insert("vendors", vendor_payload)
+        vendor = client.upsert(
+            "vendors", vendor_payload, FINGERPRINT_CONFLICT, ignore_duplicates=True
+        )
+        if vendor is None:
+            # Importado numa execucao anterior (o fingerprint nao depende da data)
+            rows = client.select(
+                "vendors",
+                {
+                    "tenant_id": f"eq.{tenant_id}",
+                    "import_fingerprint": f"eq.{vendor_payload['import_fingerprint']}",
+                    "deleted_at": "is.null",
+                    "select": "id",
+                },
+            )
+            if not rows:
+                # So o vendor removido/mesclado tem o fingerprint: o id dele nao
+                # e reaproveitado
+                log_skip(
+                    f"Linha {line_number}: vendor '{full_name}' ja importado, "
+                    "mas removido ou mesclado"
+                )
+                return {
+                    "status": "skipped",
+                    "detail": "Vendor ja importado (removido ou mesclado)",
+                    "vendor_id": None,
+                    "fingerprint": fingerprint,
+                }
+            existing_id = rows[0]["id"]
+            log_skip(f"Linha {line_number}: vendor '{full_name}' ja importado (id={existing_id})")
+            result = {
+                "status": "skipped",
+                "detail": f"Vendor ja importado: {existing_id}",
+                "vendor_id": existing_id,
+                "fingerprint": fingerprint,
+            }
+            if not repair_bank:
+                return result
+            bank_payload = build_bank_payload(tenant_id, existing_id, bank_code, bank_name, doc_info)
+            return repair_bank_account(client, line_number, full_name, bank_payload, result)
         vendor_id = vendor["id"]
         log_ok(f"Linha {line_number}: vendor criado '{full_name}' (id={vendor_id})")
+        if vendor_index is not None:
+            # Linhas seguintes do mesmo CSV enxergam o vendor recem-criado
+            known = {"id": vendor_id, "normalized_name": normalized}
+            vendor_index.setdefault(f"name:{normalized}", known)
+            if email:
+                vendor_index.setdefault(f"email:{email.lower()}", known)
     except Exception as exc:
         log_error(f"Linha {line_number}: falha ao criar vendor '{full_name}': {exc}")
         return {"status": "error", "detail": str(exc)}
 
-    # Monta payload da conta bancaria
-    bank_payload: dict = {
-        "tenant_id": tenant_id,
-        "vendor_id": vendor_id,
-        "is_primary": True,
-    }
-    if bank_name:
-        bank_payload["bank_name"] = bank_name
-    if bank_code:
-        bank_payload["bank_code"] = bank_code
-    if doc_info["pix_key"]:
-        bank_payload["pix_key"] = doc_info["pix_key"]
-        bank_payload["pix_key_type"] = doc_info["pix_key_type"]
-
+    bank_payload = build_bank_payload(tenant_id, vendor_id, bank_code, bank_name, doc_info)
     try:
-        client.insert("bank_accounts", bank_payload)
+        client.upsert(
+            "bank_accounts", bank_payload, FINGERPRINT_CONFLICT, ignore_duplicates=True
+        )
         log_ok(
             f"  bank_account criada para '{full_name}' "
             f"(bank={bank_name}, pix_type={doc_info['pix_key_type']})"
         )
     except Exception as exc:
-        log_error(
-            f"  Falha ao criar bank_account para vendor {vendor_id}: {exc}. "
-            "Vendor foi criado, corrija manualmente."
+        hint = (
+            "A proxima execucao com --sync-ledger cria a conta."
+            if repair_bank else "Vendor foi criado, corrija manualmente."
         )
+        log_error(f"  Falha ao criar bank_account para vendor {vendor_id}: {exc}. {hint}")
         return {
             "status": "partial",
             "detail": f"Vendor criado mas bank_account falhou: {exc}",
             "vendor_id": vendor_id,
+            "fingerprint": fingerprint,
         }
 
-    return {"status": "created", "vendor_id": vendor_id}
-
-
-def read_csv(path: str) -> List[List[str]]:
-    """
-    Le CSV com tentativa de encoding utf-8-sig, fallback para latin-1.
-    Retorna lista de linhas (cada linha e lista de strings).
-    """
-    for encoding in ("utf-8-sig", "latin-1"):
-        try:
-            with open(path, newline="", encoding=encoding) as f:
-                reader = csv.reader(f)
-                rows = list(reader)
-            return rows
-        except UnicodeDecodeError:
-            continue
-    raise ValueError(f"Nao foi possivel ler o arquivo com encodings utf-8-sig ou latin-1: {path}")
+    return {"status": "created", "vendor_id": vendor_id, "fingerprint": fingerprint}
 
 
 def run(args: argparse.Namespace) -> None:
@@ -462,7 +377,7 @@ def run(args: argparse.Namespace) -> None:
     rows = read_csv(args.csv)
     log_info(f"Total de linhas encontradas: {len(rows)}")
 
-    client = SupabaseClient(supabase_url, service_key)
+    client = SupabaseRestClient(supabase_url, service_key)
     import_source = f"migration_equipe_{datetime.now(timezone.utc).strftime('%Y%m%d')}"
 
     # Contadores
@@ -474,7 +389,28 @@ def run(args: argparse.Namespace) -> None:
         "bank_accounts": 0,
     }
 
-    for i, row in enumerate(rows, start=1):
+    vendor_index: Optional[Dict[str, Dict]] = None
+    if args.lookup_cache:
+        vendor_index = load_vendor_index(
+            client, supabase_url, args.tenant_id, args.lookup_cache, args.refresh_cache
+        )
+
+    # Re-sync incremental: so as linhas novas ou alteradas desde a ultima execucao
+    # deste CSV. Vendors nao sao atualizados nem removidos: de uma linha alterada
+    # de vendor existente, so a conta bancaria principal e garantida
+    numbered = list(enumerate(rows, start=1))
+    ledger: Optional[SyncLedger] = None
+    sync: Optional[SyncRun] = None
+    if args.sync_ledger:
+        ledger = SyncLedger(args.sync_ledger, supabase_url, args.tenant_id)
+        source = os.path.abspath(args.csv)
+        if args.reset_ledger:
+            ledger.reset(source)
+        sync = SyncRun(ledger, source, "vendors", rows)
+        numbered = sync.changed
+        log_info(f"Sync incremental: {len(numbered)} de {len(rows)} linhas novas ou alteradas")
+
+    for i, row in numbered:
         # Pula linhas completamente vazias
         if not any(cell.strip() for cell in row):
             continue
@@ -488,8 +424,16 @@ def run(args: argparse.Namespace) -> None:
                 import_source,
                 args.dry_run,
                 args.verbose,
+                vendor_index,
+                repair_bank=sync is not None,
             )
             status = result["status"]
+            if sync is not None and status in ("created", "skipped"):
+                sync.mark(i, result.get("fingerprint"))
+            elif sync is not None and result.get("fingerprint"):
+                # bank_account falhou: a linha fica fora do ledger e, na proxima
+                # execucao, o vendor ja existente recebe a conta (repair_bank)
+                sync.touch(result.get("fingerprint"))
             if status == "created":
                 counters["created"] += 1
                 counters["bank_accounts"] += 1
@@ -498,6 +442,8 @@ def run(args: argparse.Namespace) -> None:
                 counters["errors"] += 1   # bank_account falhou
             elif status == "skipped":
                 counters["skipped"] += 1
+                if result.get("bank_account"):
+                    counters["bank_accounts"] += 1
             elif status == "dry_run":
                 counters["dry_run"] += 1
             else:
@@ -506,6 +452,11 @@ def run(args: argparse.Namespace) -> None:
             log_error(f"Linha {i}: excecao inesperada: {exc}")
             counters["errors"] += 1
 
+    if sync is not None and not args.dry_run:
+        sync.finish()
+    if ledger is not None:
+        ledger.close()
+
     # Relatorio final
     print()
     print(f"{BOLD}{'=' * 60}{RESET}")
@@ -518,8 +469,16 @@ def run(args: argparse.Namespace) -> None:
         print(f"{GREEN}  Vendors criados:        {counters['created']}{RESET}")
         print(f"{YELLOW}  Duplicatas ignoradas:   {counters['skipped']}{RESET}")
         print(f"{GREEN}  Bank accounts criadas:  {counters['bank_accounts']}{RESET}")
+        if sync is not None:
+            print(f"  Linhas inalteradas:     {len(rows) - len(sync.changed)}")
+        if DOCUMENT_CLASSIFIER.counts:
+            tipos = ", ".join(f"{k} {v}" for k, v in DOCUMENT_CLASSIFIER.counts.most_common())
+            print(f"  Documentos/PIX:         {tipos}")
         print(f"{RED}  Linhas com erro:        {counters['errors']}{RESET}")
+        for label, value in client.stats_lines():
+            print(f"  {label + ':':<24}{value}")
     print(f"{'=' * 60}")
+    client.close()
 
 
 # ---------------------------------------------------------------------------
@@ -552,9 +511,50 @@ def main() -> None:
         action="store_true",
         help="Exibe logs detalhados (DEBUG)",
     )
+    parser.add_argument(
+        "--lookup-cache",
+        nargs="?",
+        const=LookupCache.default_path(),
+        default=None,
+        dest="lookup_cache",
+        metavar="ARQUIVO",
+        help=(
+            "Resolve vendors por um cache SQLite local atualizado de forma incremental "
+            "(padrao: $LOOKUP_CACHE_PATH ou ~/.cache/ellahos/lookup_cache.sqlite)"
+        ),
+    )
+    parser.add_argument(
+        "--refresh-cache",
+        action="store_true",
+        dest="refresh_cache",
+        help="Descarta o cache de lookups do tenant e baixa tudo de novo",
+    )
+    parser.add_argument(
+        "--sync-ledger",
+        nargs="?",
+        const=SyncLedger.default_path(),
+        default=None,
+        dest="sync_ledger",
+        metavar="ARQUIVO",
+        help=(
+            "Re-sync incremental: processa so as linhas novas ou alteradas desde a "
+            "ultima execucao deste CSV (padrao: $SYNC_LEDGER_PATH ou "
+            "~/.cache/ellahos/sync_ledger.sqlite)"
+        ),
+    )
+    parser.add_argument(
+        "--reset-ledger",
+        action="store_true",
+        dest="reset_ledger",
+        help="Esquece as linhas ja sincronizadas deste CSV (processa tudo de novo)",
+    )
 
     args = parser.parse_args()
 
+    if args.reset_ledger and not args.sync_ledger:
+        log_error("--reset-ledger exige --sync-ledger.")
+        sys.exit(1)
+
     if not os.path.isfile(args.csv):
         log_error(f"Arquivo nao encontrado: {args.csv}")
         sys.exit(1)
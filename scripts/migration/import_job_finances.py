@@ -10,7 +10,8 @@ Uso:
         --job-id UUID \\
         --tenant-id UUID \\
         [--dry-run] \\
-        [--verbose]
+        [--verbose] \\
+        [--sync-ledger [ARQUIVO] [--tombstones]]
 
 Variaveis de ambiente obrigatorias:
     SUPABASE_URL               URL do projeto Supabase (ex: https://xxx.supabase.co)
@@ -50,17 +51,23 @@ Mapeamento de colunas do CSV (indices fixos, linha 18 = header):
 """
 
 import argparse
-import csv
-import json
 import os
-import re
 import sys
-import unicodedata
 from datetime import datetime, timezone
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Optional, Tuple
 
 import requests
 
+from csv_io import GG_ENCODINGS, read_csv
+from dates import parse_date_br
+from fingerprint import FINGERPRINT_CONFLICT, cost_item_fingerprint
+from log import BOLD, GREEN, RED, RESET, YELLOW, log, log_error, log_info, log_ok, log_skip
+from lookup_cache import LookupCache, index_vendors
+from money import DOTS_THOUSANDS, parse_brl, parse_brl_column
+from rest_client import DEFAULT_BATCH_ROWS, BulkWriter, SupabaseRestClient
+from sync_ledger import SyncLedger, SyncRun, tombstone
+from text import normalize_name
+
 # ---------------------------------------------------------------------------
 # Constantes de mapeamento
 # ---------------------------------------------------------------------------
@@ -101,17 +108,6 @@ NF_REQUEST_STATUS_MAP = {
 # Valores de col 37 que indicam NF validada OK
 NF_VALIDATED_VALUES = {"true", "TRUE", "True"}
 
-# Placeholder de data sem definicao (formula sheets retorna 1899-12-30)
-DATE_PLACEHOLDER = "18991230"
-
-# Cores ANSI
-GREEN = "\033[92m"
-YELLOW = "\033[93m"
-RED = "\033[91m"
-RESET = "\033[0m"
-CYAN = "\033[96m"
-BOLD = "\033[1m"
-
 # Numero de linhas de metadados antes do header real (linhas 0-17 = indices 0 a 17)
 METADATA_ROWS = 18
 
@@ -119,93 +115,24 @@ METADATA_ROWS = 18
 EXPECTED_COLS = 38
 
 
-# ---------------------------------------------------------------------------
-# Utilitarios de log
-# ---------------------------------------------------------------------------
-
-def log(msg: str, level: str = "INFO", verbose: bool = False) -> None:
-    if level == "DEBUG" and not verbose:
-        return
-    now = datetime.now(timezone.utc).strftime("%H:%M:%S")
-    color = {"OK": GREEN, "SKIP": YELLOW, "ERROR": RED, "INFO": CYAN, "DEBUG": RESET}.get(
-        level, RESET
-    )
-    print(f"{color}[{now}] [{level:5s}] {msg}{RESET}")
-
-
-def log_ok(msg: str) -> None:
-    log(msg, "OK")
-
-
-def log_skip(msg: str) -> None:
-    log(msg, "SKIP")
-
-
-def log_error(msg: str) -> None:
-    log(msg, "ERROR")
-
-
-def log_info(msg: str) -> None:
-    log(msg, "INFO")
-
-
-# ---------------------------------------------------------------------------
-# Normalizacao de nome (replica normalize_vendor_name() do PostgreSQL)
-# ---------------------------------------------------------------------------
-
-def normalize_name(name: str) -> str:
-    nfkd = unicodedata.normalize("NFKD", name)
-    ascii_str = "".join(c for c in nfkd if not unicodedata.combining(c))
-    cleaned = re.sub(r"[^a-zA-Z0-9\s\-]", "", ascii_str)
-    return cleaned.lower().strip()
-
-
 # ---------------------------------------------------------------------------
 # Parse de valores monetarios
 # ---------------------------------------------------------------------------
 
 def parse_money(raw: str) -> Optional[float]:
     """
-    Converte string monetaria brasileira para float.
+    Converte string monetaria brasileira para float (todo ponto e milhar).
     Exemplos: "R$  1.000,00" -> 1000.0, " R$  -   " -> None, "400,00" -> 400.0
     """
-    if not raw or not raw.strip():
-        return None
-
-    # Remove R$, espacos extras, BOM chars
-    cleaned = re.sub(r"[R\$\s]", "", raw.strip())
-    # Remove marcador de zero/vazio: " -   " ou "-"
-    if cleaned in ("-", "", "-   ", "–"):
-        return None
-
-    # Remove pontos de milhar e troca virgula decimal por ponto
-    cleaned = cleaned.replace(".", "").replace(",", ".")
-
-    try:
-        value = float(cleaned)
-        return value if value != 0.0 else None
-    except ValueError:
-        return None
+    return parse_brl(raw, dots=DOTS_THOUSANDS)
 
 
 def parse_date(raw: str) -> Optional[str]:
     """
-    Converte data DD/MM/AAAA para ISO (YYYY-MM-DD).
-    Retorna None se vazia ou se for o placeholder 18991230 (sem data).
+    Converte data DD/MM/AAAA (ou serial do Sheets) para ISO (YYYY-MM-DD).
+    Retorna None se vazia, invalida ou se for o placeholder 18991230 (sem data).
     """
-    if not raw or not raw.strip():
-        return None
-
-    # Formato DD/MM/AAAA
-    m = re.match(r"^(\d{1,2})/(\d{1,2})/(\d{4})$", raw.strip())
-    if m:
-        day, month, year = m.groups()
-        # Descarta o placeholder de sem data (1899-12-30)
-        if year == "1899":
-            return None
-        return f"{year}-{month.zfill(2)}-{day.zfill(2)}"
-
-    return None
+    return parse_date_br(raw)
 
 
 def parse_payment_condition(raw: str) -> Optional[str]:
@@ -256,109 +183,47 @@ def safe_col(row: List[str], index: int) -> str:
 
 
 # ---------------------------------------------------------------------------
-# Cliente Supabase REST API
+# Busca de vendors
 # ---------------------------------------------------------------------------
 
-class SupabaseClient:
-    def __init__(self, url: str, key: str):
-        self.base_url = url.rstrip("/")
-        self.headers = {
-            "apikey": key,
-            "Authorization": f"Bearer {key}",
-            "Content-Type": "application/json",
-            "Prefer": "return=representation",
-        }
-
-    def _url(self, table: str) -> str:
-        return f"{self.base_url}/rest/v1/{table}"
-
-    def select(self, table: str, filters: Optional[Dict] = None) -> List[Dict]:
-        resp = requests.get(self._url(table), headers=self.headers, params=filters or {})
-        resp.raise_for_status()
-        return resp.json()
-
-    def insert(self, table: str, data: Dict) -> Dict:
-        resp = requests.post(
-            self._url(table),
-            headers=self.headers,
-            data=json.dumps(data),
-        )
-        resp.raise_for_status()
-        result = resp.json()
-        return result[0] if isinstance(result, list) else result
-
-    def insert_batch(self, table: str, records: List[Dict]) -> List[Dict]:
-        """Insere multiplos registros em uma unica chamada POST."""
-        resp = requests.post(
-            self._url(table),
-            headers=self.headers,
-            data=json.dumps(records),
+def find_vendor_by_name(
+    client: SupabaseRestClient, tenant_id: str, normalized: str
+) -> Optional[Dict]:
+    """Busca vendor por normalized_name."""
+    try:
+        rows = client.select(
+            "vendors",
+            {
+                "tenant_id": f"eq.{tenant_id}",
+                "normalized_name": f"eq.{normalized}",
+                "deleted_at": "is.null",
+                "limit": "1",
+            },
         )
-        resp.raise_for_status()
-        return resp.json()
+        return rows[0] if rows else None
+    except Exception:
+        return None
 
-    def find_vendor_by_name(self, tenant_id: str, normalized: str) -> Optional[Dict]:
-        """Busca vendor por normalized_name."""
-        try:
-            rows = self.select(
-                "vendors",
-                {
-                    "tenant_id": f"eq.{tenant_id}",
-                    "normalized_name": f"eq.{normalized}",
-                    "deleted_at": "is.null",
-                    "limit": "1",
-                },
-            )
-            return rows[0] if rows else None
-        except Exception:
-            return None
-
-    def find_vendor_by_email(self, tenant_id: str, email: str) -> Optional[Dict]:
-        """Busca vendor por email."""
-        if not email:
-            return None
-        try:
-            rows = self.select(
-                "vendors",
-                {
-                    "tenant_id": f"eq.{tenant_id}",
-                    "email": f"eq.{email}",
-                    "deleted_at": "is.null",
-                    "limit": "1",
-                },
-            )
-            return rows[0] if rows else None
-        except Exception:
-            return None
-
-    def check_cost_item_exists(
-        self,
-        tenant_id: str,
-        job_id: str,
-        item_number: int,
-        sub_item_number: int,
-        import_source: str,
-    ) -> bool:
-        """
-        Verifica idempotencia: retorna True se o item ja foi importado.
-        Usa combinacao de job_id + item_number + sub_item_number + import_source.
-        """
-        try:
-            rows = self.select(
-                "cost_items",
-                {
-                    "tenant_id": f"eq.{tenant_id}",
-                    "job_id": f"eq.{job_id}",
-                    "item_number": f"eq.{item_number}",
-                    "sub_item_number": f"eq.{sub_item_number}",
-                    "import_source": f"eq.{import_source}",
-                    "deleted_at": "is.null",
-                    "limit": "1",
-                },
-            )
-            return len(rows) > 0
-        except Exception:
-            return False
+
+def find_vendor_by_email(
+    client: SupabaseRestClient, tenant_id: str, email: str
+) -> Optional[Dict]:
+    """Busca vendor por email."""
+    if not email:
+        return None
+    try:
+        rows = client.select(
+            "vendors",
+            {
+                "tenant_id": f"eq.{tenant_id}",
+                "email": f"eq.{email}",
+                "deleted_at": "is.null",
+                "limit": "1",
+            },
+        )
+        return rows[0] if rows else None
+    except Exception:
+        return None
 
 
 # ---------------------------------------------------------------------------
@@ -366,19 +231,24 @@ class SupabaseClient:
 # ---------------------------------------------------------------------------
 
 def resolve_vendor(
-    client: SupabaseClient,
+    client: SupabaseRestClient,
     tenant_id: str,
     vendor_name: str,
     vendor_email: str,
     verbose: bool,
+    vendor_index: Optional[Dict[str, Dict]] = None,
 ) -> Optional[str]:
     """
     Tenta encontrar vendor_id a partir do nome ou email.
     Retorna UUID do vendor ou None se nao encontrado.
+    Com vendor_index (--lookup-cache) a busca e feita so em memoria.
     """
     if vendor_name:
         normalized = normalize_name(vendor_name)
-        vendor = client.find_vendor_by_name(tenant_id, normalized)
+        if vendor_index is not None:
+            vendor = vendor_index.get(f"name:{normalized}")
+        else:
+            vendor = find_vendor_by_name(client, tenant_id, normalized)
         if vendor:
             log(
                 f"  Vendor '{vendor_name}' encontrado por nome (id={vendor['id'][:8]}...)",
@@ -388,7 +258,10 @@ def resolve_vendor(
             return vendor["id"]
 
     if vendor_email:
-        vendor = client.find_vendor_by_email(tenant_id, vendor_email)
+        if vendor_index is not None:
+            vendor = vendor_index.get(f"email:{vendor_email.strip().lower()}")
+        else:
+            vendor = find_vendor_by_email(client, tenant_id, vendor_email)
         if vendor:
             log(
                 f"  Vendor encontrado por email '{vendor_email}' (id={vendor['id'][:8]}...)",
@@ -407,6 +280,22 @@ def resolve_vendor(
     return None
 
 
+def load_vendor_index(
+    client: SupabaseRestClient, supabase_url: str, tenant_id: str, path: str, refresh: bool
+) -> Dict[str, Dict]:
+    """Atualiza o cache local de vendors do tenant e retorna o indice nome/email."""
+    cache = LookupCache(path, supabase_url, tenant_id)
+    try:
+        if refresh:
+            cache.reset()
+        changed = cache.refresh("vendors", client.select)
+        index = index_vendors(cache.rows("vendors"))
+        log_info(f"Cache de vendors: {len(index)} chaves ({changed} linhas atualizadas) em {path}")
+        return index
+    finally:
+        cache.close()
+
+
 # ---------------------------------------------------------------------------
 # Conversao de linha CSV para payload cost_items
 # ---------------------------------------------------------------------------
@@ -419,10 +308,13 @@ def row_to_payload(
     vendor_id: Optional[str],
     import_source: str,
     verbose: bool,
+    unit_value: Optional[float] = None,
 ) -> Optional[Dict]:
     """
     Converte uma linha de dados do CSV em payload para inserir em cost_items.
     Retorna None se a linha deve ser ignorada (vazia ou invalida).
+    unit_value vem ja convertido da coluna inteira (parse_brl_column em run);
+    sem ele, a col 5 e convertida aqui.
     """
     # Col 2: item_number
     raw_item = safe_col(row, 2)
@@ -454,7 +346,8 @@ def row_to_payload(
         return None
 
     # Col 5: unit_value
-    unit_value = parse_money(safe_col(row, 5))
+    if unit_value is None:
+        unit_value = parse_money(safe_col(row, 5))
 
     # Col 6: quantity
     raw_qty = safe_col(row, 6)
@@ -554,25 +447,9 @@ def row_to_payload(
 
 
 # ---------------------------------------------------------------------------
-# Leitura do CSV
+# Leitura do CSV (csv_io.read_csv com GG_ENCODINGS: latin-1, padrao das GG_)
 # ---------------------------------------------------------------------------
 
-def read_csv(path: str) -> List[List[str]]:
-    """
-    Le CSV com encoding latin-1 (padrao das planilhas GG_).
-    Fallback para utf-8-sig se latin-1 falhar.
-    """
-    for encoding in ("latin-1", "utf-8-sig", "utf-8"):
-        try:
-            with open(path, "rb") as f:
-                raw = f.read().decode(encoding)
-            reader = csv.reader(raw.splitlines())
-            return list(reader)
-        except UnicodeDecodeError:
-            continue
-    raise ValueError(f"Nao foi possivel ler o CSV com encodings latin-1/utf-8-sig/utf-8: {path}")
-
-
 def extract_job_number_from_metadata(rows: List[List[str]]) -> Optional[str]:
     """
     Tenta extrair o numero do job do cabecalho de metadados (linhas 0-17).
@@ -587,6 +464,51 @@ def extract_job_number_from_metadata(rows: List[List[str]]) -> Optional[str]:
     return None
 
 
+def cost_item_callbacks(
+    line_number: int,
+    ledger_line: int,
+    payload: Dict,
+    sync: Optional[SyncRun],
+    counters: Dict[str, int],
+) -> Tuple[Callable[[Optional[str]], None], Callable[[Exception], None], Callable[[Dict], None]]:
+    """
+    Callbacks (sucesso, erro, duplicata) do BulkWriter para um cost_item: log,
+    contadores e marcacao no ledger quando o lote da linha e gravado.
+    """
+    item = f"Item {payload['item_number']}.{payload['sub_item_number']}"
+
+    def on_success(item_id: Optional[str]) -> None:
+        if sync is not None:
+            sync.mark(ledger_line, payload["import_fingerprint"])
+        log_ok(
+            f"Linha {line_number}: {item} '{payload['service_description'][:50]}' "
+            f"criado (id={(item_id or '')[:8]}...)"
+        )
+        counters["created"] += 1
+
+    def on_error(exc: Exception) -> None:
+        if isinstance(exc, requests.HTTPError):
+            body = ""
+            try:
+                body = exc.response.text[:300]
+            except Exception:
+                pass
+            log_error(
+                f"Linha {line_number}: HTTP error ao inserir item: {exc} | response: {body}"
+            )
+        else:
+            log_error(f"Linha {line_number}: excecao inesperada: {exc}")
+        counters["errors"] += 1
+
+    def on_duplicate(_row: Dict) -> None:
+        if sync is not None:
+            sync.mark(ledger_line, payload["import_fingerprint"])
+        log_skip(f"Linha {line_number}: {item} ja importado, pulando")
+        counters["skipped"] += 1
+
+    return on_success, on_error, on_duplicate
+
+
 # ---------------------------------------------------------------------------
 # Fluxo principal
 # ---------------------------------------------------------------------------
@@ -607,7 +529,7 @@ def run(args: argparse.Namespace) -> None:
         sys.exit(1)
 
     log_info(f"Lendo CSV: {args.csv}")
-    rows = read_csv(args.csv)
+    rows = read_csv(args.csv, GG_ENCODINGS)
     log_info(f"Total de linhas no CSV: {len(rows)}")
 
     # Extrai numero do job dos metadados para validacao
@@ -619,7 +541,31 @@ def run(args: argparse.Namespace) -> None:
     data_rows = rows[METADATA_ROWS + 1:]
     log_info(f"Linhas de dados a processar: {len(data_rows)}")
 
-    client = SupabaseClient(supabase_url, service_key)
+    client = SupabaseRestClient(supabase_url, service_key)
+    # Idempotencia: o fingerprint nao depende da data nem do import_source,
+    # entao o banco ignora itens ja importados em qualquer execucao anterior.
+    # No re-sync incremental a linha alterada atualiza o cost_item (merge)
+    writer = BulkWriter(
+        client, "cost_items", args.batch_size,
+        on_conflict=FINGERPRINT_CONFLICT, ignore_duplicates=not args.sync_ledger,
+    )
+    pending: set = set()  # import_fingerprint na fila do writer
+
+    # Re-sync incremental: so as linhas novas ou alteradas desde a ultima execucao
+    # deste CSV neste job; as alteradas atualizam o cost_item (merge)
+    numbered = list(enumerate(data_rows))
+    ledger: Optional[SyncLedger] = None
+    sync: Optional[SyncRun] = None
+    if args.sync_ledger:
+        ledger = SyncLedger(args.sync_ledger, supabase_url, args.tenant_id)
+        source = f"{os.path.abspath(args.csv)}#{args.job_id}"
+        if args.reset_ledger:
+            ledger.reset(source)
+        sync = SyncRun(ledger, source, "cost_items", data_rows)
+        numbered = [(line - 1, row) for line, row in sync.changed]
+        log_info(
+            f"Sync incremental: {len(numbered)} de {len(data_rows)} linhas novas ou alteradas"
+        )
     csv_slug = args.csv.replace("/", "_").replace("\\", "_")[:40]
     import_source = f"migration_{csv_slug}_{datetime.now(timezone.utc).strftime('%Y%m%d')}"
 
@@ -630,12 +576,23 @@ def run(args: argparse.Namespace) -> None:
         "errors": 0,
         "dry_run": 0,
         "category_headers": 0,
+        "tombstones": 0,
     }
 
     # Cache de vendors ja resolvidos (normalized_name -> vendor_id) para evitar N+1
     vendor_cache: Dict[str, Optional[str]] = {}
+    vendor_index: Optional[Dict[str, Dict]] = None
+    if args.lookup_cache:
+        vendor_index = load_vendor_index(
+            client, supabase_url, args.tenant_id, args.lookup_cache, args.refresh_cache
+        )
+
+    # Col 5 (valor unitario) convertida de uma vez: poucos valores distintos
+    unit_values, unit_mask = parse_brl_column(
+        (safe_col(row, 5) for _, row in numbered), dots=DOTS_THOUSANDS
+    )
 
-    for line_offset, row in enumerate(data_rows):
+    for index, (line_offset, row) in enumerate(numbered):
         line_number = line_offset + METADATA_ROWS + 2  # numero real da linha no arquivo
 
         # Pula linhas completamente vazias
@@ -657,6 +614,7 @@ def run(args: argparse.Namespace) -> None:
                         vendor_name_raw,
                         vendor_email_raw,
                         args.verbose,
+                        vendor_index,
                     )
                 vendor_id = vendor_cache[cache_key]
 
@@ -669,6 +627,7 @@ def run(args: argparse.Namespace) -> None:
                 vendor_id,
                 import_source,
                 args.verbose,
+                unit_values[index] if unit_mask[index] else None,
             )
 
             if payload is None:
@@ -696,42 +655,47 @@ def run(args: argparse.Namespace) -> None:
                 counters["dry_run"] += 1
                 continue
 
-            # Idempotencia: verifica se ja foi importado
-            if client.check_cost_item_exists(
-                args.tenant_id,
-                args.job_id,
-                item_number,
-                sub_item_number,
-                import_source,
-            ):
-                log_skip(
-                    f"Linha {line_number}: Item {item_number}.{sub_item_number} ja importado, pulando"
-                )
-                counters["skipped"] += 1
-                continue
-
-            # Insere no banco
-            inserted = client.insert("cost_items", payload)
-            log_ok(
-                f"Linha {line_number}: Item {item_number}.{sub_item_number} "
-                f"'{service_desc[:50]}' criado (id={inserted['id'][:8]}...)"
+            fingerprint = cost_item_fingerprint(
+                args.job_id, item_number, sub_item_number, service_desc
             )
-            counters["created"] += 1
-
-        except requests.HTTPError as exc:
-            body = ""
-            try:
-                body = exc.response.text[:300]
-            except Exception:
-                pass
-            log_error(
-                f"Linha {line_number}: HTTP error ao inserir item: {exc} | response: {body}"
+            payload["import_fingerprint"] = fingerprint
+            if sync is not None:
+                sync.touch(fingerprint)
+            if fingerprint in pending:
+                # Mesmo item repetido no CSV: o lote anterior vai antes, como
+                # no envio linha a linha (um upsert nao toca a mesma linha duas vezes)
+                writer.flush()
+                pending.clear()
+            pending.add(fingerprint)
+            writer.add(
+                payload,
+                *cost_item_callbacks(
+                    line_number, line_offset + 1, payload, sync, counters
+                ),
             )
-            counters["errors"] += 1
+
         except Exception as exc:
             log_error(f"Linha {line_number}: excecao inesperada: {exc}")
             counters["errors"] += 1
 
+    writer.flush()
+
+    if sync is not None and not args.dry_run:
+        removed = sync.finish()
+        if removed and args.tombstones:
+            try:
+                counters["tombstones"] = tombstone(
+                    client.update, "cost_items", args.tenant_id, removed
+                )
+                log_ok(f"{len(removed)} itens que sairam do CSV removidos (soft delete)")
+            except requests.RequestException as exc:
+                log_error(f"Falha ao aplicar tombstones: {exc}")
+                counters["errors"] += 1
+        elif removed:
+            log_info(f"{len(removed)} itens sairam do CSV (mantidos; use --tombstones)")
+    if ledger is not None:
+        ledger.close()
+
     # Relatorio final
     print()
     print(f"{BOLD}{'=' * 60}{RESET}")
@@ -749,12 +713,18 @@ def run(args: argparse.Namespace) -> None:
         print(f"{GREEN}  Cost items criados:         {counters['created']}{RESET}")
         print(f"  Cabecalhos de categoria:    {counters['category_headers']}")
         print(f"{YELLOW}  Itens ja existentes (skip): {counters['skipped']}{RESET}")
+        if sync is not None:
+            print(f"  Linhas inalteradas:         {len(data_rows) - len(sync.changed)}")
+            print(f"  Tombstones:                 {counters['tombstones']}")
         print(f"{RED}  Linhas com erro:            {counters['errors']}{RESET}")
+        for label, value in client.stats_lines():
+            print(f"  {label + ':':<28}{value}")
     print()
     print(
         f"  Para rollback: DELETE FROM cost_items WHERE import_source = '{import_source}'"
     )
     print(f"{'=' * 60}")
+    client.close()
 
 
 # ---------------------------------------------------------------------------
@@ -793,9 +763,62 @@ def main() -> None:
         action="store_true",
         help="Exibe logs detalhados (DEBUG) incluindo linhas ignoradas",
     )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=DEFAULT_BATCH_ROWS,
+        dest="batch_size",
+        help=f"Cost items por UPSERT em lote (padrao: {DEFAULT_BATCH_ROWS})",
+    )
+    parser.add_argument(
+        "--lookup-cache",
+        nargs="?",
+        const=LookupCache.default_path(),
+        default=None,
+        dest="lookup_cache",
+        metavar="ARQUIVO",
+        help=(
+            "Resolve vendors por um cache SQLite local atualizado de forma incremental "
+            "(padrao: $LOOKUP_CACHE_PATH ou ~/.cache/ellahos/lookup_cache.sqlite)"
+        ),
+    )
+    parser.add_argument(
+        "--refresh-cache",
+        action="store_true",
+        dest="refresh_cache",
+        help="Descarta o cache de lookups do tenant e baixa tudo de novo",
+    )
+    parser.add_argument(
+        "--sync-ledger",
+        nargs="?",
+        const=SyncLedger.default_path(),
+        default=None,
+        dest="sync_ledger",
+        metavar="ARQUIVO",
+        help=(
+            "Re-sync incremental: envia so as linhas novas ou alteradas desde a ultima "
+            "execucao deste CSV/job (padrao: $SYNC_LEDGER_PATH ou "
+            "~/.cache/ellahos/sync_ledger.sqlite)"
+        ),
+    )
+    parser.add_argument(
+        "--tombstones",
+        action="store_true",
+        help="Com --sync-ledger: soft delete dos itens cujas linhas sairam do CSV",
+    )
+    parser.add_argument(
+        "--reset-ledger",
+        action="store_true",
+        dest="reset_ledger",
+        help="Esquece as linhas ja sincronizadas deste CSV/job (envia tudo de novo)",
+    )
 
     args = parser.parse_args()
 
+    if (args.tombstones or args.reset_ledger) and not args.sync_ledger:
+        log_error("--tombstones e --reset-ledger exigem --sync-ledger.")
+        sys.exit(1)
+
     if not os.path.isfile(args.csv):
         log_error(f"Arquivo nao encontrado: {args.csv}")
         sys.exit(1)
@@ -0,0 +1,60 @@
+"""
+Log colorido (ANSI) dos scripts de migracao: "[HH:MM:SS] [NIVEL] mensagem".
+
+DEBUG so aparece com set_verbose(True) (--verbose) ou com verbose=True na
+chamada (forma usada pelos scripts que passam args.verbose adiante).
+
+Compartilhado por migrate_sheets_data.py e pelos scripts de scripts/migration/.
+"""
+
+from datetime import datetime, timezone
+
+GREEN  = "\033[92m"
+YELLOW = "\033[93m"
+RED    = "\033[91m"
+CYAN   = "\033[96m"
+BOLD   = "\033[1m"
+RESET  = "\033[0m"
+
+_LEVEL_COLORS = {
+    "OK":    GREEN,
+    "SKIP":  YELLOW,
+    "ERROR": RED,
+    "INFO":  CYAN,
+    "WARN":  YELLOW,
+    "DEBUG": RESET,
+}
+
+_verbose = False
+
+
+def set_verbose(enabled: bool) -> None:
+    """Liga/desliga as mensagens DEBUG do processo."""
+    global _verbose
+    _verbose = enabled
+
+
+def log(msg: str, level: str = "INFO", verbose: bool = False) -> None:
+    """Imprime mensagem com timestamp (UTC) e cor conforme o nivel."""
+    if level == "DEBUG" and not (verbose or _verbose):
+        return
+    now = datetime.now(timezone.utc).strftime("%H:%M:%S")
+    color = _LEVEL_COLORS.get(level, RESET)
+    print(f"{color}[{now}] [{level:5s}] {msg}{RESET}", flush=True)
+
+
+def log_ok(msg: str)    -> None: log(msg, "OK")
+def log_skip(msg: str)  -> None: log(msg, "SKIP")
+def log_error(msg: str) -> None: log(msg, "ERROR")
+def log_info(msg: str)  -> None: log(msg, "INFO")
+def log_warn(msg: str)  -> None: log(msg, "WARN")
+def log_debug(msg: str) -> None: log(msg, "DEBUG")
+
+
+def format_bytes(size: int) -> str:
+    """Formata bytes para leitura humana (B, KB, MB)."""
+    if size < 1024:
+        return f"{size} B"
+    if size < 1024 * 1024:
+        return f"{size / 1024:.1f} KB"
+    return f"{size / (1024 * 1024):.1f} MB"
@@ -0,0 +1,219 @@
+"""
+Cache local (SQLite) das tabelas de lookup usadas pelos importadores.
+
+vendors, bank_accounts, clients, agencies e jobs sao baixados uma vez por
+(projeto Supabase, tenant) e depois atualizados de forma incremental: cada
+refresh le so as linhas com updated_at >= ultima marca (menos uma janela de
+seguranca para transacoes que commitaram atrasadas), paginando por keyset
+(updated_at, id). Todas as tabelas tem trigger de updated_at, entao soft
+deletes e merges de vendors chegam como atualizacoes (deleted_at preenchido).
+DELETEs fisicos nao sao vistos — use LookupCache.reset() (ou --refresh-cache
+nos scripts) para recarregar tudo.
+
+Uso:
+    cache = LookupCache(LookupCache.default_path(), supabase_url, tenant_id)
+    cache.refresh("vendors", fetch)   # fetch(table, params) -> List[Dict]
+    for row in cache.rows("vendors"):
+        ...
+
+Compartilhado por migrate_sheets_data.py, import_job_finances.py e import_equipe.py.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Colunas guardadas por tabela (updated_at e deleted_at sao sempre incluidas)
+LOOKUP_COLUMNS: Dict[str, str] = {
+    "vendors":       "id,full_name,normalized_name,email,cpf,cnpj",
+    "bank_accounts": "id,vendor_id,pix_key,is_primary",
+    "clients":       "id,name",
+    "agencies":      "id,name",
+    "jobs":          "id,code,title",
+}
+
+# Janela re-lida a cada refresh: cobre transacoes longas cujo updated_at
+# (now() do inicio da transacao) ficou antes da marca gravada
+DEFAULT_OVERLAP = timedelta(minutes=5)
+DEFAULT_PAGE_SIZE = 1000
+
+Fetch = Callable[[str, Dict[str, str]], List[Dict[str, Any]]]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS lookup_rows (
+    scope      TEXT NOT NULL,
+    tbl        TEXT NOT NULL,
+    id         TEXT NOT NULL,
+    deleted    INTEGER NOT NULL DEFAULT 0,
+    data       TEXT NOT NULL,
+    PRIMARY KEY (scope, tbl, id)
+);
+CREATE TABLE IF NOT EXISTS lookup_watermarks (
+    scope      TEXT NOT NULL,
+    tbl        TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    synced_at  REAL NOT NULL,
+    PRIMARY KEY (scope, tbl)
+);
+"""
+
+
+def _parse_ts(value: str) -> datetime:
+    """Le timestamps do PostgREST (fracao de segundo com 0-6 digitos, Z ou +00:00)."""
+    value = value.replace("Z", "+00:00").replace(" ", "T")
+    head, sep, frac = value.partition(".")
+    if sep:
+        digits = "".join(c for c in frac if c.isdigit())
+        tz = frac[len(digits):]
+        value = f"{head}.{digits[:6].ljust(6, '0')}{tz}"
+    return datetime.fromisoformat(value)
+
+
+class LookupCache:
+    """Tabelas de lookup de um tenant, persistidas em SQLite."""
+
+    def __init__(
+        self,
+        path: str,
+        base_url: str,
+        tenant_id: str,
+        overlap: timedelta = DEFAULT_OVERLAP,
+        page_size: int = DEFAULT_PAGE_SIZE,
+    ) -> None:
+        self.path = path
+        self.scope = f"{base_url.rstrip('/')}|{tenant_id}"
+        self.tenant_id = tenant_id
+        self.overlap = overlap
+        self.page_size = page_size
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.executescript(_SCHEMA)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+
+    @staticmethod
+    def default_path() -> str:
+        """LOOKUP_CACHE_PATH ou ~/.cache/ellahos/lookup_cache.sqlite."""
+        return os.environ.get("LOOKUP_CACHE_PATH") or os.path.join(
+            os.path.expanduser("~"), ".cache", "ellahos", "lookup_cache.sqlite"
+        )
+
+    def close(self) -> None:
+        self._db.close()
+
+    # -- leitura ---------------------------------------------------------------
+
+    def rows(self, table: str, include_deleted: bool = False) -> List[Dict[str, Any]]:
+        """Linhas em cache da tabela (por padrao sem as soft-deletadas)."""
+        sql = "SELECT data FROM lookup_rows WHERE scope = ? AND tbl = ?"
+        if not include_deleted:
+            sql += " AND deleted = 0"
+        with self._lock:
+            cur = self._db.execute(sql, (self.scope, table))
+            return [json.loads(data) for (data,) in cur]
+
+    def watermark(self, table: str) -> Optional[str]:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT updated_at FROM lookup_watermarks WHERE scope = ? AND tbl = ?",
+                (self.scope, table),
+            ).fetchone()
+        return row[0] if row else None
+
+    # -- escrita ---------------------------------------------------------------
+
+    def reset(self, table: Optional[str] = None) -> None:
+        """Descarta o cache (de uma tabela ou de todas) deste tenant."""
+        with self._lock, self._db:
+            for name in ("lookup_rows", "lookup_watermarks"):
+                if table is None:
+                    self._db.execute(f"DELETE FROM {name} WHERE scope = ?", (self.scope,))
+                else:
+                    self._db.execute(
+                        f"DELETE FROM {name} WHERE scope = ? AND tbl = ?", (self.scope, table)
+                    )
+
+    def refresh(self, table: str, fetch: Fetch) -> int:
+        """
+        Traz do banco as linhas alteradas desde a ultima marca e grava no cache.
+        Na primeira execucao baixa a tabela inteira. Retorna o numero de linhas lidas.
+        """
+        columns = f"{LOOKUP_COLUMNS[table]},updated_at,deleted_at"
+        base: Dict[str, str] = {
+            "select": columns,
+            "tenant_id": f"eq.{self.tenant_id}",
+            "order": "updated_at.asc,id.asc",
+            "limit": str(self.page_size),
+        }
+        mark = self.watermark(table)
+        if mark is not None:
+            since = (_parse_ts(mark) - self.overlap).isoformat(timespec="microseconds")
+            base["updated_at"] = f"gte.{since}"
+
+        total = 0
+        newest: Optional[Tuple[datetime, str]] = None
+        cursor: Optional[Tuple[str, str]] = None
+        while True:
+            params = dict(base)
+            if cursor is not None:
+                ts, last_id = cursor
+                params.pop("updated_at", None)
+                params["or"] = f'(updated_at.gt."{ts}",and(updated_at.eq."{ts}",id.gt.{last_id}))'
+            page = fetch(table, params)
+            if not page:
+                break
+            self._store(table, page)
+            total += len(page)
+            last = page[-1]
+            cursor = (last["updated_at"], last["id"])
+            parsed = _parse_ts(last["updated_at"])
+            if newest is None or parsed > newest[0]:
+                newest = (parsed, last["updated_at"])
+
+        if newest is not None:
+            with self._lock, self._db:
+                self._db.execute(
+                    "INSERT INTO lookup_watermarks (scope, tbl, updated_at, synced_at) "
+                    "VALUES (?, ?, ?, ?) ON CONFLICT (scope, tbl) DO UPDATE SET "
+                    "updated_at = excluded.updated_at, synced_at = excluded.synced_at",
+                    (self.scope, table, newest[1], time.time()),
+                )
+        return total
+
+    def _store(self, table: str, page: List[Dict[str, Any]]) -> None:
+        with self._lock, self._db:
+            self._db.executemany(
+                "INSERT INTO lookup_rows (scope, tbl, id, deleted, data) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT (scope, tbl, id) DO UPDATE SET "
+                "deleted = excluded.deleted, data = excluded.data",
+                [
+                    (self.scope, table, r["id"], 1 if r.get("deleted_at") else 0,
+                     json.dumps(r, separators=(",", ":")))
+                    for r in page
+                ],
+            )
+
+    def load(self, table: str, fetch: Fetch) -> List[Dict[str, Any]]:
+        """refresh() seguido de rows(): atalho usado no aquecimento dos caches."""
+        self.refresh(table, fetch)
+        return self.rows(table)
+
+
+def index_vendors(rows: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """
+    Indice dos vendors em cache para os importadores de scripts/migration:
+    "name:<normalized_name>" e "email:<email em minusculas>" -> linha do vendor.
+    """
+    index: Dict[str, Dict[str, Any]] = {}
+    for row in rows:
+        if row.get("normalized_name"):
+            index.setdefault(f"name:{row['normalized_name']}", row)
+        if row.get("email"):
+            index.setdefault(f"email:{row['email'].strip().lower()}", row)
+    return index
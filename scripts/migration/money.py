@@ -0,0 +1,93 @@
+"""
+Parse de valores monetarios em reais (BRL) das planilhas, uma celula ou uma
+coluna inteira de uma vez.
+
+Semantica (a mesma do parse_brl original de migrate_sheets_data.py):
+  - "R", "$" e qualquer espaco (inclusive NBSP) sao descartados;
+  - vazio, "-", "–", "—" ou so tracos -> None (a planilha usa "R$ -" para zero);
+  - com virgula: pontos sao milhar e a virgula e o decimal ("1.000,50" -> 1000.5);
+  - sem virgula (dots="auto"): um ultimo ponto seguido de exatamente 3 digitos e
+    milhar ("50.000" -> 50000.0), senao e decimal ("12.5" -> 12.5);
+  - dots="thousands": todo ponto e milhar, como o parse_money de
+    import_job_finances.py ("12.5" -> 125.0);
+  - zero ou texto que nao vira float -> None.
+
+parse_brl_column processa a coluna inteira: cada texto distinto e convertido uma
+vez so (colunas de custo repetem muito "R$ -" e valores de diaria) e a limpeza e
+um unico str.translate, sem regex. Devolve um array('d') e uma mascara de
+validade (1 = valor presente), com 0.0 nas posicoes invalidas.
+
+Compartilhado por migrate_sheets_data.py, import_job_finances.py e parse_custos_csv.py.
+Paridade com as versoes antigas: scripts/bench_brl_parsing.py.
+"""
+
+from array import array
+from typing import Dict, Iterable, Optional, Tuple
+
+DOTS_AUTO = "auto"
+DOTS_THOUSANDS = "thousands"
+
+# Mesmo conjunto do \s do re em str (str.isspace): ASCII, NBSP, espacos finos etc.
+_WHITESPACE = (
+    "\t\n\x0b\x0c\r\x1c\x1d\x1e\x1f \x85\xa0\u1680"
+    "\u2000\u2001\u2002\u2003\u2004\u2005\u2006\u2007\u2008\u2009\u200a"
+    "\u2028\u2029\u202f\u205f\u3000"
+)
+_STRIP_CURRENCY = str.maketrans("", "", "R$" + _WHITESPACE)
+
+_DASHES = ("-", "–", "—")
+
+
+def _parse_stripped(v: str, dots: str) -> Optional[float]:
+    """Converte o texto ja sem R, $ e espacos."""
+    if not v or v in _DASHES or not v.replace("-", ""):
+        return None
+    if dots == DOTS_THOUSANDS or "," in v:
+        v = v.replace(".", "").replace(",", ".")
+    else:
+        dot_idx = v.rfind(".")
+        if dot_idx != -1 and len(v) - dot_idx - 1 == 3:
+            v = v.replace(".", "")
+    try:
+        f = float(v)
+    except ValueError:
+        return None
+    return f if f != 0.0 else None
+
+
+def parse_brl(value: Optional[str], dots: str = DOTS_AUTO) -> Optional[float]:
+    """
+    Converte string de moeda brasileira para float.
+    Aceita: 'R$ 1.000,00', '1.000,00', '1000', '50.000,00'.
+    Retorna None se invalido ou zero.
+    """
+    if not value:
+        return None
+    return _parse_stripped(value.translate(_STRIP_CURRENCY), dots)
+
+
+def parse_brl_column(
+    values: Iterable[Optional[str]], dots: str = DOTS_AUTO
+) -> Tuple["array[float]", bytearray]:
+    """
+    Converte uma coluna inteira. Retorna (valores, mascara): valores[i] e o
+    parse_brl(values[i]) quando mascara[i] == 1, e 0.0 quando e None.
+    """
+    parsed: Dict[str, Optional[float]] = {}
+    out = array("d")
+    mask = bytearray()
+    for value in values:
+        if not value:
+            f = None
+        else:
+            try:
+                f = parsed[value]
+            except KeyError:
+                f = parsed[value] = _parse_stripped(value.translate(_STRIP_CURRENCY), dots)
+        if f is None:
+            out.append(0.0)
+            mask.append(0)
+        else:
+            out.append(f)
+            mask.append(1)
+    return out, mask
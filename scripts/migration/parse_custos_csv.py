@@ -14,9 +14,14 @@ import csv
 import re
 import os
 import json
-import unicodedata
 from pathlib import Path
 
+from csv_io import read_csv, read_text
+from dates import parse_date_br
+from documents import classify_document
+from money import parse_brl as parse_brl_float
+from text import fold_text
+
 # ---------------------------------------------------------------------------
 # Config
 # ---------------------------------------------------------------------------
@@ -39,71 +44,25 @@ MAX_CHUNK_BYTES = 14_000
 # Helpers
 # ---------------------------------------------------------------------------
 def normalize(s: str) -> str:
-    """Lowercase, strip accents, collapse whitespace."""
-    if not s:
-        return ''
-    s = s.strip()
-    # Remove accents
-    s = unicodedata.normalize('NFKD', s)
-    s = ''.join(c for c in s if not unicodedata.combining(c))
-    # Lowercase and collapse spaces
-    s = re.sub(r'\s+', ' ', s).lower().strip()
-    return s
+    """Lowercase, strip accents, collapse whitespace (text.fold_text)."""
+    return fold_text(s)
 
 
 def parse_brl(value: str):
     """
     Convert Brazilian currency string to Decimal string or None.
-    Handles: 'R$ 1.000,00', '1.000,00', '1000', '$50.000,00', etc.
+    Handles: 'R$ 1.000,00', '1.000,00', '1000', '$50.000,00', etc. (money.parse_brl)
     Returns: '1000.00' or None
     """
-    if not value:
-        return None
-    v = value.strip()
-    # Remove currency symbols
-    v = re.sub(r'[R\$\s]', '', v)
-    if not v or v in ('-', '–', '—'):
-        return None
-    # Detect if value is effectively zero
-    # Pattern: '-  ' or '  -  ' after stripping
-    v_clean = re.sub(r'[\s-]', '', v)
-    if not v_clean:
-        return None
-    # Remove thousand separators (dots before a comma-decimal or 3-digit groups)
-    # Brazilian: 1.234.567,89
-    # Remove dots used as thousands sep
-    if ',' in v:
-        # dots are thousands separators, comma is decimal
-        v = v.replace('.', '').replace(',', '.')
-    else:
-        # No comma — dots could be decimal (rare) or thousands
-        # If there's exactly one dot with more than 2 digits after, treat as thousands
-        dot_idx = v.rfind('.')
-        if dot_idx != -1:
-            after = v[dot_idx + 1:]
-            if len(after) == 3:
-                # likely thousands separator (no decimal part)
-                v = v.replace('.', '')
-            # else treat as decimal point
-    try:
-        f = float(v)
-        if f == 0.0:
-            return None
-        return f'{f:.2f}'
-    except ValueError:
+    f = parse_brl_float(value)
+    if f is None:
         return None
+    return f'{f:.2f}'
 
 
 def parse_date(value: str):
-    """Parse DD/MM/YYYY -> YYYY-MM-DD, or None."""
-    if not value:
-        return None
-    v = value.strip()
-    m = re.match(r'^(\d{1,2})/(\d{1,2})/(\d{4})$', v)
-    if m:
-        day, month, year = m.groups()
-        return f'{year}-{month.zfill(2)}-{day.zfill(2)}'
-    return None
+    """Parse DD/MM/YYYY -> YYYY-MM-DD, or None (dates.parse_date_br)."""
+    return parse_date_br(value)
 
 
 def sql_str(value):
@@ -142,58 +101,35 @@ def parse_equipe_csv(filepath: str) -> list:
     col3: pix_key (CNPJ, CPF, email, phone, or UUID)
     """
     rows = []
-    with open(filepath, encoding='utf-8-sig', errors='replace') as f:
-        reader = csv.reader(f)
-        for line in reader:
-            if not line or not line[0].strip():
-                continue
-            cols = line + [''] * 4  # pad to at least 4 cols
-            name      = cols[0].strip()
-            email     = cols[1].strip()
-            bank_name = cols[2].strip()
-            pix_key   = cols[3].strip()
+    for line in read_csv(filepath):
+        if not line or not line[0].strip():
+            continue
+        cols = line + [''] * 4  # pad to at least 4 cols
+        name      = cols[0].strip()
+        email     = cols[1].strip()
+        bank_name = cols[2].strip()
+        pix_key   = cols[3].strip()
 
-            if not name or name.lower() in ('nome', 'name'):
-                continue
-            # Skip obvious garbage
-            if '@' in name and len(name) < 40 and '.' in name:
-                # Looks like an email was put in name field — skip
-                continue
+        if not name or name.lower() in ('nome', 'name'):
+            continue
+        # Skip obvious garbage
+        if '@' in name and len(name) < 40 and '.' in name:
+            # Looks like an email was put in name field — skip
+            continue
 
-            rows.append({
-                'name': name,
-                'email': email,
-                'bank_name': bank_name,
-                'pix_key': pix_key,
-            })
+        rows.append({
+            'name': name,
+            'email': email,
+            'bank_name': bank_name,
+            'pix_key': pix_key,
+        })
     return rows
 
 
 def classify_pix_key(pix_key: str):
-    """Classify PIX key type."""
-    if not pix_key or pix_key.strip() == '':
-        return None, None
-    k = pix_key.strip()
-    # UUID
-    if re.match(r'^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$', k, re.I):
-        return k, 'chave_aleatoria'
-    # Email
-    if re.match(r'^[^@\s]+@[^@\s]+\.[^@\s]+$', k):
-        return k, 'email'
-    # CNPJ: 14 digits (may have punctuation)
-    digits = re.sub(r'\D', '', k)
-    if len(digits) == 14:
-        return digits, 'cnpj'
-    # CPF: 11 digits
-    if len(digits) == 11:
-        return digits, 'cpf'
-    # Phone: 10-11 digits
-    if 10 <= len(digits) <= 13:
-        return digits, 'telefone'
-    # Could still be a partial text — store as-is with unknown type
-    if k and len(k) > 2:
-        return k, 'outro'
-    return None, None
+    """Classify PIX key type (documents.py). Unrecognized text keeps the key with type None."""
+    doc = classify_document(pix_key)
+    return doc.pix_key, doc.pix_key_type
 
 
 # ---------------------------------------------------------------------------
@@ -263,11 +199,8 @@ def parse_custos_csv(filepath: str, job_code: int) -> list:
     """
     rows_out = []
 
-    with open(filepath, encoding='utf-8-sig', errors='replace') as f:
-        content = f.read()
-
     # Split into lines
-    lines = content.splitlines()
+    lines = read_text(filepath).splitlines()
 
     # Find header row (row 19 in 1-indexed = index 18)
     # Confirm by looking for 'ID' at start
@@ -0,0 +1,1032 @@
+# -*- coding: utf-8 -*-
+"""
+Cliente REST do Supabase (PostgREST + Edge Functions) usado por todos os
+scripts de migração, com service_role (ignora RLS).
+
+  SupabaseRestClient       pool de sessões keep-alive (SessionPool), timeout
+                           em toda requisição, retentativas com backoff e
+                           Retry-After (RetryPolicy), limite adaptativo de
+                           requisições simultâneas (AdaptiveLimiter), gzip
+                           opcional, leitura paginada por keyset, escrita em
+                           lote (insert_many/upsert_many) e contadores de
+                           tráfego/pool (stats_lines)
+  BulkWriter               buffer de escritas em lote com callbacks por linha
+  AsyncSupabaseRestClient  variante asyncio (migrate_sheets_data.py --async)
+
+Compartilhado por migrate_sheets_data.py, import_equipe.py,
+import_job_finances.py e dedup_vendors.py.
+"""
+
+import asyncio
+import gzip
+import json
+import queue
+import random
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from email.utils import parsedate_to_datetime
+from functools import partial
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Dependência opcional: orjson (codec JSON mais rápido; fallback para stdlib)
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore[assignment]
+
+try:
+    from .log import format_bytes, log_debug, log_warn
+except ImportError:  # executado de dentro de scripts/migration/
+    from log import format_bytes, log_debug, log_warn
+
+# Pool de conexões HTTP: número de sessões keep-alive e conexões por host
+DEFAULT_POOL_SIZE: int = 4
+DEFAULT_MAX_CONN_PER_HOST: int = 10
+DEFAULT_TIMEOUT: int = 30
+
+# Escrita em lote: limites por requisição (linhas e bytes do JSON serializado)
+DEFAULT_BATCH_ROWS: int = 500
+DEFAULT_BATCH_BYTES: int = 2_000_000
+
+# Modo assíncrono (--async): linhas processadas simultaneamente por etapa
+DEFAULT_CONCURRENCY: int = 16
+
+# Retentativas: backoff exponencial com jitter (segundos) e status transitórios.
+# 429/503 indicam que o pedido não foi processado → seguros para qualquer método;
+# 502/504 e erros de conexão só são repetidos em chamadas idempotentes.
+DEFAULT_MAX_RETRIES: int = 5
+DEFAULT_RETRY_BASE_DELAY: float = 0.5
+DEFAULT_RETRY_MAX_DELAY: float = 30.0
+THROTTLE_STATUSES = frozenset({429, 503})
+GATEWAY_STATUSES = frozenset({502, 504})
+
+# Leitura paginada: linhas por página em select_iter (o max-rows padrão do
+# Supabase é 1000; páginas menores que o pedido são tratadas normalmente)
+DEFAULT_PAGE_SIZE: int = 1000
+
+# Compressão (--compress): corpos de requisição a partir deste tamanho vão em gzip
+DEFAULT_COMPRESS_THRESHOLD: int = 1024
+COMPRESS_LEVEL: int = 6
+
+# Retorno das escritas: colunas para `select=` ou "minimal" (Prefer: return=minimal,
+# o PostgREST responde 201 sem corpo)
+DEFAULT_RETURNING: str = "id"
+RETURN_MINIMAL: str = "minimal"
+
+
+# ===========================================================================
+# Codecs JSON (serialização dos corpos REST)
+# ===========================================================================
+
+def _json_default(value: Any) -> Any:
+    """
+    Tipos não-JSON usados nos payloads: Decimal como número (até 15 dígitos,
+    exatos em float; acima disso vai como string, que o numeric também aceita),
+    UUID como string e date/datetime em ISO 8601.
+    """
+    if isinstance(value, Decimal):
+        text = str(value)
+        if value.is_finite() and "E" not in text and len(text.lstrip("-").replace(".", "", 1)) <= 15:
+            return float(text)
+        return text
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Tipo não serializável em JSON: {type(value).__name__}")
+
+
+class JsonCodec:
+    """Codec da biblioteca padrão, sem espaços entre separadores."""
+
+    name = "json"
+
+    def dumps(self, value: Any) -> bytes:
+        # ensure_ascii (padrão) é mais rápido no encoder C que emitir UTF-8
+        return json.dumps(value, default=_json_default, separators=(",", ":")).encode("ascii")
+
+    def loads(self, data: bytes) -> Any:
+        return json.loads(data)
+
+
+class OrjsonCodec(JsonCodec):
+    """Codec orjson: date, datetime e UUID nativos; Decimal via _json_default."""
+
+    name = "orjson"
+
+    def dumps(self, value: Any) -> bytes:
+        return orjson.dumps(value, default=_json_default)
+
+    def loads(self, data: bytes) -> Any:
+        return orjson.loads(data)
+
+
+JSON_CODECS: Dict[str, Callable[[], JsonCodec]] = {
+    "json":   JsonCodec,
+    "orjson": OrjsonCodec,
+}
+
+
+def get_json_codec(name: str = "auto") -> JsonCodec:
+    """Resolve o codec pelo nome; "auto" usa orjson se instalado, senão stdlib."""
+    if name == "auto":
+        name = "orjson" if orjson is not None else "json"
+    if name == "orjson" and orjson is None:
+        raise ValueError("Codec 'orjson' indisponível. Execute: pip install orjson")
+    if name not in JSON_CODECS:
+        raise ValueError(f"Codec JSON desconhecido: {name}")
+    return JSON_CODECS[name]()
+
+
+class SessionPool:
+    """
+    Pool thread-safe de requests.Session reutilizáveis.
+    Cada sessão mantém conexões TCP+TLS abertas (keep-alive) com o PostgREST,
+    evitando um handshake novo a cada linha importada.
+    """
+
+    def __init__(
+        self,
+        size: int = DEFAULT_POOL_SIZE,
+        max_conn_per_host: int = DEFAULT_MAX_CONN_PER_HOST,
+        keep_alive: bool = True,
+    ) -> None:
+        self.size = max(1, size)
+        self.max_conn_per_host = max(1, max_conn_per_host)
+        self.keep_alive = keep_alive
+        self._idle: "queue.LifoQueue[requests.Session]" = queue.LifoQueue()
+        self._sessions: List[requests.Session] = []
+        self._lock = threading.Lock()
+        self._requests = 0
+        self._waits = 0
+
+    def _new_session(self) -> requests.Session:
+        sess = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=self.max_conn_per_host,
+            pool_block=True,
+        )
+        sess.mount("https://", adapter)
+        sess.mount("http://", adapter)
+        if not self.keep_alive:
+            sess.headers["Connection"] = "close"
+        return sess
+
+    def _acquire(self) -> requests.Session:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if len(self._sessions) < self.size:
+                sess = self._new_session()
+                self._sessions.append(sess)
+                return sess
+            self._waits += 1
+        return self._idle.get()
+
+    @contextmanager
+    def session(self) -> Iterator[requests.Session]:
+        """Empresta uma sessão do pool e a devolve ao final do bloco."""
+        sess = self._acquire()
+        with self._lock:
+            self._requests += 1
+        try:
+            yield sess
+        finally:
+            self._idle.put(sess)
+
+    def stats(self) -> Dict[str, int]:
+        """Contadores do pool: sessões, requisições, esperas e conexões abertas."""
+        connections = 0
+        adapters = {
+            id(a): a for sess in list(self._sessions) for a in sess.adapters.values()
+        }
+        for adapter in adapters.values():
+            pools = getattr(getattr(adapter, "poolmanager", None), "pools", None)
+            if pools is None:
+                continue
+            for key in list(pools.keys()):
+                pool = pools.get(key)
+                connections += getattr(pool, "num_connections", 0) if pool else 0
+        with self._lock:
+            return {
+                "sessions":            len(self._sessions),
+                "requests":            self._requests,
+                "waits":               self._waits,
+                "connections_opened":  connections,
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            for sess in self._sessions:
+                sess.close()
+            self._sessions.clear()
+        while not self._idle.empty():
+            self._idle.get_nowait()
+
+
+class RetryPolicy:
+    """
+    Decide se uma requisição falha deve ser repetida e quanto esperar.
+    Backoff exponencial com "full jitter" (uniforme entre 0 e base·2^tentativa,
+    limitado a max_delay); se o servidor mandar Retry-After, ele prevalece.
+    """
+
+    def __init__(
+        self,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        base_delay: float = DEFAULT_RETRY_BASE_DELAY,
+        max_delay: float = DEFAULT_RETRY_MAX_DELAY,
+    ) -> None:
+        self.max_retries = max(0, max_retries)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def should_retry_status(self, status: int, idempotent: bool) -> bool:
+        if status in THROTTLE_STATUSES:
+            return True
+        return idempotent and status in GATEWAY_STATUSES
+
+    def should_retry_exception(self, exc: Exception, idempotent: bool) -> bool:
+        # Falha ao conectar: o pedido nunca chegou ao servidor
+        if isinstance(exc, requests.ConnectTimeout):
+            return True
+        return idempotent and isinstance(exc, (requests.ConnectionError, requests.Timeout))
+
+    def delay(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        """Espera antes da tentativa `attempt + 1` (attempt começa em 0)."""
+        hinted = self._parse_retry_after(retry_after)
+        if hinted is not None:
+            return min(hinted, self.max_delay)
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+    @staticmethod
+    def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+        """Retry-After em segundos ou como data HTTP; None se ausente/inválido."""
+        if not value:
+            return None
+        value = value.strip()
+        if value.isdigit():
+            return float(value)
+        try:
+            when = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if when.tzinfo is None:
+            when = when.replace(tzinfo=timezone.utc)
+        return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+class AdaptiveLimiter:
+    """
+    Limite de requisições simultâneas ajustado por AIMD: cada resposta ok soma
+    1/limite (≈ +1 por "janela" completa), cada throttling (429/503) divide o
+    limite por 2. Reduções em sequência dentro de `cooldown` segundos contam uma
+    vez só, para uma rajada de 429 não derrubar o limite até o mínimo.
+    """
+
+    def __init__(
+        self,
+        maximum: int,
+        minimum: int = 1,
+        cooldown: float = 1.0,
+    ) -> None:
+        self.maximum = max(1, maximum)
+        self.minimum = max(1, min(minimum, self.maximum))
+        self.cooldown = cooldown
+        self._limit = float(self.maximum)
+        self._in_flight = 0
+        self._last_decrease = 0.0
+        self._throttled = 0
+        self._cond = threading.Condition()
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    @contextmanager
+    def slot(self) -> Iterator[None]:
+        """Bloqueia até haver vaga sob o limite atual."""
+        with self._cond:
+            while self._in_flight >= int(self._limit):
+                self._cond.wait()
+            self._in_flight += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._in_flight -= 1
+                self._cond.notify()
+
+    def on_success(self) -> None:
+        with self._cond:
+            grown = min(float(self.maximum), self._limit + 1.0 / self._limit)
+            if int(grown) > int(self._limit):
+                self._cond.notify()
+            self._limit = grown
+
+    def on_throttle(self) -> None:
+        with self._cond:
+            self._throttled += 1
+            now = time.monotonic()
+            if now - self._last_decrease < self.cooldown:
+                return
+            self._last_decrease = now
+            self._limit = max(float(self.minimum), self._limit / 2)
+
+    def stats(self) -> Dict[str, int]:
+        with self._cond:
+            return {"limit": int(self._limit), "throttled": self._throttled}
+
+
+# ===========================================================================
+# Cliente Supabase REST (service_role — bypass RLS)
+# ===========================================================================
+
+class SupabaseRestClient:
+    """
+    Cliente para a PostgREST API do Supabase.
+    Usa service_role key → ignora RLS completamente.
+    Todas as chamadas passam pelo SessionPool (conexões persistentes).
+
+    Escritas devolvem só as colunas de `returning` (padrão: "id"); cada método
+    aceita `returning=` para sobrescrever, inclusive RETURN_MINIMAL quando o
+    chamador não precisa do registro criado.
+
+    Falhas transitórias (429/503, e 502/504 ou erros de conexão em chamadas
+    idempotentes) são repetidas conforme a RetryPolicy; o AdaptiveLimiter reduz
+    as requisições simultâneas quando o servidor começa a devolver throttling.
+
+    Com compress=True, corpos a partir de compress_threshold bytes são enviados
+    com Content-Encoding: gzip. Respostas comprimidas são negociadas sempre
+    (Accept-Encoding do requests). `traffic` acumula bytes brutos e na rede.
+
+    Corpos são (de)serializados pelo `codec` (orjson se instalado, senão json).
+    """
+
+    def __init__(
+        self,
+        url: str,
+        key: str,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        max_conn_per_host: int = DEFAULT_MAX_CONN_PER_HOST,
+        keep_alive: bool = True,
+        timeout: int = DEFAULT_TIMEOUT,
+        returning: str = DEFAULT_RETURNING,
+        retry: Optional[RetryPolicy] = None,
+        compress: bool = False,
+        compress_threshold: int = DEFAULT_COMPRESS_THRESHOLD,
+        codec: Optional[JsonCodec] = None,
+    ) -> None:
+        if not url:
+            raise ValueError("SUPABASE_URL não configurado.")
+        if not key:
+            raise ValueError(
+                "SUPABASE_SERVICE_ROLE_KEY não configurado. "
+                "Exporte a variável de ambiente antes de rodar o script."
+            )
+        self.base_url = url.rstrip("/")
+        self.timeout = timeout
+        self.returning = returning
+        self.headers = {
+            "apikey": key,
+            "Authorization": f"Bearer {key}",
+            "Content-Type": "application/json",
+        }
+        self.pool = SessionPool(
+            size=pool_size,
+            max_conn_per_host=max_conn_per_host,
+            keep_alive=keep_alive,
+        )
+        self.retry = retry or RetryPolicy()
+        self.limiter = AdaptiveLimiter(maximum=self.pool.size)
+        self.retries = 0
+        self._retries_lock = threading.Lock()
+        self.compress = compress
+        self.compress_threshold = compress_threshold
+        self.codec = codec or get_json_codec()
+        self.traffic: Dict[str, int] = {
+            "sent_raw":      0,
+            "sent_wire":     0,
+            "received_raw":  0,
+            "received_wire": 0,
+        }
+
+    def _table_url(self, table: str) -> str:
+        return f"{self.base_url}/rest/v1/{table}"
+
+    def _request(
+        self,
+        method: str,
+        url: str,
+        idempotent: Optional[bool] = None,
+        **kwargs: Any,
+    ) -> requests.Response:
+        """
+        Executa a requisição numa sessão do pool e valida o status HTTP.
+        Falhas transitórias são repetidas com backoff; `idempotent` (padrão: GET,
+        PATCH e DELETE) libera a repetição também em 502/504 e erros de conexão.
+        """
+        if idempotent is None:
+            idempotent = method in ("GET", "HEAD", "PATCH", "DELETE")
+        kwargs.setdefault("headers", self.headers)
+        kwargs.setdefault("timeout", self.timeout)
+        sent_raw, sent_wire = self._encode_body(kwargs)
+        attempt = 0
+        while True:
+            try:
+                with self.limiter.slot(), self.pool.session() as sess:
+                    resp = sess.request(method, url, **kwargs)
+                    received_raw = len(resp.content)
+                # tell() do urllib3 conta os bytes lidos do socket (ainda comprimidos)
+                received_wire = resp.raw.tell() if resp.raw is not None else received_raw
+                with self._retries_lock:
+                    self.traffic["sent_raw"] += sent_raw
+                    self.traffic["sent_wire"] += sent_wire
+                    self.traffic["received_raw"] += received_raw
+                    self.traffic["received_wire"] += received_wire
+            except requests.RequestException as e:
+                if attempt >= self.retry.max_retries or not self.retry.should_retry_exception(
+                    e, idempotent
+                ):
+                    raise
+                reason, wait = type(e).__name__, self.retry.delay(attempt)
+            else:
+                if resp.status_code in THROTTLE_STATUSES:
+                    self.limiter.on_throttle()
+                elif resp.status_code < 500:
+                    self.limiter.on_success()
+                if attempt >= self.retry.max_retries or not self.retry.should_retry_status(
+                    resp.status_code, idempotent
+                ):
+                    resp.raise_for_status()
+                    return resp
+                reason = f"HTTP {resp.status_code}"
+                wait = self.retry.delay(attempt, resp.headers.get("Retry-After"))
+            attempt += 1
+            with self._retries_lock:
+                self.retries += 1
+            log_debug(
+                f"{method} {url}: {reason} — tentativa {attempt}/{self.retry.max_retries} "
+                f"em {wait:.2f}s"
+            )
+            time.sleep(wait)
+
+    def _encode_body(self, kwargs: Dict[str, Any]) -> Tuple[int, int]:
+        """
+        Converte o corpo (`data`) para bytes e aplica gzip se habilitado e acima
+        do limite. Feito uma vez por chamada: as retentativas reenviam os mesmos
+        bytes. Retorna (tamanho bruto, tamanho enviado).
+        """
+        data = kwargs.get("data")
+        if data is None:
+            return 0, 0
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        raw_size = len(data)
+        if self.compress and raw_size >= self.compress_threshold:
+            data = gzip.compress(data, compresslevel=COMPRESS_LEVEL)
+            kwargs["headers"] = {**kwargs["headers"], "Content-Encoding": "gzip"}
+        kwargs["data"] = data
+        return raw_size, len(data)
+
+    def close(self) -> None:
+        """Fecha as sessões do pool (libera as conexões keep-alive)."""
+        self.pool.close()
+
+    def stats_lines(self) -> List[Tuple[str, str]]:
+        """Contadores de pool, retentativas e tráfego como (rótulo, valor) para os relatórios."""
+        pool = self.pool.stats()
+        limiter = self.limiter.stats()
+        t = self.traffic
+        return [
+            ("Pool HTTP", (
+                f"{pool['requests']} requisições, {pool['connections_opened']} conexões, "
+                f"{pool['sessions']} sessões, {pool['waits']} esperas"
+            )),
+            ("Retentativas", (
+                f"{self.retries} ({limiter['throttled']} throttling, "
+                f"limite final {limiter['limit']})"
+            )),
+            ("Tráfego enviado", (
+                f"{format_bytes(t['sent_raw'])} ({format_bytes(t['sent_wire'])} na rede)"
+            )),
+            ("Tráfego recebido", (
+                f"{format_bytes(t['received_raw'])} ({format_bytes(t['received_wire'])} na rede)"
+            )),
+        ]
+
+    def _write_options(
+        self, returning: Optional[str], prefer: str = ""
+    ) -> Tuple[Dict[str, str], Dict[str, str]]:
+        """Monta headers (Prefer) e params (select) de uma escrita conforme `returning`."""
+        returning = returning or self.returning
+        params: Dict[str, str] = {}
+        if returning == RETURN_MINIMAL:
+            options = ["return=minimal"]
+        else:
+            options = ["return=representation"]
+            params["select"] = returning
+        if prefer:
+            options.append(prefer)
+        return {**self.headers, "Prefer": ",".join(options)}, params
+
+    def _first(self, resp: requests.Response) -> Optional[Dict]:
+        if not resp.content:
+            return None
+        result = self.codec.loads(resp.content)
+        if isinstance(result, list):
+            return result[0] if result else None
+        return result
+
+    def select(
+        self,
+        table: str,
+        filters: Optional[Dict[str, str]] = None,
+        columns: str = "*",
+    ) -> List[Dict]:
+        """
+        SELECT com filtros opcionais no estilo PostgREST.
+        Exemplo: filters={"tenant_id": "eq.uuid", "deleted_at": "is.null"}
+        """
+        params: Dict[str, str] = {"select": columns}
+        if filters:
+            params.update(filters)
+        resp = self._request("GET", self._table_url(table), params=params)
+        return self.codec.loads(resp.content)
+
+    def select_iter(
+        self,
+        table: str,
+        filters: Optional[Dict[str, str]] = None,
+        columns: str = "*",
+        page_size: int = DEFAULT_PAGE_SIZE,
+    ) -> Iterator[Dict]:
+        """
+        SELECT paginado por keyset (id > último id, order=id.asc).
+        Gera os registros página a página, sem o corte silencioso do max-rows do
+        PostgREST e com memória limitada ao tamanho da página. A coluna id é
+        incluída na projeção se não estiver presente (necessária para o keyset).
+        """
+        if columns != "*" and "id" not in columns.split(","):
+            columns = f"id,{columns}"
+        params: Dict[str, str] = {
+            "select": columns,
+            "order": "id.asc",
+            "limit": str(page_size),
+        }
+        if filters:
+            params.update(filters)
+        last_id: Optional[str] = None
+        while True:
+            if last_id is not None:
+                params["id"] = f"gt.{last_id}"
+            resp = self._request("GET", self._table_url(table), params=params)
+            page = self.codec.loads(resp.content)
+            if not page:
+                return
+            yield from page
+            # Página curta não encerra a leitura: o servidor pode ter um
+            # max-rows menor que page_size — só uma página vazia indica o fim
+            last_id = page[-1]["id"]
+
+    def invoke_function(self, name: str, payload: Dict) -> Any:
+        """
+        POST para uma Edge Function (/functions/v1/<name>) com o corpo JSON.
+        Não idempotente: só throttling (429/503) é repetido.
+        """
+        resp = self._request(
+            "POST",
+            f"{self.base_url}/functions/v1/{name}",
+            data=self.codec.dumps(payload),
+        )
+        return self.codec.loads(resp.content) if resp.content else None
+
+    def insert(
+        self, table: str, data: Dict, returning: Optional[str] = None
+    ) -> Optional[Dict]:
+        """INSERT de um registro. Retorna as colunas de `returning` (None se minimal)."""
+        headers, params = self._write_options(returning)
+        resp = self._request(
+            "POST",
+            self._table_url(table),
+            headers=headers,
+            data=self.codec.dumps(data),
+            params=params,
+        )
+        return self._first(resp)
+
+    def upsert(
+        self,
+        table: str,
+        data: Dict,
+        on_conflict: str,
+        returning: Optional[str] = None,
+        ignore_duplicates: bool = False,
+    ) -> Optional[Dict]:
+        """
+        INSERT com ON CONFLICT DO UPDATE (upsert), ou DO NOTHING com
+        ignore_duplicates=True — nesse caso retorna None se o registro já existia.
+        on_conflict: nome da coluna ou colunas separadas por vírgula.
+        """
+        resolution = "ignore-duplicates" if ignore_duplicates else "merge-duplicates"
+        headers, params = self._write_options(returning, f"resolution={resolution}")
+        resp = self._request(
+            "POST",
+            self._table_url(table),
+            idempotent=True,
+            headers=headers,
+            data=self.codec.dumps(data),
+            params={**params, "on_conflict": on_conflict},
+        )
+        return self._first(resp)
+
+    def update(
+        self,
+        table: str,
+        data: Dict,
+        filters: Dict[str, str],
+        returning: Optional[str] = None,
+    ) -> Optional[Dict]:
+        """UPDATE com filtros PostgREST."""
+        headers, params = self._write_options(returning)
+        resp = self._request(
+            "PATCH",
+            self._table_url(table),
+            headers=headers,
+            data=self.codec.dumps(data),
+            params={**filters, **params},
+        )
+        return self._first(resp)
+
+    def insert_many(
+        self,
+        table: str,
+        rows: List[Dict],
+        max_rows: int = DEFAULT_BATCH_ROWS,
+        max_bytes: int = DEFAULT_BATCH_BYTES,
+        returning: Optional[str] = None,
+    ) -> List[Optional[str]]:
+        """
+        INSERT em lote (array JSON). Divide os registros em chunks por número de
+        linhas e por tamanho serializado; retorna os ids criados na ordem de entrada
+        (None para cada registro se returning=RETURN_MINIMAL).
+        Colunas ausentes em algum registro recebem o DEFAULT da tabela (missing=default).
+        """
+        return self._post_many(
+            table, rows, "missing=default", {}, max_rows, max_bytes, returning
+        )
+
+    def upsert_many(
+        self,
+        table: str,
+        rows: List[Dict],
+        on_conflict: str,
+        max_rows: int = DEFAULT_BATCH_ROWS,
+        max_bytes: int = DEFAULT_BATCH_BYTES,
+        returning: Optional[str] = None,
+        ignore_duplicates: bool = False,
+    ) -> List[Optional[str]]:
+        """
+        UPSERT em lote (merge-duplicates). Os registros são agrupados pelo conjunto
+        de colunas, para que o UPDATE de cada linha só toque nas colunas que ela
+        informa — mesma semântica do upsert() unitário. Retorna ids na ordem de entrada.
+
+        Com ignore_duplicates=True (ON CONFLICT DO NOTHING) não há UPDATE: vai um
+        único array por chunk (missing=default) e os registros que já existiam
+        voltam com id None.
+        """
+        if ignore_duplicates:
+            return self._post_many(
+                table,
+                rows,
+                "resolution=ignore-duplicates,missing=default",
+                {"on_conflict": on_conflict},
+                max_rows,
+                max_bytes,
+                returning,
+                match_on=[c.strip() for c in on_conflict.split(",")],
+            )
+        ids: List[Optional[str]] = [None] * len(rows)
+        groups: Dict[Tuple[str, ...], List[int]] = {}
+        for i, row in enumerate(rows):
+            groups.setdefault(tuple(row), []).append(i)
+        for indexes in groups.values():
+            group_ids = self._post_many(
+                table,
+                [rows[i] for i in indexes],
+                "resolution=merge-duplicates",
+                {"on_conflict": on_conflict},
+                max_rows,
+                max_bytes,
+                returning,
+            )
+            for i, row_id in zip(indexes, group_ids):
+                ids[i] = row_id
+        return ids
+
+    def _post_many(
+        self,
+        table: str,
+        rows: List[Dict],
+        prefer: str,
+        params: Dict[str, str],
+        max_rows: int,
+        max_bytes: int,
+        returning: Optional[str] = None,
+        match_on: Optional[List[str]] = None,
+    ) -> List[Optional[str]]:
+        """
+        POST de arrays JSON em chunks; valida a contagem e devolve os ids em ordem.
+        Com match_on (ignore-duplicates) o PostgREST devolve só as linhas inseridas:
+        os ids são casados pelas colunas do conflito e as ignoradas ficam None.
+        """
+        # Só o id (e a chave do conflito) é lido de volta — outras colunas seriam
+        # bytes e decode desperdiçados
+        if (returning or self.returning) != RETURN_MINIMAL:
+            returning = ",".join(["id", *(match_on or [])])
+        headers, write_params = self._write_options(returning, prefer)
+        ids: List[Optional[str]] = []
+        for chunk, body in self._chunks(rows, max_rows, max_bytes):
+            columns: Dict[str, None] = {}
+            for row in chunk:
+                columns.update(dict.fromkeys(row))
+            resp = self._request(
+                "POST",
+                self._table_url(table),
+                # Upsert repetido grava o mesmo estado; INSERT puro não
+                idempotent="resolution=" in prefer,
+                headers=headers,
+                data=body,
+                params={**params, **write_params, "columns": ",".join(columns)},
+            )
+            if returning == RETURN_MINIMAL:
+                ids.extend([None] * len(chunk))
+                continue
+            created = self.codec.loads(resp.content)
+            if match_on:
+                by_key = {tuple(r[c] for c in match_on): r["id"] for r in created}
+                ids.extend(by_key.get(tuple(row.get(c) for c in match_on)) for row in chunk)
+                continue
+            if len(created) != len(chunk):
+                raise ValueError(
+                    f"{table}: esperados {len(chunk)} registros gravados, "
+                    f"PostgREST retornou {len(created)}."
+                )
+            ids.extend(r["id"] for r in created)
+        return ids
+
+    def _chunks(
+        self, rows: List[Dict], max_rows: int, max_bytes: int
+    ) -> Iterator[Tuple[List[Dict], bytes]]:
+        """Agrupa registros em arrays JSON respeitando os limites de linhas e bytes."""
+        chunk: List[Dict] = []
+        parts: List[bytes] = []
+        size = 2  # colchetes do array
+        for row in rows:
+            encoded = self.codec.dumps(row)
+            if chunk and (len(chunk) >= max_rows or size + len(encoded) + 1 > max_bytes):
+                yield chunk, b"[" + b",".join(parts) + b"]"
+                chunk, parts, size = [], [], 2
+            chunk.append(row)
+            parts.append(encoded)
+            size += len(encoded) + 1
+        if chunk:
+            yield chunk, b"[" + b",".join(parts) + b"]"
+
+
+def is_conflict(exc: BaseException) -> bool:
+    """True para 409 (violação de unique) — inclusive índices fora do on_conflict."""
+    return (
+        isinstance(exc, requests.HTTPError)
+        and exc.response is not None
+        and exc.response.status_code == 409
+    )
+
+
+class BulkWriter:
+    """
+    Buffer de INSERTs (ou UPSERTs, com on_conflict) sobre SupabaseRestClient.
+    Cada registro enfileirado leva callbacks de sucesso (recebe o id criado, ou
+    None com returning=RETURN_MINIMAL) e de erro. Se um lote for rejeitado pelo banco (4xx), os registros são reenviados
+    um a um para isolar a linha inválida sem perder as demais.
+
+    Com ignore_duplicates=True o conflito em on_conflict é ignorado (DO NOTHING):
+    registros que já existiam chamam on_duplicate (se informado) em vez de on_success.
+    """
+
+    def __init__(
+        self,
+        client: SupabaseRestClient,
+        table: str,
+        batch_size: int = DEFAULT_BATCH_ROWS,
+        on_conflict: Optional[str] = None,
+        returning: str = DEFAULT_RETURNING,
+        ignore_duplicates: bool = False,
+    ) -> None:
+        self.client = client
+        self.table = table
+        self.batch_size = max(1, batch_size)
+        self.on_conflict = on_conflict
+        self.returning = returning
+        self.ignore_duplicates = ignore_duplicates
+        self._rows: List[Dict] = []
+        self._callbacks: List[
+            Tuple[
+                Callable[[Optional[str]], None],
+                Callable[[Exception], None],
+                Optional[Callable[[Dict], None]],
+            ]
+        ] = []
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def add(
+        self,
+        row: Dict,
+        on_success: Callable[[Optional[str]], None],
+        on_error: Callable[[Exception], None],
+        on_duplicate: Optional[Callable[[Dict], None]] = None,
+    ) -> None:
+        self._rows.append(row)
+        self._callbacks.append((on_success, on_error, on_duplicate))
+        if len(self._rows) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Envia o buffer atual. Callbacks podem enfileirar em outros writers."""
+        if not self._rows:
+            return
+        rows, callbacks = self._rows, self._callbacks
+        self._rows, self._callbacks = [], []
+        try:
+            ids = self._write_batch(rows)
+        except requests.HTTPError as e:
+            status = e.response.status_code if e.response is not None else 0
+            if len(rows) == 1 or not 400 <= status < 500:
+                for _, on_error, _ in callbacks:
+                    on_error(e)
+                return
+            log_warn(
+                f"Lote de {len(rows)} {self.table} rejeitado ({status}) — "
+                "reenviando linha a linha."
+            )
+            for row, (on_success, on_error, on_duplicate) in zip(rows, callbacks):
+                try:
+                    row_id = self._write_one(row)
+                except Exception as row_exc:
+                    on_error(row_exc)
+                    continue
+                self._dispatch(row, row_id, on_success, on_duplicate)
+            return
+        except Exception as e:
+            for _, on_error, _ in callbacks:
+                on_error(e)
+            return
+        for row, row_id, (on_success, _, on_duplicate) in zip(rows, ids, callbacks):
+            self._dispatch(row, row_id, on_success, on_duplicate)
+
+    def _dispatch(
+        self,
+        row: Dict,
+        row_id: Optional[str],
+        on_success: Callable[[Optional[str]], None],
+        on_duplicate: Optional[Callable[[Dict], None]],
+    ) -> None:
+        # Sem id com return=representation: o registro já existia (DO NOTHING)
+        duplicate = (
+            self.ignore_duplicates and row_id is None and self.returning != RETURN_MINIMAL
+        )
+        if duplicate and on_duplicate is not None:
+            on_duplicate(row)
+        else:
+            on_success(row_id)
+
+    def _write_batch(self, rows: List[Dict]) -> List[Optional[str]]:
+        if self.on_conflict:
+            return self.client.upsert_many(
+                self.table, rows, self.on_conflict,
+                max_rows=self.batch_size, returning=self.returning,
+                ignore_duplicates=self.ignore_duplicates,
+            )
+        return self.client.insert_many(
+            self.table, rows, max_rows=self.batch_size, returning=self.returning
+        )
+
+    def _write_one(self, row: Dict) -> Optional[str]:
+        if self.on_conflict:
+            result = self.client.upsert(
+                self.table, row, self.on_conflict, returning=self.returning,
+                ignore_duplicates=self.ignore_duplicates,
+            )
+        else:
+            result = self.client.insert(self.table, row, returning=self.returning)
+        return result["id"] if result else None
+
+
+class StateLock:
+    """
+    Lock do estado do migrador (caches, filas, stats) no modo assíncrono.
+    A thread que processa uma linha o segura o tempo todo, exceto durante o I/O
+    de rede (released()) — o mesmo ponto em que uma coroutine faria `await`.
+    Assim só a espera pelo PostgREST roda em paralelo; a lógica das linhas
+    continua serial e reaproveita o código síncrono sem condições de corrida.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def __enter__(self) -> "StateLock":
+        self._lock.acquire()
+        self._local.held = True
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self._local.held = False
+        self._lock.release()
+
+    @contextmanager
+    def released(self) -> Iterator[None]:
+        """Libera o lock no bloco, se a thread atual o detém."""
+        if not getattr(self._local, "held", False):
+            yield
+            return
+        self.__exit__()
+        try:
+            yield
+        finally:
+            self.__enter__()
+
+
+class AsyncSupabaseRestClient(SupabaseRestClient):
+    """
+    Variante asyncio do cliente. As chamadas HTTP continuam no SessionPool
+    (requests), executadas num ThreadPoolExecutor com `concurrency` workers;
+    o pool ganha pelo menos uma sessão por worker. Os métodos a* são as versões
+    awaitable das operações, e run_locked() executa código síncrono sob o
+    StateLock, liberado automaticamente a cada requisição.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        key: str,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        **kwargs: Any,
+    ) -> None:
+        self.concurrency = max(1, concurrency)
+        kwargs["pool_size"] = max(kwargs.get("pool_size", DEFAULT_POOL_SIZE), self.concurrency)
+        super().__init__(url, key, **kwargs)
+        self.state = StateLock()
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.concurrency, thread_name_prefix="postgrest"
+        )
+
+    def _request(self, method: str, url: str, **kwargs: Any) -> requests.Response:
+        with self.state.released():
+            return super()._request(method, url, **kwargs)
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
+        super().close()
+
+    async def _call(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, partial(fn, *args, **kwargs))
+
+    async def run_locked(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """Executa fn(*args) numa thread do executor segurando o StateLock."""
+        def locked() -> Any:
+            with self.state:
+                return fn(*args)
+        return await self._call(locked)
+
+    async def aselect(self, table: str, *args: Any, **kwargs: Any) -> List[Dict]:
+        return await self._call(self.select, table, *args, **kwargs)
+
+    async def ainsert(self, table: str, *args: Any, **kwargs: Any) -> Optional[Dict]:
+        return await self._call(self.insert, table, *args, **kwargs)
+
+    async def aupsert(self, table: str, *args: Any, **kwargs: Any) -> Optional[Dict]:
+        return await self._call(self.upsert, table, *args, **kwargs)
+
+    async def aupdate(self, table: str, *args: Any, **kwargs: Any) -> Optional[Dict]:
+        return await self._call(self.update, table, *args, **kwargs)
+
+    async def ainsert_many(self, table: str, *args: Any, **kwargs: Any) -> List[Optional[str]]:
+        return await self._call(self.insert_many, table, *args, **kwargs)
+
+    async def aupsert_many(self, table: str, *args: Any, **kwargs: Any) -> List[Optional[str]]:
+        return await self._call(self.upsert_many, table, *args, **kwargs)
@@ -0,0 +1,206 @@
+"""
+Ledger local (SQLite) para re-sync incremental das planilhas/CSVs.
+
+Para cada fonte (arquivo CSV ou aba de planilha) guarda o hash do conteudo de
+cada linha ja sincronizada e o import_fingerprint (fingerprint.py) do registro
+que ela gerou. Numa nova execucao:
+
+  - linhas com hash conhecido sao puladas sem processamento nem rede;
+  - linhas novas ou alteradas seguem o caminho normal (upsert pelo fingerprint);
+  - fingerprints que sumiram da fonte (linha removida, ou alterada a ponto de
+    mudar a chave natural) podem virar tombstones: soft delete no banco.
+
+So linhas gravadas com sucesso entram no ledger; as que falharam sao tentadas
+de novo na proxima execucao (vendor criado com bank_account falha: a nova
+passada acha o vendor e cria so a conta). Um escopo por (projeto Supabase, tenant), como no
+LookupCache.
+
+Uso:
+    ledger = SyncLedger(SyncLedger.default_path(), supabase_url, tenant_id)
+    run = SyncRun(ledger, "/abs/custos.csv", "cost_items", rows)
+    for line, row in run.changed:
+        ...
+        run.mark(line, fingerprint)      # gravada (ou ja existente)
+    removed = run.finish()               # fingerprints que sairam da fonte
+    tombstone(client.update, "cost_items", tenant_id, removed)
+
+Compartilhado por migrate_sheets_data.py, import_job_finances.py e import_equipe.py.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+# Fingerprints por PATCH de tombstone (cabe na URL do PostgREST: 64 hex cada)
+TOMBSTONE_CHUNK = 100
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS ledger_rows (
+    scope        TEXT NOT NULL,
+    source       TEXT NOT NULL,
+    row_hash     TEXT NOT NULL,
+    tbl          TEXT NOT NULL,
+    fingerprint  TEXT,
+    synced_at    REAL NOT NULL,
+    PRIMARY KEY (scope, source, row_hash)
+);
+"""
+
+
+def row_hash(row: Any) -> str:
+    """sha256 do conteudo bruto da linha (dict ou lista), estavel entre execucoes."""
+    data = json.dumps(row, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+class SyncLedger:
+    """Hashes de linhas ja sincronizadas, por fonte, persistidos em SQLite."""
+
+    def __init__(self, path: str, base_url: str, tenant_id: str) -> None:
+        self.path = path
+        self.scope = f"{base_url.rstrip('/')}|{tenant_id}"
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.executescript(_SCHEMA)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+
+    @staticmethod
+    def default_path() -> str:
+        """SYNC_LEDGER_PATH ou ~/.cache/ellahos/sync_ledger.sqlite."""
+        return os.environ.get("SYNC_LEDGER_PATH") or os.path.join(
+            os.path.expanduser("~"), ".cache", "ellahos", "sync_ledger.sqlite"
+        )
+
+    def close(self) -> None:
+        self._db.close()
+
+    def entries(self, source: str) -> Dict[str, Optional[str]]:
+        """row_hash -> fingerprint das linhas ja sincronizadas da fonte."""
+        with self._lock:
+            cur = self._db.execute(
+                "SELECT row_hash, fingerprint FROM ledger_rows WHERE scope = ? AND source = ?",
+                (self.scope, source),
+            )
+            return dict(cur.fetchall())
+
+    def reset(self, source: Optional[str] = None) -> None:
+        """Esquece a fonte (ou todas): a proxima execucao envia tudo de novo."""
+        with self._lock, self._db:
+            if source is None:
+                self._db.execute("DELETE FROM ledger_rows WHERE scope = ?", (self.scope,))
+            else:
+                self._db.execute(
+                    "DELETE FROM ledger_rows WHERE scope = ? AND source = ?",
+                    (self.scope, source),
+                )
+
+    def commit(
+        self,
+        source: str,
+        table: str,
+        keep: Iterable[str],
+        done: Dict[str, Optional[str]],
+    ) -> List[Tuple[str, Optional[str]]]:
+        """
+        Fecha uma execucao da fonte: mantem os hashes de `keep` (linhas inalteradas),
+        grava `done` (linhas sincronizadas agora) e remove o resto. Retorna as
+        entradas removidas (row_hash, fingerprint).
+        """
+        keep = set(keep)
+        with self._lock, self._db:
+            cur = self._db.execute(
+                "SELECT row_hash, fingerprint FROM ledger_rows WHERE scope = ? AND source = ?",
+                (self.scope, source),
+            )
+            stale = [(h, fp) for h, fp in cur.fetchall() if h not in keep and h not in done]
+            self._db.executemany(
+                "DELETE FROM ledger_rows WHERE scope = ? AND source = ? AND row_hash = ?",
+                [(self.scope, source, h) for h, _ in stale],
+            )
+            now = time.time()
+            self._db.executemany(
+                "INSERT INTO ledger_rows (scope, source, row_hash, tbl, fingerprint, synced_at) "
+                "VALUES (?, ?, ?, ?, ?, ?) ON CONFLICT (scope, source, row_hash) DO UPDATE SET "
+                "tbl = excluded.tbl, fingerprint = excluded.fingerprint, "
+                "synced_at = excluded.synced_at",
+                [(self.scope, source, h, table, fp, now) for h, fp in done.items()],
+            )
+        return stale
+
+
+class SyncRun:
+    """
+    Uma passada incremental sobre as linhas de uma fonte. `changed` traz so as
+    linhas novas ou alteradas, com o numero original (1-based) de cada uma.
+    """
+
+    def __init__(self, ledger: SyncLedger, source: str, table: str, rows: List[Any]) -> None:
+        self.ledger = ledger
+        self.source = source
+        self.table = table
+        known = ledger.entries(source)
+        self.unchanged: Dict[str, Optional[str]] = {}
+        self.changed: List[Tuple[int, Any]] = []
+        self._hashes: Dict[int, str] = {}
+        for line, row in enumerate(rows, start=1):
+            h = row_hash(row)
+            if h in known:
+                self.unchanged[h] = known[h]
+            else:
+                self.changed.append((line, row))
+                self._hashes[line] = h
+        self.touched: Set[str] = set()
+        self.done: Dict[str, Optional[str]] = {}
+
+    def touch(self, fingerprint: Optional[str]) -> None:
+        """Registra que a linha atual gera este fingerprint (mesmo se falhar depois)."""
+        if fingerprint:
+            self.touched.add(fingerprint)
+
+    def mark(self, line: int, fingerprint: Optional[str]) -> None:
+        """Linha sincronizada (gravada ou ja existente no banco)."""
+        self.touch(fingerprint)
+        self.done[self._hashes[line]] = fingerprint
+
+    def finish(self) -> List[str]:
+        """
+        Grava o ledger e retorna os fingerprints que sairam da fonte — nenhuma
+        linha atual (inalterada, gravada ou que falhou) os gera mais.
+        """
+        stale = self.ledger.commit(self.source, self.table, self.unchanged, self.done)
+        alive = self.touched | {fp for fp in self.unchanged.values() if fp}
+        return sorted({fp for _, fp in stale if fp and fp not in alive})
+
+
+def tombstone(
+    update: Callable[..., Any],
+    table: str,
+    tenant_id: str,
+    fingerprints: List[str],
+) -> int:
+    """
+    Soft delete (deleted_at = agora) dos registros importados com estes
+    fingerprints, em PATCHes de ate TOMBSTONE_CHUNK. `update(table, data, filters)`
+    e o metodo update do cliente REST. Retorna quantos fingerprints foram enviados.
+    """
+    now = datetime.now(timezone.utc).isoformat()
+    for i in range(0, len(fingerprints), TOMBSTONE_CHUNK):
+        chunk = fingerprints[i:i + TOMBSTONE_CHUNK]
+        update(
+            table,
+            {"deleted_at": now},
+            {
+                "tenant_id": f"eq.{tenant_id}",
+                "import_fingerprint": f"in.({','.join(chunk)})",
+                "deleted_at": "is.null",
+            },
+        )
+    return len(fingerprints)
@@ -0,0 +1,92 @@
+"""
+Normalizacao de nomes e textos das planilhas, com memo LRU.
+
+  normalize_name  replica de normalize_vendor_name() do PostgreSQL (coluna
+                  vendors.normalized_name): sem acentos, so letras, digitos,
+                  espaco e hifen, minusculas e sem espacos nas pontas. Os
+                  espacos internos sao mantidos como estao — a busca por
+                  normalized_name precisa bater com o valor gravado pelo banco.
+  normalize_text  o mesmo, com espacos colapsados: chave de comparacao de
+                  nomes, titulos, status e condicoes de pagamento.
+  fold_text       so minusculas, sem acentos e espacos colapsados (mantem a
+                  pontuacao): chave de dedup dos geradores de SQL.
+
+Planilhas repetem poucos milhares de valores distintos por linha: cada texto e
+normalizado uma vez (NORMALIZE_CACHE_SIZE entradas por funcao), texto ASCII
+pula o unicodedata e os regex sao pre-compilados.
+
+Compartilhado por migrate_sheets_data.py, import_equipe.py,
+import_job_finances.py, dedup_vendors.py, gen_equipe_sql.py e parse_custos_csv.py.
+"""
+
+import re
+import unicodedata
+from functools import lru_cache
+from typing import Any, Dict
+
+# Entradas distintas memorizadas por funcao de normalizacao
+NORMALIZE_CACHE_SIZE = 65536
+
+_NON_NAME_CHARS = re.compile(r"[^a-zA-Z0-9\s\-]")
+_SPACES = re.compile(r"\s+")
+
+
+def _strip_accents(text: str) -> str:
+    if text.isascii():
+        # Texto ASCII nao tem acentos a decompor: pula o unicodedata
+        return text
+    nfkd = unicodedata.normalize("NFKD", text)
+    return "".join(c for c in nfkd if not unicodedata.combining(c))
+
+
+@lru_cache(maxsize=NORMALIZE_CACHE_SIZE)
+def _normalize_name(name: str) -> str:
+    return _NON_NAME_CHARS.sub("", _strip_accents(name)).lower().strip()
+
+
+@lru_cache(maxsize=NORMALIZE_CACHE_SIZE)
+def _normalize_text(text: str) -> str:
+    cleaned = _NON_NAME_CHARS.sub("", _strip_accents(text.strip()))
+    return _SPACES.sub(" ", cleaned).lower().strip()
+
+
+@lru_cache(maxsize=NORMALIZE_CACHE_SIZE)
+def _fold_text(text: str) -> str:
+    return _SPACES.sub(" ", _strip_accents(text.strip())).lower().strip()
+
+
+def normalize_name(name: str) -> str:
+    """Igual ao normalize_vendor_name() do PostgreSQL (ver docstring do modulo)."""
+    if not name:
+        return ""
+    return _normalize_name(name)
+
+
+def normalize_text(text: str) -> str:
+    """
+    Normaliza texto: lowercase, strip, remove acentos e pontuacao, colapsa
+    espacos extras. Resultados memorizados; ver normalize_cache_stats().
+    """
+    if not text:
+        return ""
+    return _normalize_text(text)
+
+
+def fold_text(text: str) -> str:
+    """Minusculas, sem acentos, espacos colapsados; pontuacao mantida."""
+    if not text:
+        return ""
+    return _fold_text(text)
+
+
+def normalize_cache_stats() -> Dict[str, Any]:
+    """Acertos, faltas, tamanho e taxa de acerto do cache de normalize_text."""
+    info = _normalize_text.cache_info()
+    calls = info.hits + info.misses
+    return {
+        "hits": info.hits,
+        "misses": info.misses,
+        "size": info.currsize,
+        "maxsize": info.maxsize,
+        "hit_rate": info.hits / calls if calls else 0.0,
+    }
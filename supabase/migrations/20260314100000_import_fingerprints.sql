@@ -0,0 +1,131 @@
+-- ============================================================
+-- Migration: Fingerprint de importacao (idempotencia entre execucoes)
+-- Os scripts de migracao (scripts/migrate_sheets_data.py e
+-- scripts/migration/import_*.py) gravam em cada linha importada um
+-- sha256 da chave natural (scripts/migration/fingerprint.py).
+-- A constraint UNIQUE (tenant_id, import_fingerprint) e o alvo do
+-- ON CONFLICT das escritas (Prefer: resolution=ignore-duplicates):
+-- reimportar o mesmo arquivo em outro dia nao duplica registros.
+-- Linhas criadas fora da importacao ficam com NULL (nunca conflita).
+-- ============================================================
+
+SET search_path TO public;
+
+-- ============================================================
+-- 1. Colunas
+-- A constraint UNIQUE (secao 3) e total (nao parcial): o PostgREST gera
+-- ON CONFLICT (tenant_id, import_fingerprint) sem predicado.
+-- Linhas soft-deletadas mantem o fingerprint, entao uma
+-- reimportacao nao ressuscita itens apagados de proposito.
+-- ============================================================
+
+ALTER TABLE vendors       ADD COLUMN IF NOT EXISTS import_fingerprint TEXT;
+ALTER TABLE bank_accounts ADD COLUMN IF NOT EXISTS import_fingerprint TEXT;
+ALTER TABLE jobs          ADD COLUMN IF NOT EXISTS import_fingerprint TEXT;
+ALTER TABLE cost_items    ADD COLUMN IF NOT EXISTS import_fingerprint TEXT;
+
+COMMENT ON COLUMN vendors.import_fingerprint IS 'sha256 da identidade (cpf, cnpj, email ou nome) gravado pelos scripts de migracao.';
+COMMENT ON COLUMN bank_accounts.import_fingerprint IS 'sha256 de vendor + pix + banco/agencia/conta gravado pelos scripts de migracao.';
+COMMENT ON COLUMN jobs.import_fingerprint IS 'sha256 do code (ou titulo) gravado pelos scripts de migracao.';
+COMMENT ON COLUMN cost_items.import_fingerprint IS 'sha256 de job + item.sub_item + descricao gravado pelos scripts de migracao.';
+
+-- ============================================================
+-- 2. Backfill das linhas ja importadas
+-- Mesmas formulas de scripts/migration/fingerprint.py:
+-- sha256(partes unidas por chr(31)). Vendors identificados so pelo
+-- nome ficam de fora: a chave 'name:' usa normalize_text() de
+-- scripts/migration/text.py (sem acentos nem pontuacao, espacos
+-- colapsados), a mesma do indice de vendors dos scripts. O e-mail
+-- perde todo espaco em branco das pontas (tab, quebra de linha), como
+-- o str.strip() do Python, e nao so ' ' como o btrim(). Havendo
+-- duplicatas de execucoes anteriores, so a mais antiga recebe o
+-- fingerprint.
+-- ============================================================
+
+UPDATE vendors v
+   SET import_fingerprint = f.fp
+  FROM (
+    SELECT DISTINCT ON (tenant_id, fp) id, fp
+      FROM (
+        SELECT id, tenant_id, created_at,
+               encode(sha256(convert_to(concat_ws(chr(31), 'vendors',
+                 CASE
+                   WHEN cpf IS NOT NULL THEN 'cpf:' || cpf
+                   WHEN cnpj IS NOT NULL THEN 'cnpj:' || cnpj
+                   ELSE 'email:' || lower(regexp_replace(email, '^\s+|\s+$', '', 'g'))
+                 END), 'UTF8')), 'hex') AS fp
+          FROM vendors
+         WHERE import_source LIKE 'migration_%'
+           AND import_fingerprint IS NULL
+           AND deleted_at IS NULL
+           AND (cpf IS NOT NULL OR cnpj IS NOT NULL
+                OR regexp_replace(coalesce(email, ''), '^\s+|\s+$', '', 'g') <> '')
+      ) s
+     ORDER BY tenant_id, fp, created_at
+  ) f
+ WHERE v.id = f.id;
+
+UPDATE bank_accounts b
+   SET import_fingerprint = encode(sha256(convert_to(concat_ws(chr(31), 'bank_accounts',
+         b.vendor_id::text, coalesce(b.pix_key, ''), coalesce(b.bank_code, ''),
+         coalesce(b.agency, ''), coalesce(b.account_number, '')), 'UTF8')), 'hex')
+  FROM vendors v
+ WHERE v.id = b.vendor_id
+   AND v.import_source LIKE 'migration_%'
+   AND b.import_fingerprint IS NULL
+   AND b.is_primary = true
+   AND b.deleted_at IS NULL;
+
+UPDATE jobs j
+   SET import_fingerprint = f.fp
+  FROM (
+    SELECT DISTINCT ON (tenant_id, fp) id, fp
+      FROM (
+        SELECT id, tenant_id, created_at,
+               encode(sha256(convert_to(concat_ws(chr(31), 'jobs', lower(btrim(code))), 'UTF8')), 'hex') AS fp
+          FROM jobs
+         WHERE custom_fields->>'import_source' LIKE 'migration_%'
+           AND import_fingerprint IS NULL
+           AND code NOT LIKE 'IMPORT-%'
+      ) s
+     ORDER BY tenant_id, fp, created_at
+  ) f
+ WHERE j.id = f.id;
+
+UPDATE cost_items c
+   SET import_fingerprint = f.fp
+  FROM (
+    SELECT DISTINCT ON (tenant_id, fp) id, fp
+      FROM (
+        SELECT id, tenant_id, created_at,
+               encode(sha256(convert_to(concat_ws(chr(31), 'cost_items',
+                 coalesce(job_id::text, ''), item_number::text,
+                 sub_item_number::text, service_description), 'UTF8')), 'hex') AS fp
+          FROM cost_items
+         WHERE import_source LIKE 'migration_%'
+           AND import_fingerprint IS NULL
+           AND deleted_at IS NULL
+      ) s
+     ORDER BY tenant_id, fp, created_at
+  ) f
+ WHERE c.id = f.id;
+
+-- ============================================================
+-- 3. Constraints (so adicionadas se nao existirem)
+-- ============================================================
+
+DO $$
+DECLARE
+  t TEXT;
+BEGIN
+  FOREACH t IN ARRAY ARRAY['vendors', 'bank_accounts', 'jobs', 'cost_items'] LOOP
+    IF NOT EXISTS (
+      SELECT 1 FROM pg_constraint WHERE conname = 'uq_' || t || '_import_fingerprint'
+    ) THEN
+      EXECUTE format(
+        'ALTER TABLE %I ADD CONSTRAINT %I UNIQUE (tenant_id, import_fingerprint)',
+        t, 'uq_' || t || '_import_fingerprint'
+      );
+    END IF;
+  END LOOP;
+END $$;